@@ -0,0 +1,182 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+"""
+Contains classes for concurrent (batch) method invocation.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+
+log = getLogger(__name__)
+
+
+class Batch:
+    """
+    Invokes methods concurrently on a pool of worker threads.
+    Each worker invokes methods using its own clone of the client so that
+    options and the last sent/received messages are not shared between
+    calls in flight.  The clones share the WSDL (and with a pooled
+    transport, the connection pool).  The number of calls submitted but
+    not yet completed is bounded: L{submit} blocks when the limit is
+    reached.
+    Usage:
+        with client.batch(max_workers=8) as batch:
+            f1 = batch.submit('GetQuote', 'RHT')
+            f2 = batch.submit(client.service.GetQuote, 'IBM')
+            for result in batch.map('GetQuote', symbols):
+                ...
+    @ivar client: The suds client.
+    @type client: L{suds.client.Client}
+    @ivar max_workers: The number of worker threads.
+    @type max_workers: int
+    @ivar maxpending: The maximum number of calls in flight.
+    @type maxpending: int
+    """
+
+    def __init__(self, client, max_workers=4, maxpending=None):
+        """
+        @param client: The suds client.
+        @type client: L{suds.client.Client}
+        @param max_workers: The number of worker threads.
+        @type max_workers: int
+        @param maxpending: The maximum number of calls in flight.
+            Defaults to twice the number of workers.
+        @type maxpending: int
+        """
+        if maxpending is None:
+            maxpending = max_workers * 2
+        self.client = client
+        self.max_workers = max_workers
+        self.maxpending = maxpending
+        self.executor = ThreadPoolExecutor(max_workers)
+        self.__pending = threading.BoundedSemaphore(maxpending)
+        self.__local = threading.local()
+
+    def submit(self, method, *args, **kwargs):
+        """
+        Submit a method invocation.  Blocks while the maximum number of
+        calls are in flight.
+        @param method: The method name or a method obtained from
+            the client's service selector.
+        @type method: (str|L{suds.client.Method})
+        @param args: The positional args for the method invoked.
+        @type args: list
+        @param kwargs: The named (keyword) args for the method invoked.
+        @type kwargs: dict
+        @return: A future for the method result.
+        @rtype: I{concurrent.futures.Future}
+        """
+        self.__pending.acquire()
+        try:
+            future = self.executor.submit(self.invoke, method, args, kwargs)
+        except:
+            self.__pending.release()
+            raise
+        future.add_done_callback(self.__done)
+        return future
+
+    def map(self, method, iterable, return_exceptions=False):
+        """
+        Invoke a method once for each item in I{iterable}.  Items are
+        consumed as calls complete so the I{iterable} may be a generator
+        of any length.  Each item is either a tuple of positional args
+        or a single arg.
+        @param method: The method name or a method obtained from
+            the client's service selector.
+        @type method: (str|L{suds.client.Method})
+        @param iterable: The method args.
+        @type iterable: iterable
+        @param return_exceptions: When true, the exception raised by a
+            call is returned in place of its result.  Otherwise, it is
+            raised when its result is reached.
+        @type return_exceptions: bool
+        @return: A generator of results, in the order of I{iterable}.
+        @rtype: generator
+        """
+        futures = deque()
+        try:
+            for args in iterable:
+                if not isinstance(args, tuple):
+                    args = (args,)
+                if len(futures) == self.maxpending:
+                    yield self.__result(futures.popleft(), return_exceptions)
+                futures.append(self.submit(method, *args))
+            while len(futures):
+                yield self.__result(futures.popleft(), return_exceptions)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def invoke(self, method, args, kwargs):
+        """
+        Invoke a method using the client (clone) owned by
+        the calling thread.
+        @param method: The method name or a method obtained from
+            the client's service selector.
+        @type method: (str|L{suds.client.Method})
+        @param args: The positional args for the method invoked.
+        @type args: list
+        @param kwargs: The named (keyword) args for the method invoked.
+        @type kwargs: dict
+        @return: The result of the method invocation.
+        """
+        client = self.worker()
+        if isinstance(method, str):
+            method = getattr(client.service, method)
+        else:
+            method = method.__class__(client, method.method)
+        return method(*args, **kwargs)
+
+    def worker(self):
+        """
+        Get the client (clone) owned by the calling thread.
+        @return: A clone of the client.
+        @rtype: L{suds.client.Client}
+        """
+        client = getattr(self.__local, 'client', None)
+        if client is None:
+            client = self.client.clone()
+            self.__local.client = client
+            log.debug('worker client created')
+        return client
+
+    def shutdown(self, wait=True):
+        """
+        Shutdown the worker threads.
+        @param wait: Wait for calls in flight to complete.
+        @type wait: bool
+        """
+        self.executor.shutdown(wait)
+
+    def __done(self, future):
+        self.__pending.release()
+
+    def __result(self, future, return_exceptions):
+        if not return_exceptions:
+            return future.result()
+        try:
+            return future.result()
+        except Exception as e:
+            return e
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *unused):
+        self.shutdown()
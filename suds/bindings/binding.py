@@ -27,14 +27,18 @@ from suds.sax.element import Element
 from suds.sudsobject import Factory, Object
 from suds.mx import Content
 from suds.mx.literal import Literal as MxLiteral
+from suds.mx.compiled import Compiled as MxCompiled, Compiler as MxCompiler
 from suds.umx.basic import Basic as UmxBasic
 from suds.umx.typed import Typed as UmxTyped
+from suds.umx.compiled import Compiled as UmxCompiled, Compiler as UmxCompiler
+from suds.umx.events import Events
 from suds.bindings.multiref import MultiRef
 from suds.xsd.query import TypeQuery, ElementQuery
 from suds.xsd.sxbasic import Element as SchemaElement
 from suds.options import Options
 from suds.plugin import PluginContainer
 from copy import deepcopy 
+from functools import partial
 
 log = getLogger(__name__)
 
@@ -47,15 +51,30 @@ class Binding:
     soap messages per the WSDL port binding.
     @cvar replyfilter: The reply filter function.
     @type replyfilter: (lambda s,r: r)
+    @cvar nofilter: The default (pass-through) reply filter function.
+    @type nofilter: (lambda s,r: r)
     @ivar wsdl: The wsdl.
     @type wsdl: L{suds.wsdl.Definitions}
     @ivar schema: The collective schema contained within the wsdl.
     @type schema: L{xsd.schema.Schema}
     @ivar options: A dictionary options.
     @type options: L{Options}
+    @ivar templates: The compiled request templates by operation.
+    @type templates: {id: (I{soap}, L{Template})}
+    @ivar plans: The operation plans by operation, keyed as the
+        templates are.  Unlike the templates (which hold the message
+        skeleton and are cheaply rebuilt from the plans), the plans are
+        built (see: L{prepare()}) when the wsdl is loaded, pickled with
+        it and re-keyed when unpickled, so that an operation of a cached
+        wsdl needs no schema queries.
+    @type plans: {id: L{Plan}}
+    @ivar compilers: The schema compilers by (un)marshaller
+        (class, xstq|compact).
+    @type compilers: {tuple: L{Compiler}}
     """
     
     replyfilter = (lambda s,r: r)
+    nofilter = replyfilter
 
     def __init__(self, wsdl):
         """
@@ -64,12 +83,23 @@ class Binding:
         """
         self.wsdl = wsdl
         self.multiref = MultiRef()
+        self.templates = {}
+        self.compilers = {}
+        self.plans = {}
         
     def schema(self):
         return self.wsdl.schema
     
     def options(self):
         return self.wsdl.options
+    
+    def filtered(self):
+        """
+        Get whether a reply filter has been specified.
+        @return: True when replies are filtered.
+        @rtype: bool
+        """
+        return self.replyfilter != self.nofilter
         
     def unmarshaller(self, typed=True):
         """
@@ -78,7 +108,8 @@ class Binding:
         @rtype: L{UmxTyped}
         """
         if typed:
-            return UmxTyped(self.schema())
+            umx = UmxTyped(self.schema(), self.options().compact)
+            return self.compiled(umx)
         else:
             return UmxBasic()
         
@@ -88,7 +119,29 @@ class Binding:
         @return: An L{MxLiteral} marshaller.
         @rtype: L{MxLiteral}
         """
-        return MxLiteral(self.schema(), self.options().xstq)
+        return self.compiled(MxLiteral(self.schema(), self.options().xstq))
+
+    def compiled(self, marshaller):
+        """
+        Get the schema I{compiled} (un)marshaller when the I{compiled}
+        option is specified.  The compiler is kept by the binding
+        so types are compiled once.
+        @param marshaller: The (generic) marshaller or typed unmarshaller.
+        @type marshaller: (L{MxLiteral}|L{UmxTyped})
+        @return: The compiled (un)marshaller, else I{marshaller}.
+        @rtype: (L{MxCompiled}|L{UmxCompiled}|L{MxLiteral}|L{UmxTyped})
+        """
+        if not self.options().compiled:
+            return marshaller
+        if isinstance(marshaller, UmxTyped):
+            key = (marshaller.__class__, marshaller.compact)
+            compiled, compiler = UmxCompiled, UmxCompiler
+        else:
+            key = (marshaller.__class__, marshaller.xstq)
+            compiled, compiler = MxCompiled, MxCompiler
+        if key not in self.compilers:
+            self.compilers[key] = compiler(marshaller)
+        return compiled(marshaller, self.compilers[key])
     
     def param_defs(self, method):
         """
@@ -101,10 +154,86 @@ class Binding:
         """
         raise Exception('not implemented')
 
+    def bodyroot(self, method):
+        """
+        Get the root of the soap I{body} content for the specified method.
+        @param method: A service method.
+        @type method: I{service.Method}
+        @return: The root element or (None) when the parameters are
+            the body content.
+        @rtype: L{Element}
+        """
+        return None
+    
+    def plan(self, method):
+        """
+        Get the plan for the specified method.
+        Plans are created when first needed.
+        @param method: A service method.
+        @type method: I{service.Method}
+        @return: The plan.
+        @rtype: L{Plan}
+        """
+        soap = method.soap
+        plan = self.plans.get(id(soap))
+        if plan is None or plan.soap is not soap:
+            plan = Plan(soap)
+            self.plans[id(soap)] = plan
+        return plan
+
+    def planned(self, method, name):
+        """
+        Get a value of the method's L{Plan}, computed (once) by the
+        named binding method when first needed.
+        @param method: A service method.
+        @type method: I{service.Method}
+        @param name: The name of the binding method computing the value:
+            (param_defs|headpart_types|bodypart_types|returned_types|
+            resolved_types).
+        @type name: str
+        @return: The planned value.
+        """
+        entries = self.plan(method).entries
+        try:
+            return entries[name]
+        except KeyError:
+            value = getattr(self, name)(method)
+            entries[name] = value
+            return value
+
+    def prepare(self, method, names):
+        """
+        Build (ahead of the first call) the named values of the method's
+        plan.  See: L{planned()}.
+        @param method: A service method.
+        @type method: I{service.Method}
+        @param names: The names of the binding methods computing the values.
+        @type names: [str,..]
+        """
+        for name in names:
+            self.planned(method, name)
+
+    def template(self, method):
+        """
+        Get the compiled request template for the specified method.
+        Templates are compiled when first needed.
+        @param method: A service method.
+        @type method: I{service.Method}
+        @return: The template.
+        @rtype: L{Template}
+        """
+        soap = method.soap
+        entry = self.templates.get(id(soap))
+        if entry is None or entry[0] is not soap:
+            entry = (soap, Template(self, method))
+            self.templates[id(soap)] = entry
+        return entry[1]
+
     def get_message(self, method, args, kwargs):
         """
         Get the soap message for the specified method, args and soapheaders.
         This is the entry point for creating the outbound soap message.
+        The message skeleton is cloned from the method's L{Template}.
         @param method: The method being invoked.
         @type method: I{service.Method}
         @param args: A list of args for the method invoked.
@@ -114,19 +243,31 @@ class Binding:
         @return: The soap envelope.
         @rtype: L{Document}
         """
-
-        content = self.headercontent(method)
-        header = self.header(content)
-        content = self.bodycontent(method, args, kwargs)
-        body = self.body(content)
-        env = self.envelope(header, body)
+        template = self.template(method)
+        env = template.skeleton.clone()
+        header, body = env.children
+        header.append(self.headercontent(method))
+        body.append(self.bodycontent(method, args, kwargs))
         if self.options().prefixes:
-            body.normalizePrefixes()
+            body.normalizePrefixes(template.prefixes)
             env.promotePrefixes()
         else:
             env.refitPrefixes()
         return Document(env)
     
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['templates'] = {}
+        state['compilers'] = {}
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.templates = {}
+        self.compilers = {}
+        plans = state.get('plans', {})
+        self.plans = dict([(id(p.soap), p) for p in list(plans.values())])
+    
     def get_reply(self, method, reply):
         """
         Process the I{reply} for the specified I{method} by sax parsing the I{reply}
@@ -134,15 +275,24 @@ class Binding:
         @param method: The name of the invoked method.
         @type method: str
         @param reply: The reply XML received after invoking the specified method.
-        @type reply: str
+            A readable stream is parsed incrementally as it is read.
+        @type reply: (bytes|stream)
         @return: The unmarshalled reply.  The returned value is an L{Object} for a
             I{list} depending on whether the service returns a single object or a 
             collection.
         @rtype: tuple ( L{Element}, L{Object} )
         """
-        reply = self.replyfilter(reply)
-        sax = Parser()
-        replyroot = sax.parse(string=reply)
+        if not self.options().keepreply and self.direct():
+            rtypes = self.planned(method, 'returned_types')
+            replyroot, items = self.replyevents(method, rtypes, reply)
+            items = list(items)
+            if not self.faulted(replyroot):
+                result = self.replyresult(rtypes, items)
+                return (replyroot, result)
+            # the fault (not raised) was kept in the document and
+            # is processed as the reply content.
+        else:
+            replyroot = self.replyparse(reply)
         plugins = PluginContainer(self.options().plugins)
         plugins.message.parsed(reply=replyroot)
         soapenv = replyroot.getChild('Envelope')
@@ -151,7 +301,7 @@ class Binding:
         self.detect_fault(soapbody)
         soapbody = self.multiref.process(soapbody)
         nodes = self.replycontent(method, soapbody)
-        rtypes = self.returned_types(method)
+        rtypes = self.planned(method, 'returned_types')
         if len(rtypes) > 1:
             result = self.replycomposite(rtypes, nodes)
             return (replyroot, result)
@@ -161,11 +311,202 @@ class Binding:
                 return (replyroot, result)
             if len(nodes):
                 unmarshaller = self.unmarshaller()
-                resolved = rtypes[0].resolve(nobuiltin=True)
+                resolved = self.planned(method, 'resolved_types')[0]
                 result = unmarshaller.process(nodes[0], resolved)
                 return (replyroot, result)
         return (replyroot, None)
     
+    def replyparse(self, reply):
+        """
+        Parse the (filtered) reply.
+        @param reply: The reply XML received after invoking the specified method.
+        @type reply: (bytes|stream)
+        @return: The reply document.
+        @rtype: L{Document}
+        """
+        sax = Parser()
+        if hasattr(reply, 'read'):
+            if self.filtered():
+                reply = self.replyfilter(reply.read())
+                return sax.parse(string=reply)
+            return sax.parse(file=reply)
+        reply = self.replyfilter(reply)
+        return sax.parse(string=reply)
+    
+    def faulted(self, replyroot):
+        """
+        Get whether the reply body contains a I{soapenv:Fault}.
+        @param replyroot: The reply document.
+        @type replyroot: L{Document}
+        @rtype: bool
+        """
+        soapenv = replyroot.getChild('Envelope')
+        soapbody = soapenv.getChild('Body')
+        return soapbody.getChild('Fault', envns) is not None
+    
+    def get_reply_stream(self, method, reply):
+        """
+        Process the I{reply} for the specified I{method} incrementally.  When the
+        method returns a list, each item is unmarshalled directly from the parser
+        events as it is parsed.  Other replies (and all replies when the complete
+        document is needed) are processed by L{get_reply} and the result
+        generated once.
+        @param method: The name of the invoked method.
+        @type method: str
+        @param reply: The reply XML received after invoking the specified method.
+        @type reply: (bytes|stream)
+        @return: The (partial) reply document and a generator of the
+            unmarshalled items.
+        @rtype: tuple ( L{Document}, generator )
+        """
+        rtypes = self.planned(method, 'returned_types')
+        if self.incremental(rtypes) and self.direct():
+            replyroot, items = self.replyevents(method, rtypes, reply)
+            return (replyroot, (item[1] for item in items))
+        replyroot, result = self.get_reply(method, reply)
+        if result is None:
+            result = []
+        if not isinstance(result, list):
+            result = [result]
+        return (replyroot, iter(result))
+    
+    def incremental(self, rtypes):
+        """
+        Get whether a reply may be unmarshalled incrementally.
+        Only (list) replies of a single unbounded type qualify.
+        @param rtypes: A list of known return I{types}.
+        @type rtypes: [L{suds.xsd.sxbase.SchemaObject},...]
+        @rtype: bool
+        """
+        return len(rtypes) == 1 and rtypes[0].unbounded()
+    
+    def direct(self):
+        """
+        Get whether a reply may be unmarshalled directly from the parser
+        events.  Not when the reply is filtered or I{parsed} plugins need
+        the complete document.
+        @rtype: bool
+        """
+        plugins = PluginContainer(self.options().plugins)
+        return not self.filtered() and \
+            not plugins.message.implemented('parsed')
+    
+    def replyevents(self, method, rtypes, reply):
+        """
+        Unmarshal the reply body content directly from the parser events.
+        Only the elements above the content nodes (and those not unmarshalled,
+        such as headers and faults) are kept in the reply document.
+        @param method: The name of the invoked method.
+        @type method: str
+        @param rtypes: A list of known return I{types}.
+        @type rtypes: [L{suds.xsd.sxbase.SchemaObject},...]
+        @param reply: The reply XML received after invoking the specified method.
+        @type reply: (bytes|stream)
+        @return: The (partial) reply document and a generator of
+            the unmarshalled content as: (node, value).
+        @rtype: tuple ( L{Document}, generator )
+        """
+        sax = Parser()
+        depth = self.replydepth(method)
+        typer = partial(self.replytype, rtypes)
+        handler = Events(self.unmarshaller(), depth, typer)
+        if hasattr(reply, 'read'):
+            items = sax.feed(handler, file=reply)
+        else:
+            items = sax.feed(handler, string=reply)
+        replyroot = handler.nodes[0]
+        return (replyroot, self.replyitems(replyroot, items))
+    
+    def replyitems(self, replyroot, items):
+        """
+        Generate the unmarshalled reply content and detect faults
+        when the document is complete.
+        @param replyroot: The (partial) reply document.
+        @type replyroot: L{Document}
+        @param items: A generator of the unmarshalled content.
+        @type items: generator
+        @return: A generator of the unmarshalled content.
+        @rtype: generator
+        """
+        for item in items:
+            yield item
+        soapenv = replyroot.getChild('Envelope')
+        soapbody = soapenv.getChild('Body')
+        self.detect_fault(soapbody)
+    
+    def replytype(self, rtypes, node, n):
+        """
+        Get the schema type used to unmarshal a reply content node.
+        Nodes outside of the soap body content (headers and faults) are
+        skipped, as are all but the first node of a single object reply.
+        @param rtypes: A list of known return I{types}.
+        @type rtypes: [L{suds.xsd.sxbase.SchemaObject},...]
+        @param node: A reply content node.
+        @type node: L{Element}
+        @param n: The number of content nodes already typed.
+        @type n: int
+        @return: The resolved type or (None) when skipped.
+        @rtype: L{suds.xsd.sxbase.SchemaObject}
+        """
+        if not self.inbody(node.parent) or node.match('Fault', envns):
+            return None
+        if len(rtypes) == 1:
+            rt = rtypes[0]
+            if rt.unbounded() or n == 0:
+                return rt.resolve(nobuiltin=True)
+            return None
+        for rt in rtypes:
+            if rt.name == node.name:
+                return rt.resolve(nobuiltin=True)
+        if node.get('id') is None:
+            raise Exception('<%s/> not mapped to message part' % node.name)
+        return None
+    
+    def replyresult(self, rtypes, items):
+        """
+        Construct the reply from the unmarshalled content.
+        @param rtypes: A list of known return I{types}.
+        @type rtypes: [L{suds.xsd.sxbase.SchemaObject},...]
+        @param items: The unmarshalled content as: (node, value).
+        @type items: [(L{Element}, I{value}),...]
+        @return: The unmarshalled reply.
+        @rtype: (L{Object}|list)
+        """
+        if len(rtypes) > 1:
+            dictionary = {}
+            for rt in rtypes:
+                dictionary[rt.name] = rt
+            composite = Factory.object('reply')
+            for node, sobject in items:
+                rt = dictionary[node.name]
+                self.compose(composite, rt, node.name, sobject)
+            return composite
+        if len(rtypes) == 1:
+            if rtypes[0].unbounded():
+                return [item[1] for item in items]
+            if len(items):
+                return items[0][1]
+        return None
+    
+    def inbody(self, node):
+        """
+        Get whether the specified node is the body or within
+        the body but not within a fault.
+        @param node: An XML node.
+        @type node: L{Element}
+        @rtype: bool
+        """
+        path = []
+        while node is not None:
+            path.insert(0, node)
+            node = node.parent
+        if len(path) < 2 or not path[1].match('Body', envns):
+            return False
+        for node in path[2:]:
+            if node.match('Fault', envns):
+                return False
+        return True
+    
     def detect_fault(self, body):
         """
         Detect I{hidden} soapenv:Fault element in the soap body.
@@ -228,21 +569,35 @@ class Binding:
                     continue
             resolved = rt.resolve(nobuiltin=True)
             sobject = unmarshaller.process(node, resolved)
-            value = getattr(composite, tag, None)
-            if value is None:
-                if rt.unbounded():
-                    value = []
-                    setattr(composite, tag, value)
-                    value.append(sobject)
-                else:
-                    setattr(composite, tag, sobject)
-            else:
-                if not isinstance(value, list):
-                    value = [value,]
-                    setattr(composite, tag, value)
-                value.append(sobject)          
+            self.compose(composite, rt, tag, sobject)
         return composite
     
+    def compose(self, composite, rt, tag, sobject):
+        """
+        Add an unmarshalled message part to a I{composite} reply.
+        @param composite: The I{composite} reply.
+        @type composite: L{Object}
+        @param rt: The part I{type}.
+        @type rt: L{suds.xsd.sxbase.SchemaObject}
+        @param tag: The part name.
+        @type tag: str
+        @param sobject: The unmarshalled part.
+        @type sobject: L{Object}
+        """
+        value = getattr(composite, tag, None)
+        if value is None:
+            if rt.unbounded():
+                value = []
+                setattr(composite, tag, value)
+                value.append(sobject)
+            else:
+                setattr(composite, tag, sobject)
+        else:
+            if not isinstance(value, list):
+                value = [value,]
+                setattr(composite, tag, value)
+            value.append(sobject)
+    
     def get_fault(self, reply):
         """
         Extract the fault from the specified soap reply.  If I{faults} is True, an
@@ -368,7 +723,7 @@ class Binding:
             headers = (headers,)
         if len(headers) == 0:
             return content
-        pts = self.headpart_types(method)
+        pts = self.template(method).hdefs
         if isinstance(headers, (tuple,list)):
             for header in headers:
                 if isinstance(header, Element):
@@ -403,6 +758,17 @@ class Binding:
         """
         raise Exception('not implemented')
     
+    def replydepth(self, method):
+        """
+        Get the depth of the reply body content nodes within the reply
+        document where the soap envelope is at depth (1).
+        @param method: A service method.
+        @type method: I{service.Method}
+        @return: The depth of the content nodes.
+        @rtype: int
+        """
+        raise Exception('not implemented')
+    
     def body(self, content):
         """
         Build the B{<Body/>} for an soap outbound message.
@@ -499,6 +865,20 @@ class Binding:
             result.append(rt)
         return result
 
+    def resolved_types(self, method):
+        """
+        Get the (resolved) types returned by the I{method} as used to
+        unmarshal the reply.  Builtin types are not resolved.
+        @param method: A service method.
+        @type method: I{service.Method}
+        @return: The resolved return types.
+        @rtype: [L{xsd.sxbase.SchemaObject},..]
+        """
+        result = []
+        for rt in self.planned(method, 'returned_types'):
+            result.append(rt.resolve(nobuiltin=True))
+        return result
+
 
 class PartElement(SchemaElement):
     """
@@ -535,4 +915,107 @@ class PartElement(SchemaElement):
             return self
         else:
             return self.__resolved
-    
\ No newline at end of file
+    
+
+class Plan:
+    """
+    The (schema) plan of an operation.  The parameter definitions, the
+    part types and the returned types of an operation are queried from
+    the schema when first needed and kept for the life of the wsdl
+    (including when pickled), so that invoking the operation and
+    processing the reply need no schema queries.
+    See: L{Binding.planned()}.
+    @ivar soap: The (soap) definition of the operation.
+    @type soap: I{soap}
+    @ivar entries: The planned values by binding method name.
+    @type entries: dict
+    """
+
+    def __init__(self, soap):
+        """
+        @param soap: The (soap) definition of the operation.
+        @type soap: I{soap}
+        """
+        self.soap = soap
+        self.entries = {}
+
+
+class Template:
+    """
+    A compiled request message template for an operation.  It holds
+    everything about the request message that does not depend on the
+    arguments (or options): the envelope skeleton, the root of the body
+    content, the parameter and header definitions (slots) and the
+    namespace prefix plan.  Per call, only the arguments are marshalled
+    into a clone of the skeleton.
+    @ivar skeleton: The (empty) envelope containing the I{Header}
+        and I{Body}.
+    @type skeleton: L{Element}
+    @ivar root: The (empty) root of the body content or (None)
+        when the parameters are the body content.
+    @type root: L{Element}
+    @ivar pdefs: The parameter definitions.  See: L{Plan}.
+    @type pdefs: [I{pdef},..]
+    @ivar hdefs: The soap header definitions.  See: L{Plan}.
+    @type hdefs: [I{pdef},..]
+    @ivar prefixes: The namespace prefix plan.  The prefixes to be used
+        for the namespaces known in advance, in the order found in the
+        skeleton, the body root and the parameter definitions.
+    @type prefixes: {u: p}
+    """
+
+    def __init__(self, binding, method):
+        """
+        @param binding: The binding compiling the template.
+        @type binding: L{Binding}
+        @param method: A service method.
+        @type method: I{service.Method}
+        """
+        header = binding.header([])
+        body = binding.body([])
+        self.skeleton = binding.envelope(header, body)
+        self.root = binding.bodyroot(method)
+        self.pdefs = binding.planned(method, 'param_defs')
+        self.hdefs = binding.planned(method, 'headpart_types')
+        self.prefixes = self.plan(body)
+
+    def plan(self, body):
+        """
+        Plan the prefixes of the namespaces known in advance.
+        @param body: The skeleton I{Body}.
+        @type body: L{Element}
+        @return: The prefixes by namespace.
+        @rtype: {u: p}
+        """
+        namespaces = []
+        nodes = body.ancestors()
+        nodes.reverse()
+        nodes.append(body)
+        if self.root is not None:
+            nodes.append(self.root)
+        for n in nodes:
+            namespaces.append(n.expns)
+            namespaces.extend(n.nsprefixes.values())
+            if n.prefix is not None:
+                namespaces.append(n.namespace()[1])
+        for pd in self.pdefs:
+            namespaces.append(pd[1].namespace()[1])
+        prefixes = {}
+        for u in namespaces:
+            if u is None or u in prefixes:
+                continue
+            if Namespace.xs((None, u)):
+                continue
+            prefixes[u] = 'ns%d' % len(prefixes)
+        return prefixes
+
+    def body(self):
+        """
+        Get a new root of the body content.
+        @return: A clone of L{root} or a list (of parameters) when the
+            parameters are the body content.
+        @rtype: (L{Element}|list)
+        """
+        if self.root is None:
+            return []
+        return self.root.clone()
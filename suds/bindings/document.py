@@ -22,6 +22,8 @@ from logging import getLogger
 from suds import *
 from suds.bindings.binding import Binding
 from suds.sax.element import Element
+from suds.sax.writer import Generated
+from collections.abc import Iterator
 
 log = getLogger(__name__)
 
@@ -48,13 +50,10 @@ class Document(Binding):
         if not len(method.soap.input.body.parts):
             return ()
         wrapped = method.soap.input.body.wrapped
-        if wrapped:
-            pts = self.bodypart_types(method)
-            root = self.document(pts[0])
-        else:
-            root = []
+        template = self.template(method)
+        root = template.body()
         n = 0
-        for pd in self.param_defs(method):
+        for pd in template.pdefs:
             if n < len(args):
                 value = args[n]
             else:
@@ -69,6 +68,14 @@ class Document(Binding):
             root.append(p)
         return root
 
+    def bodyroot(self, method):
+        if not len(method.soap.input.body.parts):
+            return None
+        if not method.soap.input.body.wrapped:
+            return None
+        pts = self.planned(method, 'bodypart_types')
+        return self.document(pts[0])
+
     def replycontent(self, method, body):
         wrapped = method.soap.output.body.wrapped
         if wrapped:
@@ -76,6 +83,13 @@ class Document(Binding):
         else:
             return body.children
         
+    def replydepth(self, method):
+        wrapped = method.soap.output.body.wrapped
+        if wrapped:
+            return 4
+        else:
+            return 3
+        
     def document(self, wrapper):
         """
         Get the document root.  For I{document/literal}, this is the
@@ -94,15 +108,18 @@ class Document(Binding):
         #
         # Expand list parameters into individual parameters
         # each with the type information.  This is because in document
-        # arrays are simply unbounded elements.
+        # arrays are simply unbounded elements.  Iterators are
+        # expanded as the message is written.
         #
         if isinstance(object, (list, tuple)):
             tags = []
             for item in object:
                 tags.append(self.mkparam(method, pdef, item))
             return tags
-        else:
-            return Binding.mkparam(self, method, pdef, object)
+        if isinstance(object, Iterator):
+            tags = (self.mkparam(method, pdef, item) for item in object)
+            return Generated(pdef[0], tags)
+        return Binding.mkparam(self, method, pdef, object)
         
     def param_defs(self, method):
         #
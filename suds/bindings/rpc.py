@@ -47,8 +47,9 @@ class RPC(Binding):
         
     def bodycontent(self, method, args, kwargs):
         n = 0
-        root = self.method(method)
-        for pd in self.param_defs(method):
+        template = self.template(method)
+        root = template.body()
+        for pd in template.pdefs:
             if n < len(args):
                 value = args[n]
             else:
@@ -59,9 +60,15 @@ class RPC(Binding):
             n += 1
         return root
     
+    def bodyroot(self, method):
+        return self.method(method)
+    
     def replycontent(self, method, body):
         return body[0].children
         
+    def replydepth(self, method):
+        return 4
+        
     def method(self, method):
         """
         Get the document root.  For I{rpc/(literal|encoded)}, this is the
@@ -84,7 +91,15 @@ class Encoded(RPC):
     """
 
     def marshaller(self):
-        return MxEncoded(self.schema())
+        return self.compiled(MxEncoded(self.schema()))
+
+    def incremental(self, rtypes):
+        # multiref nodes may be referenced before they are parsed
+        return False
+
+    def direct(self):
+        # multiref nodes may be referenced before they are parsed
+        return False
 
     def unmarshaller(self, typed=True):
         """
@@ -93,6 +108,7 @@ class Encoded(RPC):
         @rtype: L{UmxTyped}
         """
         if typed:
-            return UmxEncoded(self.schema())
+            umx = UmxEncoded(self.schema(), self.options().compact)
+            return self.compiled(umx)
         else:
             return RPC.unmarshaller(self, typed)
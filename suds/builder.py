@@ -20,7 +20,7 @@ The I{builder} module provides an wsdl/xsd defined types factory
 
 from logging import getLogger
 from suds import *
-from suds.sudsobject import Factory
+from suds.sudsobject import Factory, Sparse
 
 log = getLogger(__name__)
 
@@ -28,12 +28,18 @@ log = getLogger(__name__)
 class Builder:
     """ Builder used to construct an object for types defined in the schema """
     
-    def __init__(self, resolver):
+    def __init__(self, resolver, options=None):
         """
         @param resolver: A schema object name resolver.
         @type resolver: L{resolver.Resolver}
+        @param options: The (optional) options.  Compact objects are
+            built when the I{compact} option is specified and the optional
+            (complex) children are deferred when the I{sparse} option is
+            specified.
+        @type options: L{options.Options}
         """
         self.resolver = resolver
+        self.options = options
         
     def build(self, name):
         """ build a an object for the specified typename as defined in the schema """
@@ -44,41 +50,47 @@ class Builder:
         else:
             type = name
         cls = type.name
+        resolved = type.descriptor().resolved
         if type.mixed():
             data = Factory.property(cls)
         else:
-            data = Factory.object(cls)
-        resolved = type.resolve()
+            data = self.object(cls, resolved)
         md = data.__metadata__
         md.sxtype = resolved
         md.ordering = self.ordering(resolved)
         history = []
         self.add_attributes(data, resolved)
-        for child, ancestry in type.children():
+        for child, ancestry in type.descriptor().children:
             if self.skip_child(child, ancestry):
                 continue
             self.process(data, child, history[:])
         return data
             
-    def process(self, data, type, history):
-        """ process the specified type then process its children """
+    def process(self, data, type, history, sparse=True):
+        """
+        process the specified type then process its children.
+        the type is deferred when I{sparse} and optional (see: L{defer()}).
+        """
         if type in history:
             return
         if type.enum():
             return
         history.append(type)
-        resolved = type.resolve()
+        described = type.descriptor()
+        resolved = described.resolved
         value = None
-        if type.unbounded():
+        if described.unbounded:
             value = []
         else:
-            if len(resolved) > 0:
+            if len(resolved.descriptor()) > 0:
                 if resolved.mixed():
                     value = Factory.property(resolved.name)
                     md = value.__metadata__
                     md.sxtype = resolved
+                elif sparse and self.defer(data, type):
+                    return
                 else:
-                    value = Factory.object(resolved.name)
+                    value = self.object(resolved.name, resolved)
                     md = value.__metadata__
                     md.sxtype = resolved
                     md.ordering = self.ordering(resolved)
@@ -87,14 +99,41 @@ class Builder:
             data = value
         if not isinstance(data, list):
             self.add_attributes(data, resolved)
-            for child, ancestry in resolved.children():
+            for child, ancestry in resolved.descriptor().children:
                 if self.skip_child(child, ancestry):
                     continue
                 self.process(data, child, history[:])
 
+    def object(self, name, resolved):
+        """ create the object (compact and/or sparse when specified) """
+        sparse = self.sparse()
+        if self.options is not None and self.options.compact:
+            ordering = self.ordering(resolved)
+            return Factory.compact(name, resolved, ordering, sparse)()
+        if sparse:
+            return Factory.sparse(name)
+        return Factory.object(name)
+
+    def sparse(self):
+        """ get whether optional children are deferred """
+        return ( self.options is not None and self.options.sparse )
+
+    def defer(self, data, type):
+        """ defer building an optional child until first accessed """
+        if not isinstance(data, Sparse):
+            return False
+        if not type.descriptor().optional:
+            return False
+        deferred = getattr(data, '__deferred__', None)
+        if deferred is None:
+            deferred = Deferred(self)
+            data.__deferred__ = deferred
+        deferred.children[type.name] = type
+        return True
+
     def add_attributes(self, data, type):
         """ add required attributes """
-        for attr, ancestry in type.attributes():
+        for attr, ancestry in type.descriptor().attributes:
             name = '_%s' % attr.name
             value = attr.get_default()
             setattr(data, name, value)
@@ -109,13 +148,47 @@ class Builder:
     
     def ordering(self, type):
         """ get the ordering """
-        result = []
-        for child, ancestry in type.resolve():
-            name = child.name
-            if child.name is None:
-                continue
-            if child.isattr():
-                name = '_%s' % child.name
-            result.append(name)
-        return result
-            
\ No newline at end of file
+        return type.resolve().descriptor().ordering
+            
+
+
+class Deferred:
+    """
+    The (optional) children of a L{Sparse} object that are built when
+    first accessed.  Shared by the (structural) copies of the object and
+    not modified once the object is built.
+    @ivar builder: The builder.
+    @type builder: L{Builder}
+    @ivar children: The deferred schema objects by attribute name.
+    @type children: {str: L{xsd.sxbase.SchemaObject}}
+    """
+
+    def __init__(self, builder):
+        """
+        @param builder: The builder.
+        @type builder: L{Builder}
+        """
+        self.builder = builder
+        self.children = {}
+
+    def build(self, data, name):
+        """
+        Build a deferred child.
+        @param data: The (sparse) object.
+        @type data: L{Sparse}
+        @param name: The attribute name.
+        @type name: str
+        @return: True when the child is deferred (and now built).
+        @rtype: bool
+        """
+        child = self.children.get(name)
+        if child is None:
+            return False
+        self.builder.process(data, child, [], False)
+        return True
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
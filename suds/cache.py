@@ -226,11 +226,11 @@ class FileCache(Cache):
                 f.close()
             pass
     
-    def getf(self, id):
+    def getf(self, id, mode='r'):
         try:
             fn = self.__fn(id)
             self.validate(fn)
-            return self.open(fn)
+            return self.open(fn, mode)
         except:
             pass
 
@@ -331,11 +331,13 @@ class ObjectCache(FileCache):
     
     def get(self, id):
         try:
-            fp = FileCache.getf(self, id)
+            fp = FileCache.getf(self, id, 'rb')
             if fp is None:
                 return None
-            else:
+            try:
                 return pickle.load(fp)
+            finally:
+                fp.close()
         except:
             FileCache.purge(self, id)
     
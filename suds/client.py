@@ -20,11 +20,12 @@ See I{README.txt}
 """
 
 import suds
+import asyncio
 import suds.metrics as metrics
 from http.cookiejar import CookieJar
 from suds import *
 from suds.reader import DefinitionsReader
-from suds.transport import TransportError, Request
+from suds.transport import TransportError, Request, AsyncTransport
 from suds.transport.https import HttpAuthenticated
 from suds.servicedefinition import ServiceDefinition
 from suds import sudsobject
@@ -32,15 +33,19 @@ from .sudsobject import Factory as InstFactory
 from .sudsobject import Object
 from suds.resolver import PathResolver
 from suds.builder import Builder
+from suds.batch import Batch
 from suds.wsdl import Definitions
 from suds.cache import ObjectCache
 from suds.sax.document import Document
 from suds.sax.parser import Parser
+from suds.sax.writer import Writer
 from suds.options import Options
 from suds.properties import Unskin
 from urllib.parse import urlparse
 from copy import deepcopy
 from suds.plugin import PluginContainer
+from suds.bindings.binding import envns
+from itertools import chain
 from logging import getLogger
 
 log = getLogger(__name__)
@@ -164,6 +169,18 @@ class Client(object):
         """
         return self.messages.get('rx')
     
+    def batch(self, max_workers=4, maxpending=None):
+        """
+        Get a batch used to invoke methods concurrently.
+        @param max_workers: The number of worker threads.
+        @type max_workers: int
+        @param maxpending: The maximum number of calls in flight.
+        @type maxpending: int
+        @return: A batch.
+        @rtype: L{Batch}
+        """
+        return Batch(self, max_workers, maxpending)
+    
     def clone(self):
         """
         Get a shallow clone of this object.
@@ -200,11 +217,18 @@ class Client(object):
 
 class Factory:
     """
-    A factory for instantiating types defined in the wsdl
+    A factory for instantiating types defined in the wsdl.
+    The object built for each type is kept as a I{prototype} and
+    a (structural) copy of it is returned by L{create()}.
     @ivar resolver: A schema type resolver.
     @type resolver: L{PathResolver}
     @ivar builder: A schema object builder.
     @type builder: L{Builder}
+    @ivar ps: The path separator.
+    @type ps: char
+    @ivar prototypes: The prototype objects by (name, compact, sparse).
+        Reset when the separator or the wsdl is changed.
+    @type prototypes: {(str, bool, bool): L{Object}}
     """
     
     def __init__(self, wsdl):
@@ -213,8 +237,7 @@ class Factory:
         @type wsdl: L{wsdl.Definitions}
         """
         self.wsdl = wsdl
-        self.resolver = PathResolver(wsdl)
-        self.builder = Builder(self.resolver)
+        self.separator('.')
     
     def create(self, name):
         """
@@ -226,6 +249,27 @@ class Factory:
         """
         timer = metrics.Timer()
         timer.start()
+        if self.resolver.wsdl is not self.wsdl:
+            self.separator(self.ps)
+        options = self.wsdl.options
+        key = (name, options.compact, options.sparse)
+        prototype = self.prototypes.get(key)
+        if prototype is None:
+            prototype = self.prototype(name)
+            self.prototypes[key] = prototype
+        result = sudsobject.clone(prototype)
+        timer.stop()
+        metrics.log.debug('%s created: %s', name, timer)
+        return result
+    
+    def prototype(self, name):
+        """
+        Build the prototype object for a WSDL type by name.
+        @param name: The name of a type defined in the WSDL.
+        @type name: str
+        @return: The prototype object.
+        @rtype: L{Object}
+        """
         type = self.resolver.find(name)
         if type is None:
             raise TypeNotFound(name)
@@ -233,15 +277,12 @@ class Factory:
             result = InstFactory.object(name)
             for e, a in type.children():
                 setattr(result, e.name, e.name)
-        else:
-            try:
-                result = self.builder.build(type)
-            except Exception as e:
-                log.error("create '%s' failed", name, exc_info=True)
-                raise BuildError(name, e)
-        timer.stop()
-        metrics.log.debug('%s created: %s', name, timer)
-        return result
+            return result
+        try:
+            return self.builder.build(type)
+        except Exception as e:
+            log.error("create '%s' failed", name, exc_info=True)
+            raise BuildError(name, e)
     
     def separator(self, ps):
         """
@@ -249,7 +290,10 @@ class Factory:
         @param ps: The new path separator.
         @type ps: char
         """
+        self.ps = ps
         self.resolver = PathResolver(self.wsdl, ps)
+        self.builder = Builder(self.resolver, self.wsdl.options)
+        self.prototypes = {}
 
 
 class ServiceSelector:
@@ -538,6 +582,52 @@ class Method:
         else:
             return client.invoke(args, kwargs)
         
+    async def aio(self, *args, **kwargs):
+        """
+        Invoke the method without blocking the event loop.
+        Usage: result = await client.service.Method.aio(...)
+        """
+        clientclass = self.clientclass(kwargs)
+        client = clientclass(self.client, self.method)
+        if not self.faults():
+            try:
+                return await client.ainvoke(args, kwargs)
+            except WebFault as e:
+                return (500, e)
+        else:
+            return await client.ainvoke(args, kwargs)
+        
+    def stream(self, *args, **kwargs):
+        """
+        Invoke the method and get a generator of the items of the returned
+        list in place of the list.  The reply is parsed and each item is
+        unmarshalled as it is read so memory use does not grow with the
+        number of items.  I{unmarshalled} plugins are passed the generator.
+        The reply is read up to the first item before returning so that a
+        soap fault is raised (or returned) as it is by a normal call.
+        Usage: for item in client.service.Method.stream(...): ...
+        """
+        clientclass = self.clientclass(kwargs)
+        client = clientclass(self.client, self.method)
+        client.iterate = True
+        if not self.faults():
+            try:
+                return client.invoke(args, kwargs)
+            except WebFault as e:
+                return (500, e)
+        else:
+            return client.invoke(args, kwargs)
+        
+    def map(self, iterable, max_workers=4, return_exceptions=False):
+        """
+        Invoke the method concurrently, once for each item in I{iterable}.
+        Each item is either a tuple of positional args or a single arg.
+        @see: L{Batch.map}
+        """
+        with self.client.batch(max_workers) as batch:
+            for result in batch.map(self, iterable, return_exceptions):
+                yield result
+        
     def faults(self):
         """ get faults option """
         return self.client.options.faults
@@ -561,6 +651,8 @@ class SoapClient:
     @type options: dict
     @ivar cookiejar: A cookie jar.
     @type cookiejar: libcookie.CookieJar
+    @ivar iterate: Return a generator of the reply (list) items.
+    @type iterate: bool
     """
 
     def __init__(self, client, method):
@@ -574,6 +666,7 @@ class SoapClient:
         self.method = method
         self.options = client.options
         self.cookiejar = CookieJar()
+        self.iterate = False
         
     def invoke(self, args, kwargs):
         """
@@ -604,6 +697,35 @@ class SoapClient:
                 timer)
         return result
     
+    async def ainvoke(self, args, kwargs):
+        """
+        Send the required soap message to invoke the specified method
+        without blocking the event loop.
+        @param args: A list of args for the method invoked.
+        @type args: list
+        @param kwargs: Named (keyword) args for the method invoked.
+        @type kwargs: dict
+        @return: The result of the method invocation.
+        @rtype: I{builtin}|I{subclass of} L{Object}
+        """
+        timer = metrics.Timer()
+        timer.start()
+        binding = self.method.binding.input
+        soapenv = binding.get_message(self.method, args, kwargs)
+        timer.stop()
+        metrics.log.debug(
+                "message for '%s' created: %s",
+                self.method.name,
+                timer)
+        timer.start()
+        result = await self.asend(soapenv)
+        timer.stop()
+        metrics.log.debug(
+                "method '%s' invoked: %s",
+                self.method.name,
+                timer)
+        return result
+    
     def send(self, soapenv):
         """
         Send soap message.
@@ -613,39 +735,55 @@ class SoapClient:
         @rtype: I{builtin} or I{subclass of} L{Object}
         """
         result = None
-        location = self.location()
         binding = self.method.binding.input
         transport = self.options.transport
-        retxml = self.options.retxml
-        nosend = self.options.nosend
-        prettyxml = self.options.prettyxml
         timer = metrics.Timer()
-        log.debug('sending to (%s)\nmessage:\n%s', location, soapenv)
         try:
-            self.last_sent(soapenv)
-            plugins = PluginContainer(self.options.plugins)
-            plugins.message.marshalled(envelope=soapenv.root())
-            if prettyxml:
-                soapenv = soapenv.str()
-            else:
-                soapenv = soapenv.plain()
-            soapenv = soapenv.encode('utf-8')
-            ctx = plugins.message.sending(envelope=soapenv)
-            soapenv = ctx.envelope
-            if nosend:
-                return RequestContext(self, binding, soapenv)
-            request = Request(location, soapenv)
-            request.headers = self.headers()
+            request = self.request(soapenv)
+            if self.options.nosend:
+                return RequestContext(self, binding, request.message)
             timer.start()
             reply = transport.send(request)
             timer.stop()
             metrics.log.debug('waited %s on server reply', timer)
-            ctx = plugins.message.received(reply=reply.message)
-            reply.message = ctx.reply
-            if retxml:
-                result = reply.message
+            result = self.process(binding, reply)
+        except TransportError as e:
+            if e.httpcode in (202,204):
+                result = None
             else:
-                result = self.succeeded(binding, reply.message)
+                log.error(self.last_sent())
+                result = self.failed(binding, e)
+        return result
+    
+    async def asend(self, soapenv):
+        """
+        Send soap message without blocking the event loop.
+        Transports that do not implement L{AsyncTransport} are
+        run in the default executor of the event loop.
+        @param soapenv: A soap envelope to send.
+        @type soapenv: L{Document}
+        @return: The reply to the sent message.
+        @rtype: I{builtin} or I{subclass of} L{Object}
+        """
+        result = None
+        binding = self.method.binding.input
+        transport = self.options.transport
+        timer = metrics.Timer()
+        try:
+            request = self.request(soapenv)
+            if self.options.nosend:
+                return RequestContext(self, binding, request.message)
+            timer.start()
+            if isinstance(transport, AsyncTransport):
+                reply = await transport.asend(request)
+            else:
+                request.stream = False
+                loop = asyncio.get_running_loop()
+                reply = await loop.run_in_executor(
+                    None, transport.send, request)
+            timer.stop()
+            metrics.log.debug('waited %s on server reply', timer)
+            result = self.process(binding, reply)
         except TransportError as e:
             if e.httpcode in (202,204):
                 result = None
@@ -654,6 +792,85 @@ class SoapClient:
                 result = self.failed(binding, e)
         return result
     
+    def request(self, soapenv):
+        """
+        Build the transport request for the soap message.
+        The I{marshalled} and I{sending} plugins are called.
+        @param soapenv: A soap envelope to send.
+        @type soapenv: L{Document}
+        @return: The transport request.
+        @rtype: L{Request}
+        """
+        location = self.location()
+        log.debug('sending to (%s)\nmessage:\n%s', location, soapenv)
+        self.last_sent(soapenv)
+        plugins = PluginContainer(self.options.plugins)
+        plugins.message.marshalled(envelope=soapenv.root())
+        writer = Writer(self.options.prettyxml)
+        if self.chunked(plugins, writer, soapenv):
+            request = Request(location, writer.chunks(soapenv))
+        else:
+            soapenv = writer.tobytes(soapenv)
+            ctx = plugins.message.sending(envelope=soapenv)
+            request = Request(location, ctx.envelope)
+        request.headers = self.headers()
+        request.stream = self.streaming(plugins)
+        return request
+    
+    def chunked(self, plugins, writer, soapenv):
+        """
+        Get whether the soap message may be sent as it is written (in
+        chunks).  Only messages with generated content qualify.  They are
+        written in full when I{sending} plugins need the whole message or
+        when the message is not sent.
+        @param plugins: The plugin container.
+        @type plugins: L{PluginContainer}
+        @param writer: The message writer.
+        @type writer: L{Writer}
+        @param soapenv: A soap envelope to send.
+        @type soapenv: L{Document}
+        @rtype: bool
+        """
+        if self.options.nosend:
+            return False
+        if plugins.message.implemented('sending'):
+            return False
+        return writer.generates(soapenv)
+    
+    def streaming(self, plugins):
+        """
+        Get whether the reply may be parsed as it is received.  It must
+        be read in full when the raw reply is returned, filtered or
+        passed to I{received} plugins.
+        @param plugins: The plugin container.
+        @type plugins: L{PluginContainer}
+        @rtype: bool
+        """
+        if self.options.retxml:
+            return False
+        if self.method.binding.output.filtered():
+            return False
+        return not plugins.message.implemented('received')
+    
+    def process(self, binding, reply):
+        """
+        Process the transport reply.
+        The I{received} plugins are called.
+        @param binding: The binding to be used to process the reply.
+        @type binding: L{bindings.binding.Binding}
+        @param reply: The transport reply.
+        @type reply: L{Reply}
+        @return: The method result.
+        @rtype: I{builtin}, L{Object}
+        """
+        plugins = PluginContainer(self.options.plugins)
+        ctx = plugins.message.received(reply=reply.message)
+        reply.message = ctx.reply
+        if self.options.retxml:
+            return reply.message
+        else:
+            return self.succeeded(binding, reply.message)
+    
     def headers(self):
         """
         Get http headers or the http/https request.
@@ -673,15 +890,24 @@ class SoapClient:
         Request succeeded, process the reply
         @param binding: The binding to be used to process the reply.
         @type binding: L{bindings.binding.Binding}
-        @param reply: The raw reply text.
-        @type reply: str
+        @param reply: The raw reply text or a readable stream.
+        @type reply: (bytes|stream)
         @return: The method result.
         @rtype: I{builtin}, L{Object}
         @raise WebFault: On server.
         """
         log.debug('http succeeded:\n%s', reply)
         plugins = PluginContainer(self.options.plugins)
-        if len(reply) > 0:
+        if self.iterate:
+            result = self.items(binding, reply)
+        elif hasattr(reply, 'read'):
+            stream = reply
+            try:
+                reply, result = binding.get_reply(self.method, stream)
+            finally:
+                stream.close()
+            self.last_received(reply)
+        elif len(reply) > 0:
             reply, result = binding.get_reply(self.method, reply)
             self.last_received(reply)
         else:
@@ -693,6 +919,67 @@ class SoapClient:
         else:
             return (200, result)
         
+    def items(self, binding, reply):
+        """
+        Process the reply incrementally.
+        @param binding: The binding to be used to process the reply.
+        @type binding: L{bindings.binding.Binding}
+        @param reply: The raw reply text or a readable stream.
+        @type reply: (bytes|stream)
+        @return: A generator of the unmarshalled (list) items.
+        @rtype: generator
+        """
+        if hasattr(reply, 'read'):
+            stream = reply
+        elif len(reply) > 0:
+            stream = None
+        else:
+            return iter(())
+        reply, items = binding.get_reply_stream(self.method, reply)
+        self.last_received(reply)
+        items = self.__items(items, stream)
+        #
+        # Read ahead to the first item so that a fault is detected
+        # before the generator is returned.  See: L{Method.stream()}.
+        #
+        ahead = []
+        for item in items:
+            ahead.append(item)
+            break
+        self.detect_fault(binding, reply)
+        return chain(ahead, items)
+        
+    def detect_fault(self, binding, reply):
+        """
+        Detect a soap fault in the (partial) reply document.
+        Raised whether or not the I{faults} option is specified.
+        @param binding: The binding to be used to process the reply.
+        @type binding: L{bindings.binding.Binding}
+        @param reply: The (partial) reply document.
+        @type reply: L{Element}
+        @raise WebFault: When found.
+        """
+        soapenv = reply.getChild('Envelope')
+        if soapenv is None:
+            return
+        soapbody = soapenv.getChild('Body')
+        if soapbody is None:
+            return
+        fault = soapbody.getChild('Fault', envns)
+        if fault is None:
+            return
+        unmarshaller = binding.unmarshaller(False)
+        p = unmarshaller.process(fault)
+        raise WebFault(p, fault)
+        
+    def __items(self, items, stream):
+        try:
+            for item in items:
+                yield item
+        finally:
+            if stream is not None:
+                stream.close()
+    
     def failed(self, binding, error):
         """
         Request failed, process reply based on reason
@@ -773,6 +1060,25 @@ class SimClient(SoapClient):
         msg = sax.parse(string=msg)
         return self.send(msg)
     
+    async def ainvoke(self, args, kwargs):
+        """
+        Send the required soap message to invoke the specified method
+        without blocking the event loop.
+        @param args: A list of args for the method invoked.
+        @type args: list
+        @param kwargs: Named (keyword) args for the method invoked.
+        @type kwargs: dict
+        @return: The result of the method invocation.
+        @rtype: I{builtin} or I{subclass of} L{Object}
+        """
+        simulation = kwargs[self.injkey]
+        msg = simulation.get('msg')
+        if msg is None:
+            return self.invoke(args, kwargs)
+        sax = Parser()
+        msg = sax.parse(string=msg)
+        return await self.asend(msg)
+    
     def __reply(self, reply, args, kwargs):
         """ simulate the reply """
         binding = self.method.binding.input
@@ -25,6 +25,8 @@ from suds.sudsobject import footprint
 from suds.sudsobject import Object, Property
 from suds.sax.element import Element
 from suds.sax.text import Text
+from suds.sax.writer import Generated
+from collections.abc import Iterator
 from copy import deepcopy
 
 log = getLogger(__name__)
@@ -84,6 +86,8 @@ class ContentAppender:
                 ListAppender(marshaller)),
             (Matcher(dict), 
                 DictAppender(marshaller)),
+            (Matcher(Iterator), 
+                IteratorAppender(marshaller)),
         )
         
     def append(self, parent, content):
@@ -299,6 +303,29 @@ class ListAppender(Appender):
             self.resume(content)
 
 
+class IteratorAppender(Appender):
+    """
+    An iterator (generator) appender.  The items are marshalled and
+    written one at a time when the document is written.  See: L{Generated}.
+    """
+
+    def append(self, parent, content):
+        self.suspend(content)
+        state = self.marshaller.checkpoint()
+        self.resume(content)
+        child = Generated(content.tag, self.generate(content, state))
+        parent.append(child)
+
+    def generate(self, content, state):
+        for item in content.value:
+            self.marshaller.restore(state)
+            holder = Element(content.tag)
+            cont = Content(tag=content.tag, value=item)
+            Appender.append(self, holder, cont)
+            for child in holder.detachChildren():
+                yield child
+
+
 class TextAppender(Appender):
     """
     An appender for I{Text} values.
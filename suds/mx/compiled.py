@@ -0,0 +1,409 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+"""
+Provides schema I{compiled} marshaller classes.
+"""
+
+from logging import getLogger
+from suds import *
+from suds.mx import *
+from suds.mx.encoded import Encoded
+from suds.mx.typer import Typer
+from suds.sax.document import Document
+from suds.sax.element import Element
+from suds.sax.text import Text
+from suds.sudsobject import Factory, Object, Property, footprint, order
+from collections.abc import Iterator
+
+log = getLogger(__name__)
+
+
+class Unsupported(Exception):
+    """
+    Raised when content cannot be marshalled by the compiled serializers.
+    The content is then marshalled by the (generic) marshaller.
+    """
+    pass
+
+
+class Field:
+    """
+    A compiled schema element (or attribute) as found in the context
+    of its parent type.
+    @ivar type: The schema object.
+    @type type: L{xsd.sxbase.SchemaObject}
+    @ivar optional: The I{type} or one of its ancestors is optional.
+    @type optional: bool
+    @ivar qualified: The element is namespace qualified.
+    @type qualified: bool
+    @ivar ns: The namespace of the element.
+    @type ns: (prefix, uri)
+    @ivar any: The I{type} is an <xs:any/>.
+    @type any: bool
+    @ivar resolved: The resolved I{type}.
+    @type resolved: L{xsd.sxbase.SchemaObject}
+    @ivar real: The I{real} (fully resolved) type.
+    @type real: L{xsd.sxbase.SchemaObject}
+    @ivar array: The I{type} is a soap encoded array.
+    @type array: bool
+    """
+
+    def __init__(self, type, ancestry=(), encoded=False):
+        """
+        @param type: The schema object.
+        @type type: L{xsd.sxbase.SchemaObject}
+        @param ancestry: The I{type} ancestry.
+        @type ancestry: [L{xsd.sxbase.SchemaObject},..]
+        @param encoded: Compile for the soap (section 5) encoding.
+        @type encoded: bool
+        """
+        described = type.descriptor()
+        self.type = type
+        self.optional = described.optional
+        for a in ancestry:
+            if self.optional:
+                break
+            self.optional = a.optional()
+        self.nillable = described.nillable
+        self.default = type.default
+        self.qualified = type.form_qualified
+        self.ns = type.namespace()
+        self.any = type.any()
+        self.resolved = described.resolved
+        self.real = self.resolved.descriptor().resolved
+        self.array = False
+        if encoded:
+            for c in self.resolved.descriptor().content:
+                if hasattr(c[0], 'aty'):
+                    self.array = True
+                    break
+
+
+class Serializer:
+    """
+    A compiled serializer for a I{real} (resolved) schema type.
+    The attribute ordering, the xsi:type information and the
+    fields (by attribute name) are computed once.
+    @ivar type: The resolved schema type.
+    @type type: L{xsd.sxbase.SchemaObject}
+    @ivar ordering: The attribute ordering.  See: L{Typed.ordering()}.
+    @type ordering: L{Ordering}
+    @ivar fields: The compiled fields by attribute name.
+    @type fields: {str: L{Field}}
+    """
+
+    def __init__(self, type, encoded=False, xstq=True):
+        """
+        @param type: The resolved schema type.
+        @type type: L{xsd.sxbase.SchemaObject}
+        @param encoded: Compile for the soap (section 5) encoding.
+        @type encoded: bool
+        @param xstq: The xsi:type values are qualified by namespace.
+        @type xstq: bool
+        """
+        self.type = type
+        self.encoded = encoded
+        self.name = type.name
+        self.ordering = type.resolve().descriptor().ordering
+        self.ordered = self.ordering.names
+        self.extension = type.extension()
+        self.any = type.any()
+        if not xstq:
+            self.ns = None
+        elif encoded:
+            self.ns = type.namespace()
+        else:
+            self.ns = type.namespace('ns1')
+        self.fields = {}
+
+    def field(self, name):
+        """
+        Get the compiled field for an attribute name.
+        @param name: An attribute name.  Names starting with (_)
+            are XML attributes.
+        @type name: str
+        @return: The field.
+        @rtype: L{Field}
+        """
+        field = self.fields.get(name)
+        if field is None:
+            if name.startswith('_'):
+                child, ancestry = self.type.get_attribute(name[1:])
+            else:
+                child, ancestry = self.type.get_child(name)
+            if child is None:
+                raise Unsupported(name)
+            field = Field(child, ancestry, self.encoded)
+            self.fields[name] = field
+        return field
+
+    def items(self, object):
+        """
+        Get the items of a suds object in schema order.
+        See: L{suds.sudsobject.Iter}.
+        @param object: A (sorted) suds object.
+        @type object: L{Object}
+        @return: The items.
+        @rtype: generator of (name, value)
+        """
+        keylist = object.__keylist__
+        keys = keylist
+        if self.ordered.issuperset(keylist):
+            keys = object.__metadata__.ordering
+        for k in keys:
+            if k in keylist and hasattr(object, k):
+                yield (k, getattr(object, k))
+
+
+class Compiler:
+    """
+    The schema compiler.  Fields and serializers are compiled
+    when first used and kept for the life of the compiler.
+    @ivar encoded: Compile for the soap (section 5) encoding.
+    @type encoded: bool
+    @ivar xstq: The xsi:type values are qualified by namespace.
+    @type xstq: bool
+    @ivar fields: The compiled (root) fields.
+    @type fields: {id: (L{xsd.sxbase.SchemaObject}, L{Field})}
+    @ivar serializers: The compiled serializers.
+    @type serializers: {id: (L{xsd.sxbase.SchemaObject}, L{Serializer})}
+    """
+
+    def __init__(self, marshaller):
+        """
+        @param marshaller: The (generic) marshaller being compiled.
+        @type marshaller: L{suds.mx.literal.Typed}
+        """
+        self.encoded = isinstance(marshaller, Encoded)
+        self.xstq = marshaller.xstq
+        self.fields = {}
+        self.serializers = {}
+
+    def field(self, type):
+        """
+        Get the compiled (root) field for a parameter type.
+        @param type: A parameter (or header) type.
+        @type type: L{xsd.sxbase.SchemaObject}
+        @rtype: L{Field}
+        """
+        entry = self.fields.get(id(type))
+        if entry is None or entry[0] is not type:
+            entry = (type, Field(type, (), self.encoded))
+            self.fields[id(type)] = entry
+        return entry[1]
+
+    def serializer(self, type):
+        """
+        Get the compiled serializer for a resolved type.
+        @param type: A resolved type.
+        @type type: L{xsd.sxbase.SchemaObject}
+        @rtype: L{Serializer}
+        """
+        entry = self.serializers.get(id(type))
+        if entry is None or entry[0] is not type:
+            entry = (type, Serializer(type, self.encoded, self.xstq))
+            self.serializers[id(type)] = entry
+        return entry[1]
+
+
+class Compiled:
+    """
+    A schema I{compiled} marshaller.  Dictionaries, suds objects and
+    python values are marshalled by the L{Serializer}s compiled for
+    their types without a resolver and without L{Content} objects.
+    The result is identical to the (generic) marshaller which is used
+    for content that is not supported: properties, raw XML, iterators,
+    untyped content, (root) lists and soap encoded arrays.
+    @ivar marshaller: The (generic) marshaller.
+    @type marshaller: L{suds.mx.literal.Typed}
+    @ivar compiler: The schema compiler.
+    @type compiler: L{Compiler}
+    """
+
+    def __init__(self, marshaller, compiler):
+        """
+        @param marshaller: The (generic) marshaller.
+        @type marshaller: L{suds.mx.literal.Typed}
+        @param compiler: The schema compiler.
+        @type compiler: L{Compiler}
+        """
+        self.marshaller = marshaller
+        self.compiler = compiler
+
+    def process(self, content):
+        """
+        Process (marshal) the tag with the specified value using the
+        type information.
+        @param content: The content to process.
+        @type content: L{Object}
+        @return: The marshalled element.
+        @rtype: L{Element}
+        """
+        if content.tag is None:
+            content.tag = content.value.__class__.__name__
+        try:
+            return self.marshal(content)
+        except Unsupported:
+            log.debug('not compiled, processing:\n%s', content)
+            return self.marshaller.process(content)
+
+    def marshal(self, content):
+        """
+        Marshal the content using the compiled serializers.
+        @param content: The content to marshal.
+        @type content: L{Object}
+        @return: The marshalled element.
+        @rtype: L{Element}
+        """
+        value = content.value
+        type = content.type
+        if type is None or isinstance(value, (Property, list, tuple)):
+            raise Unsupported(content.tag)
+        known = None
+        if isinstance(value, Object):
+            known = self.known(value)
+            if known is None:
+                known = type
+        document = Document()
+        field = self.compiler.field(type)
+        self.append(document, content.tag, value, field, known)
+        return document.root()
+
+    def append(self, parent, tag, value, field, known):
+        """
+        Append the value (as defined by the field) to the parent.
+        See: L{suds.mx.core.Core.append()}.
+        @param parent: The parent node to append to.
+        @type parent: L{Element}
+        @param tag: The element (or attribute) name.
+        @type tag: str
+        @param value: The value.
+        @type value: I{any}
+        @param field: The compiled field.
+        @type field: L{Field}
+        @param known: The type specified in the value's metadata.
+        @type known: L{xsd.sxbase.SchemaObject}
+        """
+        if known is None:
+            real = field.real
+        else:
+            real = known.resolve()
+        if value is not None:
+            if isinstance(value, dict):
+                value = Factory.object(real.name, value)
+                value.__metadata__.sxtype = field.type
+            else:
+                value = real.translate(value, False)
+        serializer = self.compiler.serializer(real)
+        if isinstance(value, Object):
+            order(value, serializer.ordering)
+        if field.optional:
+            if value is None:
+                return
+            if isinstance(value, (list, tuple)) and len(value) == 0:
+                return
+        if field.array and isinstance(value, (list, tuple, Iterator)):
+            raise Unsupported(tag)
+        if value is None or isinstance(value, null):
+            child = self.node(tag, value, field, serializer)
+            if field.default is not None:
+                child.setText(field.default)
+            elif field.nillable:
+                child.setnil()
+            parent.append(child)
+            return
+        if isinstance(value, Object):
+            if isinstance(value, Property):
+                raise Unsupported(tag)
+            if field.optional and footprint(value) == 0:
+                return
+            child = self.node(tag, value, field, serializer)
+            parent.append(child)
+            for k, v in serializer.items(value):
+                if isinstance(v, Object):
+                    vknown = self.known(v)
+                else:
+                    vknown = None
+                self.append(child, k, v, serializer.field(k), vknown)
+            return
+        if isinstance(value, Element):
+            raise Unsupported(tag)
+        if isinstance(value, (list, tuple)):
+            for item in value:
+                if isinstance(item, Object):
+                    iknown = self.known(item)
+                else:
+                    iknown = None
+                self.append(parent, tag, item, field, iknown)
+            return
+        if isinstance(value, (dict, Iterator)):
+            raise Unsupported(tag)
+        if tag.startswith('_'):
+            s = tostr(value)
+            if s:
+                parent.set(tag[1:], s)
+            return
+        child = self.node(tag, value, field, serializer)
+        if isinstance(value, Text):
+            child.setText(value)
+        else:
+            child.setText(tostr(value))
+        parent.append(child)
+
+    def node(self, tag, value, field, serializer):
+        """
+        Create the XML node qualified as defined by the schema and
+        add the (soap) encoding information.
+        See: L{suds.mx.literal.Typed.node()}.
+        @param tag: The element name.
+        @type tag: str
+        @param value: The (translated) value.
+        @type value: I{any}
+        @param field: The compiled field.
+        @type field: L{Field}
+        @param serializer: The serializer for the real type.
+        @type serializer: L{Serializer}
+        @return: A new node.
+        @rtype: L{Element}
+        """
+        if field.qualified:
+            ns = field.ns
+            node = Element(tag, ns=ns)
+            if ns[0]:
+                node.addPrefix(ns[0], ns[1])
+        else:
+            node = Element(tag)
+        if serializer.encoded:
+            if field.any or serializer.any:
+                Typer.auto(node, value)
+            else:
+                Typer.manual(node, serializer.name, serializer.ns)
+            return node
+        if field.any or not serializer.extension:
+            return node
+        if field.resolved == serializer.type:
+            return node
+        Typer.manual(node, serializer.name, serializer.ns)
+        return node
+
+    def known(self, object):
+        """ get the type specified in the object's metadata """
+        try:
+            md = object.__metadata__
+            return md.sxtype
+        except:
+            pass
@@ -81,6 +81,21 @@ class Core:
         """
         pass
 
+    def checkpoint(self):
+        """
+        Get the marshaller state needed to resume appending content
+        later.  See: L{restore()}.
+        @return: The state.
+        """
+        return None
+
+    def restore(self, state):
+        """
+        Restore the marshaller state.
+        @param state: A state returned by L{checkpoint()}.
+        """
+        pass
+
     def node(self, content):
         """
         Create and return an XML node.
@@ -25,6 +25,7 @@ from suds.mx.literal import Literal
 from suds.mx.typer import Typer
 from suds.sudsobject import Factory, Object
 from suds.xsd.query import TypeQuery
+from collections.abc import Iterator
 
 log = getLogger(__name__)
 
@@ -47,9 +48,10 @@ class Encoded(Literal):
         # is extracted and added to the 'content'.  Then, the content.value
         # is replaced with an object containing an 'item=[]' attribute
         # containing values that are 'typed' suds objects. 
+        # Iterators are collected since the array size is needed.
         #
         start = Literal.start(self, content)
-        if start and isinstance(content.value, (list,tuple)):
+        if start and isinstance(content.value, (list,tuple,Iterator)):
             resolved = content.type.resolve()
             for c in resolved:
                 if hasattr(c[0], 'aty'):
@@ -23,9 +23,9 @@ from suds import *
 from suds.mx import *
 from suds.mx.core import Core
 from suds.mx.typer import Typer
-from suds.resolver import GraphResolver, Frame
+from suds.resolver import GraphResolver, Frame, Stack
 from suds.sax.element import Element
-from suds.sudsobject import Factory
+from suds.sudsobject import Factory, order
 
 log = getLogger(__name__)
 
@@ -122,6 +122,16 @@ class Typed(Core):
         #
         self.resolver.push(Frame(content.type))
         
+    def checkpoint(self):
+        #
+        # The resolver stack.  The frames are not modified
+        # while marshalling so a copy of the stack will do.
+        #
+        return list(self.resolver.stack)
+    
+    def restore(self, state):
+        self.resolver.stack = Stack(state)
+        
     def end(self, parent, content):
         #
         # End processing the content.  Make sure the content
@@ -173,10 +183,10 @@ class Typed(Core):
         return default
     
     def optional(self, content):
-        if content.type.optional():
+        if content.type.descriptor().optional:
             return True
         for a in content.ancestry:
-            if a.optional():
+            if a.descriptor().optional:
                 return True
         return False
     
@@ -216,10 +226,10 @@ class Typed(Core):
         return False
     
     def optional(self, content):
-        if content.type.optional():
+        if content.type.descriptor().optional:
             return True
         for a in content.ancestry:
-            if a.optional():
+            if a.descriptor().optional:
                 return True
         return False
     
@@ -258,8 +268,7 @@ class Typed(Core):
         """
         v = content.value
         if isinstance(v, Object):
-            md = v.__metadata__
-            md.ordering = self.ordering(content.real)
+            order(v, self.ordering(content.real))
         return self
 
     def ordering(self, type):
@@ -268,18 +277,10 @@ class Typed(Core):
         XSD type information.
         @param type: An XSD type object.
         @type type: SchemaObject
-        @return: An ordered list of attribute names.
-        @rtype: list
+        @return: The (shared) ordering of attribute names.
+        @rtype: L{Ordering}
         """
-        result = []
-        for child, ancestry in type.resolve():
-            name = child.name
-            if child.name is None:
-                continue
-            if child.isattr():
-                name = '_%s' % child.name
-            result.append(name)
-        return result
+        return type.resolve().descriptor().ordering
 
 
 class Literal(Typed):
@@ -104,6 +104,29 @@ class Options(Skin):
             instead of sending it.
                 - type: I{bool}
                 - default: False
+        - B{keepreply} - Keep the complete reply document.  When (False), the
+            reply is unmarshalled directly from the parser events (when possible)
+            and I{last_received()} contains only the envelope, body and elements
+            not unmarshalled.
+                - type: I{bool}
+                - default: True
+        - B{compiled} - Marshal parameters and headers and unmarshal replies using
+            routines compiled per schema type (when first used) instead of the
+            generic (un)marshallers.  The XML produced and the objects returned
+            are the same.
+                - type: I{bool}
+                - default: False
+        - B{compact} - Unmarshal replies into (and create with the factory)
+            compact objects.  A class is generated per schema type with the
+            fields stored in slots and the metadata shared by the class.
+            The objects print and iterate as the (default) objects do.
+                - type: I{bool}
+                - default: False
+        - B{sparse} - Create (with the factory) sparse objects.  The optional
+            complex children are not created until first accessed, so that
+            untouched branches are neither printed nor marshalled.
+                - type: I{bool}
+                - default: False
     """    
     def __init__(self, **kwargs):
         domain = __name__
@@ -125,5 +148,9 @@ class Options(Skin):
             Definition('cachingpolicy', int, 0),
             Definition('plugins', (list, tuple), []),
             Definition('nosend', bool, False),
+            Definition('keepreply', bool, True),
+            Definition('compiled', bool, False),
+            Definition('compact', bool, False),
+            Definition('sparse', bool, False),
         ]
         Skin.__init__(self, domain, definitions, kwargs)
@@ -21,7 +21,6 @@ of suds plugins.
 
 from suds import *
 from logging import getLogger
-import collections
 
 log = getLogger(__name__)
 
@@ -204,7 +203,7 @@ class PluginContainer:
             for p in self.plugins:
                 if isinstance(p, pclass):
                     plugins.append(p)
-            return PluginDomain(ctx, plugins)
+            return PluginDomain(ctx, plugins, pclass)
         else:
             raise Exception('plugin domain (%s), invalid' % name)
         
@@ -216,11 +215,27 @@ class PluginDomain:
     @type ctx: L{Context}
     @ivar plugins: A list of plugins (targets).
     @type plugins: list
+    @ivar pclass: The plugin base class for the domain.
+    @type pclass: class
     """
     
-    def __init__(self, ctx, plugins):
+    def __init__(self, ctx, plugins, pclass=Plugin):
         self.ctx = ctx
         self.plugins = plugins
+        self.pclass = pclass
+        
+    def implemented(self, name):
+        """
+        Get whether any plugin overrides the specified (hook) method.
+        @param name: A method name.
+        @type name: str
+        @rtype: bool
+        """
+        base = getattr(self.pclass, name, None)
+        for p in self.plugins:
+            if getattr(p.__class__, name, None) is not base:
+                return True
+        return False
     
     def __getattr__(self, name):
         return Method(name, self)
@@ -251,7 +266,7 @@ class Method:
         for plugin in self.domain.plugins:
             try:
                 method = getattr(plugin, self.name, None)
-                if method and isinstance(method, collections.Callable):
+                if method and callable(method):
                     method(ctx)
             except Exception as pe:
                 log.exception(pe)
@@ -127,6 +127,8 @@ class Endpoint(object):
         return hash(self.target)
 
     def __getattr__(self, name):
+        if name == 'target':
+            raise AttributeError(name)
         return getattr(self.target, name)
 
 
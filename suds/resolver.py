@@ -235,6 +235,7 @@ class TreeResolver(Resolver):
         """
         Resolver.__init__(self, schema)
         self.stack = Stack()
+        self.memo = Memo.get(schema)
         
     def reset(self):
         """
@@ -293,11 +294,7 @@ class TreeResolver(Resolver):
     
     def getchild(self, name, parent):
         """ get a child by name """
-        log.debug('searching parent (%s) for (%s)', Repr(parent), name)
-        if name.startswith('@'):
-            return parent.get_attribute(name[1:])
-        else:
-            return parent.get_child(name)
+        return self.memo.getchild(name, parent)
 
 
 class NodeResolver(TreeResolver):
@@ -371,8 +368,7 @@ class NodeResolver(TreeResolver):
         """ blindly query the schema by name """
         log.debug('searching schema for (%s)', name)
         qref = qualify(name, node, node.namespace())
-        query = BlindQuery(qref)
-        result = query.execute(self.schema)
+        result = self.memo.query(qref, self.schema)
         return (result, [])
     
     def known(self, node):
@@ -381,8 +377,7 @@ class NodeResolver(TreeResolver):
         if ref is None:
             return None
         qref = qualify(ref, node, node.namespace())
-        query = BlindQuery(qref)
-        return query.execute(self.schema)
+        return self.memo.query(qref, self.schema)
         
 
 class GraphResolver(TreeResolver):
@@ -444,8 +439,7 @@ class GraphResolver(TreeResolver):
             qref = qualify(name, schema.root, schema.tns)
         else:
             qref = qualify(name, wsdl.root, wsdl.tns)
-        query = BlindQuery(qref)
-        result = query.execute(schema)
+        result = self.memo.query(qref, schema)
         return (result, [])
     
     def wsdl(self):
@@ -466,12 +460,115 @@ class GraphResolver(TreeResolver):
             pass
 
        
+class Memo:
+    """
+    The (per schema) type resolution cache.  Once the schema is loaded,
+    the child (or attribute) found by name in a resolved parent type
+    and the type found by (blind) query for a qualified reference, such
+    as an I{xsi:type}, never change.  The memo is kept on the schema
+    (see: L{get()}) and is not pickled with it.
+    @ivar children: The (child, ancestry) by (parent, name).  Attribute
+        names are prefixed by (@).
+    @type children: {(L{xsd.sxbase.SchemaObject}, str): tuple}
+    @ivar queries: The query results by qualified reference.
+    @type queries: {(name, ns): L{xsd.sxbase.SchemaObject}}
+    @ivar hits: The number of lookups found in the cache.
+    @type hits: int
+    @ivar misses: The number of lookups not found in the cache.
+    @type misses: int
+    """
+
+    @classmethod
+    def get(cls, schema):
+        """
+        Get the memo for a schema.
+        @param schema: A schema object.
+        @type schema: L{xsd.schema.Schema}
+        @return: The schema's memo.
+        @rtype: L{Memo}
+        """
+        if schema is None:
+            return cls()
+        memo = getattr(schema, 'memo', None)
+        if memo is None:
+            memo = cls()
+            schema.memo = memo
+        return memo
+
+    def __init__(self):
+        self.children = {}
+        self.queries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def getchild(self, name, parent):
+        """
+        Get a child (or attribute) by name.
+        @param name: A child name.  Attribute names are prefixed by (@).
+        @type name: str
+        @param parent: A resolved parent type.
+        @type parent: L{xsd.sxbase.SchemaObject}
+        @return: A tuple: the requested (child, ancestry).
+        @rtype: (L{xsd.sxbase.SchemaObject}, [L{xsd.sxbase.SchemaObject},..])
+        """
+        key = (parent, name)
+        try:
+            result = self.children[key]
+            self.hits += 1
+            return result
+        except KeyError:
+            self.misses += 1
+        log.debug('searching parent (%s) for (%s)', Repr(parent), name)
+        if name.startswith('@'):
+            result = parent.get_attribute(name[1:])
+        else:
+            result = parent.get_child(name)
+        self.children[key] = result
+        return result
+
+    def query(self, qref, schema):
+        """
+        Blindly query the schema by qualified reference.
+        @param qref: A qualified reference.
+        @type qref: (name, ns)
+        @param schema: The schema.
+        @type schema: L{xsd.schema.Schema}
+        @return: The found type, else None.
+        @rtype: L{xsd.sxbase.SchemaObject}
+        """
+        try:
+            result = self.queries[qref]
+            self.hits += 1
+            return result
+        except KeyError:
+            self.misses += 1
+        query = BlindQuery(qref)
+        result = query.execute(schema)
+        self.queries[qref] = result
+        return result
+
+    def ratio(self):
+        """
+        Get the cache hit ratio.
+        @return: The ratio of lookups found in the cache.
+        @rtype: float
+        """
+        total = self.hits + self.misses
+        if total:
+            return float(self.hits) / total
+        return 0.0
+
+    def __str__(self):
+        return 'memo: hits=%d misses=%d (%.1f%%)' % \
+            (self.hits, self.misses, self.ratio()*100)
+
+
 class Frame:
     def __init__(self, type, resolved=None, ancestry=()):
         self.type = type
         if resolved is None:
-            resolved = type.resolve()
-        self.resolved = resolved.resolve()
+            resolved = type.descriptor().resolved
+        self.resolved = resolved.descriptor().resolved
         self.ancestry = ancestry
 
     def __str__(self):
@@ -23,13 +23,14 @@ from logging import getLogger
 from suds import *
 from suds.sax import *
 from suds.sax.text import Text
+from weakref import ref as weakref
 
 log = getLogger(__name__)
 
 class Attribute:
     """
     An XML attribute object.
-    @ivar parent: The node containing this attribute
+    @ivar parent: The node containing this attribute (held weakly).
     @type parent: L{element.Element}
     @ivar prefix: The I{optional} namespace prefix.
     @type prefix: basestring
@@ -38,6 +39,9 @@ class Attribute:
     @ivar value: The attribute's value
     @type value: basestring
     """
+    
+    __slots__ = ('__parent', 'prefix', 'name', 'value',)
+    
     def __init__(self, name, value=None):
         """
         @param name: The attribute's name with I{optional} namespace prefix.
@@ -45,10 +49,36 @@ class Attribute:
         @param value: The attribute's value
         @type value: basestring 
         """
-        self.parent = None
+        self.__parent = None
         self.prefix, self.name = splitPrefix(name)
         self.setValue(value)
         
+    def getParent(self):
+        """
+        Get the containing element.
+        @return: The element or None when detached or when the
+            element no longer exists.
+        @rtype: L{element.Element}
+        """
+        ref = self.__parent
+        if ref is None:
+            return None
+        else:
+            return ref()
+        
+    def setParent(self, parent):
+        """
+        Set the containing element.
+        @param parent: The element (may be None).
+        @type parent: L{element.Element}
+        """
+        if parent is None:
+            self.__parent = None
+        else:
+            self.__parent = weakref(parent)
+            
+    parent = property(getParent, setParent)
+        
     def clone(self, parent=None):
         """
         Clone this object.
@@ -175,3 +205,14 @@ class Attribute:
         else:
             v = self.value
         return '%s="%s"' % (n, v)
+    
+    def __getstate__(self):
+        state = {}
+        for k in ('prefix', 'name', 'value'):
+            state[k] = getattr(self, k)
+        return state
+    
+    def __setstate__(self, state):
+        self.__parent = None
+        for k,v in list(state.items()):
+            setattr(self, k, v)
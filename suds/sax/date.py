@@ -77,6 +77,25 @@ class Date:
         @rtype: int
         """
         return self.date.day
+
+    @classmethod
+    def parse(cls, s):
+        """
+        Get the python date for an XML date.  The common (YYYY-MM-DD)
+        form is parsed directly and other forms by the L{Date} object
+        with identical results.
+        @param s: A date string.
+        @type s: str
+        @return: A date object.
+        @rtype: B{datetime}.I{date}
+        @raise ValueError: When I{s} is invalid.
+        """
+        if len(s) >= 10 and s[4] == '-' and s[7] == '-':
+            try:
+                return dt.date.fromisoformat(s[:10])
+            except ValueError:
+                pass
+        return Date(s).date
         
     def __parse(self, s):
         """
@@ -173,7 +192,68 @@ class Time:
         @rtype: int
         """
         return self.time.microsecond
-    
+
+    @classmethod
+    def parse(cls, s):
+        """
+        Get the (adjusted) python time for an XML time.  The common
+        (HH:MI:SS[.ms][(z|Z)|(+|-)06:00]) forms are parsed directly
+        and other forms by the L{Time} object with identical results.
+        @param s: A time string.
+        @type s: str
+        @return: A time object.
+        @rtype: B{datetime}.I{time}
+        @raise ValueError: When I{s} is invalid.
+        """
+        if len(s) >= 8 and s[2] == ':' and s[5] == ':':
+            suffix = cls.suffix(s[8:])
+            if suffix is not None:
+                try:
+                    time = dt.time.fromisoformat(s[:8])
+                except ValueError:
+                    time = None
+                if time is not None:
+                    ms, offset = suffix
+                    if ms is not None:
+                        time = time.replace(microsecond=ms)
+                    if offset is not None:
+                        delta = Timezone.delta(offset)
+                        d = dt.datetime.combine(dt.date.today(), time)
+                        time = ( d + delta ).time()
+                    return time
+        return Time(s).time
+
+    @classmethod
+    def suffix(cls, s):
+        """
+        Parse the (optional) fraction and TZ that follow the seconds
+        in the common forms.  As with the L{Time} object, the fraction
+        is truncated to (6) digits and the TZ offset is in hours.
+        @param s: The string following the seconds.
+        @type s: str
+        @return: A tuple of (ms, offset) either of which may be None,
+            else None when not a common form.
+        @rtype: tuple
+        """
+        offset = None
+        if s:
+            last = s[-1]
+            if last == 'Z' or last == 'z':
+                offset = 0
+                s = s[:-1]
+            elif len(s) >= 6 and s[-3] == ':' and s[-6] in '+-':
+                tz = s[-6:]
+                digits = tz[1:3]+tz[4:]
+                if not (digits.isascii() and digits.isdecimal()):
+                    return None
+                offset = int(tz[:3])
+                s = s[:-6]
+        if not s:
+            return (None, offset)
+        if s[0] == '.' and s[1:].isdecimal():
+            return (int(s[1:7]), offset)
+        return None
+
     def __adjust(self):
         """
         Adjust for TZ offset.
@@ -292,6 +372,41 @@ class DateTime(Date,Time):
             return
         raise ValueError(type(date))
     
+    @classmethod
+    def parse(cls, s):
+        """
+        Get the (adjusted) python datetime for an XML datetime.  The
+        common (YYYY-MM-DDB{T}HH:MI:SS[.ms][(z|Z)|(+|-)06:00]) forms
+        are parsed directly and other forms by the L{DateTime} object
+        with identical results.
+        @param s: A datetime string.
+        @type s: str
+        @return: A datetime object.
+        @rtype: B{datetime}.I{datetime}
+        @raise ValueError: When I{s} is invalid.
+        """
+        if len(s) >= 19 and s[10] == 'T' and s[4] == '-' and \
+            s[7] == '-' and s[13] == ':' and s[16] == ':':
+                suffix = Time.suffix(s[19:])
+                if suffix is not None:
+                    try:
+                        d = dt.datetime.fromisoformat(s[:19])
+                    except ValueError:
+                        d = None
+                    if d is not None:
+                        ms, offset = suffix
+                        if ms is not None:
+                            d = d.replace(microsecond=ms)
+                        if offset is not None:
+                            delta = Timezone.delta(offset)
+                            try:
+                                d = ( d + delta )
+                            except OverflowError:
+                                log.warn(
+                                    '"%s" caused overflow, not-adjusted', d)
+                        return d
+        return DateTime(s).datetime
+    
     def __adjust(self):
         """
         Adjust for TZ offset.
@@ -333,12 +448,16 @@ class Timezone:
     @type local: int
     @cvar patten: The regex patten to match TZ.
     @type patten: re.Pattern
+    @cvar deltas: The adjustments by (local, offset).
+    @type deltas: {tuple: B{datetime}.I{timedelta}}
     """
     
     pattern = re.compile('([zZ])|([\-\+][0-9]{2}:[0-9]{2})')
     
     LOCAL = ( 0-time.timezone/60/60 ) + time.daylight
 
+    deltas = {}
+
     def __init__(self, offset=None):
         if offset is None:
             offset = self.LOCAL
@@ -359,6 +478,21 @@ class Timezone:
         x = m.start(0)
         return (s[:x], s[x:])
 
+    @classmethod
+    def delta(cls, offset):
+        """
+        Get the adjustment to the (current) I{local} TZ.
+        See: L{adjustment()}.
+        @return: The delta between I{offset} and local TZ.
+        @rtype: B{datetime}.I{timedelta}
+        """
+        key = (cls.LOCAL, offset)
+        result = cls.deltas.get(key)
+        if result is None:
+            result = Timezone().adjustment(offset)
+            cls.deltas[key] = result
+        return result
+
     def adjustment(self, offset):
         """
         Get the adjustment to the I{local} TZ.
@@ -23,6 +23,7 @@ from suds import *
 from suds.sax import *
 from suds.sax.text import Text
 from suds.sax.attribute import Attribute
+from weakref import ref as weakref
 import sys 
 if sys.version_info < (2, 4, 0): 
     from sets import Set as set 
@@ -30,10 +31,44 @@ if sys.version_info < (2, 4, 0):
 
 log = getLogger(__name__)
 
+
+class Prefixes(dict):
+    """
+    The shared (immutable) empty namespace prefix mapping used by
+    elements that do not declare prefixes.  The element's own mapping
+    is allocated when a prefix is added using L{Element.addPrefix()}.
+    """
+    
+    def __immutable(self, *args, **kwargs):
+        raise TypeError('shared prefix mapping, use Element.addPrefix()')
+    
+    __setitem__ = __immutable
+    __delitem__ = __immutable
+    __ior__ = __immutable
+    clear = __immutable
+    pop = __immutable
+    popitem = __immutable
+    setdefault = __immutable
+    update = __immutable
+    
+    def __copy__(self):
+        return self
+    
+    def __deepcopy__(self, memo):
+        return self
+    
+    def __reduce__(self):
+        return 'noprefixes'
+    
+
+noprefixes = Prefixes()
+
+
 class Element:
     """
     An XML element object.
-    @ivar parent: The node containing this attribute
+    @ivar parent: The node containing this element.  Held weakly so that
+        trees are not reference cycles: a tree is kept alive by its root.
     @type parent: L{Element}
     @ivar prefix: The I{optional} namespace prefix.
     @type prefix: basestring
@@ -41,17 +76,37 @@ class Element:
     @type name: basestring
     @ivar expns: An explicit namespace (xmlns="...").
     @type expns: (I{prefix}, I{name})
-    @ivar nsprefixes: A mapping of prefixes to namespaces.
+    @ivar nsprefixes: A mapping of prefixes to namespaces.  The shared
+        (immutable) L{noprefixes} until a prefix is added.  Must be updated
+        using the I{prefix} methods which maintain the in-scope mappings.
     @type nsprefixes: dict
-    @ivar attributes: A list of XML attributes.
+    @ivar attributes: A list of XML attributes.  A (shared) empty tuple
+        until an attribute is appended.
     @type attributes: [I{Attribute},]
     @ivar text: The element's I{text} content.
     @type text: basestring
-    @ivar children: A list of child elements.
+    @ivar children: A list of child elements.  A (shared) empty tuple
+        until a child is appended.
     @type children: [I{Element},]
     @cvar matcher: A collection of I{lambda} for string matching.
     @cvar specialprefixes: A dictionary of builtin-special prefixes.
     """
+    
+    __slots__ = (
+        '__parent',
+        '__weakref__',
+        'prefix',
+        'name',
+        'expns',
+        'nsprefixes',
+        'attributes',
+        'text',
+        'children',
+        'charbuffer',
+        '__scope',
+        '__children',
+        '__attributes',
+    )
 
     matcher = \
     {
@@ -92,21 +147,54 @@ class Element:
         @type ns: (I{prefix}, I{name})
         """
         
+        self.__parent = None
+        self.__scope = None
+        self.__children = None
+        self.__attributes = None
         self.rename(name)
         self.expns = None
-        self.nsprefixes = {}
-        self.attributes = []
+        self.nsprefixes = noprefixes
+        self.attributes = ()
         self.text = None
         if parent is not None:
             if isinstance(parent, Element):
                 self.parent = parent
+                self.__scope = False
             else:
                 raise Exception('parent (%s) not-valid', parent.__class__.__name__)
-        else:
-            self.parent = None
-        self.children = []
+        self.children = ()
         self.applyns(ns)
         
+    def getParent(self):
+        """
+        Get the parent element.
+        @return: The parent or None when detached or when the
+            parent no longer exists.
+        @rtype: L{Element}
+        """
+        ref = self.__parent
+        if ref is None:
+            return None
+        else:
+            return ref()
+        
+    def setParent(self, parent):
+        """
+        Set the parent element.
+        @param parent: The parent (may be None).
+        @type parent: L{Element}
+        """
+        if parent is None:
+            self.__parent = None
+        else:
+            self.__parent = weakref(parent)
+        if self.__scope is False:
+            self.__scope = None
+        else:
+            self.invalidate()
+            
+    parent = property(getParent, setParent)
+        
     def rename(self, name):
         """
         Rename the element.
@@ -117,6 +205,9 @@ class Element:
             raise Exception('name (%s) not-valid' % name)
         else:
             self.prefix, self.name = splitPrefix(name)
+        parent = self.parent
+        if parent is not None:
+            parent.__children = None
             
     def setPrefix(self, p, u=None):
         """
@@ -180,11 +271,30 @@ class Element:
             child list and I{parent}=I{None}
         @rtype: L{Element}
         """
-        if self.parent is not None:
-            if self in self.parent.children:
-                self.parent.children.remove(self)
+        parent = self.parent
+        if parent is not None:
+            index = parent.indexOf(self)
+            if index >= 0:
+                del parent.children[index]
+                parent.__children = None
             self.parent = None
         return self
+    
+    def indexOf(self, child):
+        """
+        Get the index of a child element.  Children are matched by
+        identity rather than by (name and namespace) equality.
+        @param child: A child element.
+        @type child: L{Element}
+        @return: The index of I{child} or (-1) when not found.
+        @rtype: int
+        """
+        n = 0
+        for c in self.children:
+            if c is child:
+                return n
+            n += 1
+        return -1
         
     def set(self, name, value):
         """
@@ -213,6 +323,7 @@ class Element:
         try:
             attr = self.getAttribute(name)
             self.attributes.remove(attr)
+            self.__attributes = None
         except:
             pass
         return self
@@ -326,10 +437,14 @@ class Element:
             objects = (objects,)
         for child in objects:
             if isinstance(child, Element):
+                if isinstance(self.children, tuple):
+                    self.children = list(self.children)
                 self.children.append(child)
                 child.parent = self
                 continue
             if isinstance(child, Attribute):
+                if isinstance(self.attributes, tuple):
+                    self.attributes = list(self.attributes)
                 self.attributes.append(child)
                 child.parent = self
                 continue
@@ -350,6 +465,8 @@ class Element:
         objects = (objects,)
         for child in objects:
             if isinstance(child, Element):
+                if isinstance(self.children, tuple):
+                    self.children = list(self.children)
                 self.children.insert(index, child)
                 child.parent = self
             else:
@@ -368,6 +485,7 @@ class Element:
             return child.detach()
         if isinstance(child, Attribute):
             self.attributes.remove(child)
+            self.__attributes = None
         return None
             
     def replaceChild(self, child, content):
@@ -378,9 +496,9 @@ class Element:
         @param content: An element or collection of elements.
         @type content: L{Element} or [L{Element},]
         """
-        if child not in self.children:
+        index = self.indexOf(child)
+        if index < 0:
             raise Exception('child not-found')
-        index = self.children.index(child)
         self.remove(child)
         if not isinstance(content, (list, tuple)):
             content = (content,)
@@ -388,6 +506,7 @@ class Element:
             self.children.insert(index, node.detach())
             node.parent = self
             index += 1
+        self.__children = None
             
     def getAttribute(self, name, ns=None, default=None):
         """
@@ -407,7 +526,7 @@ class Element:
                 ns = None
             else:
                 ns = self.resolvePrefix(prefix)
-        for a in self.attributes:
+        for a in self.__indexed(self.attributes, name, False):
             if a.match(name, ns):
                 return a
         return default
@@ -430,7 +549,7 @@ class Element:
                 ns = None
             else:
                 ns = self.resolvePrefix(prefix)
-        for c in self.children:
+        for c in self.__indexed(self.children, name, True):
             if c.match(name, ns):
                 return c
         return default
@@ -492,7 +611,8 @@ class Element:
                 ns = None
             else:
                 ns = self.resolvePrefix(prefix)
-        return [c for c in self.children if c.match(name, ns)]
+        children = self.__indexed(self.children, name, True)
+        return [c for c in children if c.match(name, ns)]
     
     def detachChildren(self):
         """
@@ -501,7 +621,8 @@ class Element:
         @rtype: [L{Element},...]
         """
         detached = self.children
-        self.children = []
+        self.children = ()
+        self.__children = None
         for child in detached:
             child.parent = None
         return detached
@@ -520,14 +641,66 @@ class Element:
         @return: The namespace that is mapped to I{prefix} in this context.
         @rtype: (I{prefix},I{URI})
         """
+        if prefix in self.nsprefixes:
+            return (prefix, self.nsprefixes[prefix])
+        if prefix in self.specialprefixes:
+            return (prefix, self.specialprefixes[prefix])
+        scope = self.scope()
+        if prefix in scope:
+            return (prefix, scope[prefix])
+        return default
+    
+    def scope(self):
+        """
+        Get the in-scope prefix mappings: the mappings declared by this
+        element and inherited from its ancestors.  Built when first needed
+        and cached.  An element that does not declare prefixes shares the
+        mappings of its parent.  Not cached for elements constructed with
+        a parent but not contained in the parent's children (or within
+        such an element) since invalidation cannot reach them.
+        @return: The in-scope mappings (must not be modified).
+        @rtype: {prefix: URI}
+        """
+        scope = self.__scope
+        if scope is not None and scope is not False:
+            return scope
+        path = []
+        cached = True
         n = self
         while n is not None:
-            if prefix in n.nsprefixes:
-                return (prefix, n.nsprefixes[prefix])
-            if prefix in self.specialprefixes:
-                return (prefix, self.specialprefixes[prefix])
+            scope = n.__scope
+            if scope is False:
+                cached = False
+            elif scope is not None:
+                break
+            path.append(n)
             n = n.parent
-        return default
+        if n is None:
+            scope = noprefixes
+        while len(path):
+            n = path.pop()
+            if len(n.nsprefixes):
+                scope = dict(scope)
+                scope.update(n.nsprefixes)
+            if cached:
+                n.__scope = scope
+        return scope
+    
+    def invalidate(self):
+        """
+        Invalidate the cached in-scope prefix mappings for the branch.
+        Called when the mappings (or the parent) change.  Elements without
+        cached mappings have no descendants with cached mappings so the
+        branch is traversed only as far as mappings were cached.
+        """
+        pending = [self]
+        while len(pending):
+            n = pending.pop()
+            scope = n.__scope
+            if scope is None or scope is False:
+                continue
+            n.__scope = None
+            pending.extend(n.children)
     
     def addPrefix(self, p, u):
         """
@@ -539,7 +712,10 @@ class Element:
         @return: self
         @rtype: L{Element}
         """
+        if self.nsprefixes is noprefixes:
+            self.nsprefixes = {}
         self.nsprefixes[p] = u
+        self.invalidate()
         return self
  
     def updatePrefix(self, p, u):
@@ -555,6 +731,7 @@ class Element:
         """
         if p in self.nsprefixes:
             self.nsprefixes[p] = u
+            self.invalidate()
         for c in self.children:
             c.updatePrefix(p, u)
         return self
@@ -569,6 +746,7 @@ class Element:
         """
         if prefix in self.nsprefixes:
             del self.nsprefixes[prefix]
+            self.invalidate()
         return self
     
     def findPrefix(self, uri, default=None):
@@ -638,11 +816,11 @@ class Element:
             if p in self.parent.nsprefixes:
                 pu = self.parent.nsprefixes[p]
                 if pu == u:
-                    del self.nsprefixes[p]
+                    self.clearPrefix(p)
                 continue
             if p != self.parent.prefix:
-                self.parent.nsprefixes[p] = u
-                del self.nsprefixes[p]
+                self.parent.addPrefix(p, u)
+                self.clearPrefix(p)
         return self
     
     def refitPrefixes(self):
@@ -659,19 +837,23 @@ class Element:
             if ns[1] is not None:
                 self.expns = ns[1]
         self.prefix = None
-        self.nsprefixes = {}
+        self.nsprefixes = noprefixes
+        self.invalidate()
         return self
                 
-    def normalizePrefixes(self):
+    def normalizePrefixes(self, plan=None):
         """
         Normalize the namespace prefixes.
         This generates unique prefixes for all namespaces.  Then retrofits all
         prefixes and prefix mappings.  Further, it will retrofix attribute values
         that have values containing (:).
+        @param plan: An optional prefix plan: the prefixes to be used
+            for known namespaces.
+        @type plan: {u: p}
         @return: self
         @rtype: L{Element}
         """
-        PrefixNormalizer.apply(self)
+        PrefixNormalizer.apply(self, plan)
         return self
 
     def isempty(self, content=True):
@@ -738,7 +920,7 @@ class Element:
             self.expns = ns[1]
         else:
             self.prefix = ns[0]
-            self.nsprefixes[ns[0]] = ns[1]
+            self.addPrefix(ns[0], ns[1])
             
     def str(self, indent=0):
         """
@@ -885,9 +1067,39 @@ class Element:
             if c.isempty(False):
                 pruned.append(c)
         for p in pruned:
-            self.children.remove(p)
+            del self.children[self.indexOf(p)]
+        if pruned:
+            self.__children = None
                 
             
+    def __indexed(self, nodes, name, children):
+        """
+        Get the nodes (children or attributes) that may match I{name}.
+        Short lists are returned as-is to be scanned.  Otherwise, the
+        (name) L{Index} of the list is used and (re)built as needed.
+        @param nodes: The children or attributes.
+        @type nodes: [L{Element}|L{Attribute},...]
+        @param name: An I{unqualified} name or (None) to match any.
+        @type name: basestring
+        @param children: True when I{nodes} are the children.
+        @type children: boolean
+        @return: The candidate nodes in document order.
+        @rtype: [L{Element}|L{Attribute},...]
+        """
+        if name is None or len(nodes) < Index.threshold:
+            return nodes
+        if children:
+            index = self.__children
+        else:
+            index = self.__attributes
+        if index is None or not index.valid(nodes):
+            index = Index(nodes)
+            if children:
+                self.__children = index
+            else:
+                self.__attributes = index
+        return index.get(name)
+            
     def __childrenAtPath(self, parts):
         result = []
         node = self
@@ -948,6 +1160,89 @@ class Element:
     def __iter__(self):
         return NodeIterator(self)
     
+    def __getstate__(self):
+        state = {}
+        for k in ('prefix',
+                  'name',
+                  'expns',
+                  'nsprefixes',
+                  'attributes',
+                  'text',
+                  'children'):
+            state[k] = getattr(self, k)
+        state.update(getattr(self, '__dict__', {}))
+        return state
+    
+    def __setstate__(self, state):
+        self.__parent = None
+        self.__scope = None
+        self.__children = None
+        self.__attributes = None
+        for k,v in list(state.items()):
+            setattr(self, k, v)
+        for a in self.attributes:
+            a.parent = self
+        for c in self.children:
+            c.parent = self
+    
+
+class Index:
+    """
+    A (name) index of an element's children or attributes.  The index
+    holds the list from which it was built and its length so that it
+    is rebuilt when the list has been replaced or resized.  Changes that
+    keep the length (renaming a node, replacing a node in the list) must
+    drop the index explicitly, which the L{Element} methods do.
+    @ivar nodes: The indexed list.
+    @type nodes: [L{Element}|L{Attribute},...]
+    @ivar length: The length of I{nodes} when indexed.
+    @type length: int
+    @ivar names: The indexed nodes by I{unqualified} name.
+    @type names: {name: [L{Element}|L{Attribute},...]}
+    @cvar threshold: The minimum length of an indexed list.
+    @type threshold: int
+    """
+    
+    __slots__ = ('nodes', 'length', 'names',)
+    
+    threshold = 8
+    
+    def __init__(self, nodes):
+        """
+        @param nodes: The list to be indexed.
+        @type nodes: [L{Element}|L{Attribute},...]
+        """
+        names = {}
+        for n in nodes:
+            matched = names.get(n.name)
+            if matched is None:
+                names[n.name] = [n]
+            else:
+                matched.append(n)
+        self.nodes = nodes
+        self.length = len(nodes)
+        self.names = names
+        
+    def valid(self, nodes):
+        """
+        Get whether the index is valid for the specified list.
+        @param nodes: The children or attributes.
+        @type nodes: [L{Element}|L{Attribute},...]
+        @return: True if I{nodes} is the indexed list, unchanged in length.
+        @rtype: boolean
+        """
+        return ( self.nodes is nodes and self.length == len(nodes) )
+        
+    def get(self, name):
+        """
+        Get the nodes with the specified name.
+        @param name: An I{unqualified} name.
+        @type name: basestring
+        @return: The nodes in document order.
+        @rtype: [L{Element}|L{Attribute},...]
+        """
+        return self.names.get(name, ())
+
 
 class NodeIterator:
     """
@@ -992,26 +1287,33 @@ class PrefixNormalizer:
     @type namespaces: [str,]
     @ivar prefixes: A reverse dict of prefixes.
     @type prefixes: {u, p}
+    @ivar plan: The prefixes to be used for known namespaces.
+    @type plan: {u, p}
     """
     
     @classmethod
-    def apply(cls, node):
+    def apply(cls, node, plan=None):
         """
         Normalize the specified node.
         @param node: A node to normalize.
         @type node: L{Element}
+        @param plan: The (optional) prefixes to be used for known namespaces.
+        @type plan: {u, p}
         @return: The normalized node.
         @rtype: L{Element}
         """
-        pn = PrefixNormalizer(node)
+        pn = PrefixNormalizer(node, plan)
         return pn.refit()
     
-    def __init__(self, node):
+    def __init__(self, node, plan=None):
         """
         @param node: A node to normalize.
         @type node: L{Element}
+        @param plan: The (optional) prefixes to be used for known namespaces.
+        @type plan: {u, p}
         """
         self.node = node
+        self.plan = plan or {}
         self.branch = node.branch()
         self.namespaces = self.getNamespaces()
         self.prefixes = self.genPrefixes()
@@ -1046,15 +1348,18 @@ class PrefixNormalizer:
     def genPrefixes(self):
         """
         Generate a I{reverse} mapping of unique prefixes for all namespaces.
+        Planned prefixes are used for the namespaces in the plan.
         @return: A referse dict of prefixes.
         @rtype: {u, p}
         """
         prefixes = {}
-        n = 0
+        n = len(self.plan)
         for u in self.namespaces:
-            p = 'ns%d' % n
+            p = self.plan.get(u)
+            if p is None:
+                p = 'ns%d' % n
+                n += 1
             prefixes[u] = p
-            n += 1
         return prefixes
     
     def refit(self):
@@ -1115,7 +1420,8 @@ class PrefixNormalizer:
         Refit (normalize) all of the nsprefix mappings.
         """
         for n in self.branch:
-            n.nsprefixes = {}
+            n.nsprefixes = noprefixes
+            n.invalidate()
         n = self.node
         for u, p in list(self.prefixes.items()):
             n.addPrefix(p, u)
@@ -35,62 +35,102 @@ from suds.sax.element import Element
 from suds.sax.text import Text
 from suds.sax.attribute import Attribute
 from xml.sax import make_parser, InputSource, ContentHandler
+from xml.sax import SAXParseException
 from xml.sax.handler import feature_external_ges
-from io import StringIO
+from io import StringIO, BytesIO
+from sys import intern
+
+try:
+    from xml.parsers import expat
+except ImportError:
+    expat = None
 
 log = getLogger(__name__)
 
 
 class Handler(ContentHandler):
-    """ sax hanlder """
+    """
+    sax hanlder
+    The elements are built by the native L{start()} and L{end()} callbacks
+    which are driven directly by the L{ExpatReader}.  The I{xml.sax}
+    callbacks adapt to them for the L{SaxReader}.
+    """
     
     def __init__(self):
         self.nodes = [Document()]
+        self.names = {}
  
     def startElement(self, name, attrs):
-        top = self.top()
-        node = Element(str(name))
+        flattened = []
         for a in attrs.getNames():
-            n = str(a)
-            v = str(attrs.getValue(a))
-            attribute = Attribute(n,v)
-            if self.mapPrefix(node, attribute):
+            flattened.append(str(a))
+            flattened.append(str(attrs.getValue(a)))
+        self.start(str(name), flattened)
+        
+    def start(self, name, attrs):
+        """
+        An element has started.
+        @param name: The (qualified) element name.
+        @type name: str
+        @param attrs: The attributes as: [name, value, name, value, ...]
+        @type attrs: list
+        """
+        split = self.names.get(name)
+        if split is None:
+            split = splitPrefix(name)
+            self.names[name] = split
+        node = Element(split[1])
+        node.prefix = split[0]
+        attributes = []
+        for i in range(0, len(attrs), 2):
+            n = attrs[i]
+            v = attrs[i+1]
+            if n == 'xmlns':
+                if len(v):
+                    node.expns = intern(v)
+                continue
+            if n.startswith('xmlns:'):
+                node.addPrefix(n[6:], intern(v))
                 continue
-            node.append(attribute)
+            attribute = Attribute(n, v)
+            attribute.parent = node
+            attributes.append(attribute)
+        if len(attributes):
+            node.attributes = attributes
         node.charbuffer = []
-        top.append(node)
-        self.push(node)
-        
-    def mapPrefix(self, node, attribute):
-        skip = False
-        if attribute.name == 'xmlns':
-            if len(attribute.value):
-                node.expns = str(attribute.value)
-            skip = True
-        elif attribute.prefix == 'xmlns':
-            prefix = attribute.name
-            node.nsprefixes[prefix] = str(attribute.value)
-            skip = True
-        return skip
+        top = self.nodes[-1]
+        if len(self.nodes) > 1:
+            if len(top.children):
+                top.children.append(node)
+            else:
+                top.children = [node]
+            node.parent = top
+        else:
+            top.append(node)
+        self.nodes.append(node)
  
     def endElement(self, name):
         name = str(name)
-        current = self.top()
+        if name != self.nodes[-1].qname():
+            raise Exception('malformed document')
+        self.end(name)
+        
+    def end(self, name):
+        """
+        An element has ended.  The parser has matched the
+        element names.
+        @param name: The (qualified) element name.
+        @type name: str
+        """
+        current = self.nodes.pop()
         if len(current.charbuffer):
             current.text = Text(''.join(current.charbuffer))
         del current.charbuffer
-        if len(current):
+        if len(current.children):
             current.trim()
-        currentqname = current.qname()
-        if name == currentqname:
-            self.pop()
-        else:
-            raise Exception('malformed document')
  
     def characters(self, content):
-        text = str(content)
-        node = self.top()
-        node.charbuffer.append(text)
+        self.nodes[-1].charbuffer.append(content)
 
     def push(self, node):
         self.nodes.append(node)
@@ -101,10 +141,145 @@ class Handler(ContentHandler):
  
     def top(self):
         return self.nodes[len(self.nodes)-1]
+    
+    def native(self):
+        """
+        Get whether this handler may be driven by the native callbacks.
+        Not when the I{xml.sax} element callbacks have been overridden.
+        @rtype: bool
+        """
+        cls = self.__class__
+        return ( cls.startElement is Handler.startElement and \
+            cls.endElement is Handler.endElement )
+
+
+class SaxReader:
+    """
+    Drives a handler using the I{xml.sax} parser.
+    @ivar sax: The sax parser.
+    @type sax: I{xml.sax.xmlreader.IncrementalParser}
+    """
+    
+    def __init__(self, handler):
+        """
+        @param handler: A sax handler.
+        @type handler: L{Handler}
+        """
+        self.sax = make_parser()
+        self.sax.setFeature(feature_external_ges, 0)
+        self.sax.setContentHandler(handler)
+        
+    def feed(self, data):
+        """
+        Parse the next part of the XML text.
+        @param data: XML text.
+        @type data: (bytes|memoryview|str)
+        """
+        self.sax.feed(data)
+        
+    def close(self):
+        """
+        Parse the end of the XML text.
+        """
+        self.sax.close()
+
+
+class ExpatReader:
+    """
+    Drives a handler directly from the I{expat} parser callbacks.  Text is
+    buffered by expat and names are interned.  XML bytes are decoded by
+    expat using the declared encoding.
+    @ivar expat: The expat parser.
+    @type expat: I{xml.parsers.expat.xmlparser}
+    """
+    
+    def __init__(self, handler):
+        """
+        @param handler: A sax handler.
+        @type handler: L{Handler}
+        """
+        p = expat.ParserCreate()
+        p.buffer_text = True
+        p.buffer_size = Parser.bufsize
+        p.ordered_attributes = True
+        p.StartElementHandler = handler.start
+        p.EndElementHandler = handler.end
+        p.CharacterDataHandler = handler.characters
+        self.expat = p
+        
+    def feed(self, data):
+        """
+        Parse the next part of the XML text.
+        @param data: XML text.
+        @type data: (bytes|memoryview|str)
+        """
+        self.parse(data, False)
+        
+    def close(self):
+        """
+        Parse the end of the XML text.
+        """
+        self.parse(b'', True)
+        
+    def parse(self, data, final):
+        try:
+            self.expat.Parse(data, final)
+        except expat.ExpatError as e:
+            raise SAXParseException(expat.ErrorString(e.code), e, self)
+        
+    def getColumnNumber(self):
+        return self.expat.ErrorColumnNumber
+    
+    def getLineNumber(self):
+        return self.expat.ErrorLineNumber
+    
+    def getPublicId(self):
+        return None
+    
+    def getSystemId(self):
+        return None
+
+
+class StreamHandler(Handler):
+    """
+    sax handler that collects the elements completed at
+    a specified depth for incremental processing.
+    @ivar depth: The depth of the collected elements where the
+        document root is at depth (1).
+    @type depth: int
+    @ivar completed: The collected elements.
+    @type completed: [L{Element},...]
+    """
+    
+    def __init__(self, depth):
+        Handler.__init__(self)
+        self.depth = depth
+        self.completed = []
+        
+    def end(self, name):
+        current = self.nodes[-1]
+        Handler.end(self, name)
+        if len(self.nodes) == self.depth:
+            self.completed.append(current)
+            
+    def drain(self):
+        completed = self.completed
+        self.completed = []
+        return completed
 
 
 class Parser:
-    """ SAX Parser """
+    """
+    SAX Parser
+    @cvar bufsize: The size of buffers read when parsing incrementally.
+    @type bufsize: int
+    @cvar backend: The reader class used to drive native handlers.
+        The L{ExpatReader} unless I{expat} is not available.
+    @type backend: class
+    """
+    
+    bufsize = 0x10000
+    backend = ( SaxReader if expat is None else ExpatReader )
     
     @classmethod
     def saxparser(cls):
@@ -113,27 +288,112 @@ class Parser:
         h = Handler()
         p.setContentHandler(h)
         return (p, h)
+    
+    def reader(self, handler):
+        """
+        Get a reader for the specified handler.  The L{backend} is used
+        for native handlers, else the L{SaxReader}.
+        @param handler: A sax handler.
+        @type handler: L{Handler}
+        @return: A reader.
+        @rtype: (L{ExpatReader}|L{SaxReader})
+        """
+        if handler.native():
+            return self.backend(handler)
+        else:
+            return SaxReader(handler)
         
     def parse(self, file=None, string=None):
         """
         SAX parse XML text.
-        @param file: Parse a python I{file-like} object.
+        A I{file-like} object is parsed incrementally as it is read.
+        @param file: Parse a python I{file-like} object (or file name).
         @type file: I{file-like} object.
-        @param string: Parse string XML.
-        @type string: str
+        @param string: Parse XML text.  Bytes are decoded by the parser
+            using the declared encoding.
+        @type string: (bytes|memoryview|str)
         """
         timer = metrics.Timer()
         timer.start()
-        sax, handler = self.saxparser()
+        handler = Handler()
+        reader = self.reader(handler)
         if file is not None:
-            sax.parse(file)
+            if hasattr(file, 'read'):
+                self.read(reader, file)
+            else:
+                with open(file, 'rb') as fp:
+                    self.read(reader, fp)
             timer.stop()
             metrics.log.debug('sax (%s) duration: %s', file, timer)
             return handler.nodes[0]
         if string is not None:
-            source = InputSource(None)
-            source.setByteStream(StringIO(string.decode('utf-8')))
-            sax.parse(source)
+            reader.feed(string)
+            reader.close()
             timer.stop()
             metrics.log.debug('%s\nsax duration: %s', string, timer)
-            return handler.nodes[0]
\ No newline at end of file
+            return handler.nodes[0]
+        
+    def read(self, reader, file):
+        """
+        Read and parse a I{file-like} object.
+        @param reader: A reader.
+        @type reader: (L{ExpatReader}|L{SaxReader})
+        @param file: A python I{file-like} object.
+        @type file: I{file-like} object.
+        """
+        while True:
+            buffer = file.read(self.bufsize)
+            if not len(buffer):
+                break
+            reader.feed(buffer)
+        reader.close()
+        
+    def stream(self, depth, file=None, string=None):
+        """
+        SAX parse XML text incrementally.  Elements at I{depth} are
+        generated as soon as they are completed.  Generated elements
+        remain attached to the (partial) document until detached by
+        the caller.
+        @param depth: The depth of the generated elements where the
+            document root is at depth (1).
+        @type depth: int
+        @param file: Parse a python I{file-like} object.
+        @type file: I{file-like} object.
+        @param string: Parse string XML.
+        @type string: (bytes|memoryview|str)
+        @return: A tuple: (document, generator of L{Element})
+        @rtype: (L{Document}, generator)
+        """
+        handler = StreamHandler(depth)
+        return (handler.nodes[0], self.feed(handler, file, string))
+    
+    def feed(self, handler, file=None, string=None):
+        """
+        SAX parse XML text incrementally using the specified handler.
+        After each buffer is parsed, the items collected by the handler
+        are drained and generated.
+        @param handler: A sax handler that implements I{drain()}.
+        @type handler: L{Handler}
+        @param file: Parse a python I{file-like} object.
+        @type file: I{file-like} object.
+        @param string: Parse string XML.
+        @type string: (bytes|memoryview|str)
+        @return: A generator of the drained items.
+        @rtype: generator
+        """
+        reader = self.reader(handler)
+        if string is not None:
+            if isinstance(string, str):
+                file = StringIO(string)
+            else:
+                file = BytesIO(string)
+        while True:
+            buffer = file.read(self.bufsize)
+            if not len(buffer):
+                break
+            reader.feed(buffer)
+            for item in handler.drain():
+                yield item
+        reader.close()
+        for item in handler.drain():
+            yield item
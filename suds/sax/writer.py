@@ -0,0 +1,308 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+"""
+Provides a streaming XML writer that serializes L{Element} trees
+and L{Document}s as UTF-8 encoded chunks, and the L{Generated}
+placeholder for content generated while it is written.
+"""
+
+from logging import getLogger
+from suds import *
+from suds import sax
+from suds.sax import *
+from suds.sax.document import Document
+from suds.sax.element import Element
+
+log = getLogger(__name__)
+
+
+class Writer:
+    """
+    A streaming XML writer.  The output is identical to L{Element.plain()}
+    and L{Element.str()} (and the L{Document} equivalents) but the tree is
+    walked without recursion and the markup is encoded in chunks of about
+    I{bufsize} characters instead of being built as one string.
+    Text without XML special characters is not escaped.
+    L{Generated} placeholders are replaced by their elements, each of
+    which is written and released before the next is generated.
+    @ivar pretty: Indent the output as L{Element.str()} does.
+    @type pretty: bool
+    @ivar bufsize: The (approximate) size of the chunks.
+    @type bufsize: int
+    """
+
+    bufsize = 0x10000
+
+    def __init__(self, pretty=False, bufsize=None):
+        """
+        @param pretty: Indent the output as L{Element.str()} does.
+        @type pretty: bool
+        @param bufsize: The (approximate) size of the chunks.
+        @type bufsize: int
+        """
+        self.pretty = pretty
+        if bufsize is not None:
+            self.bufsize = bufsize
+
+    def generates(self, node):
+        """
+        Get whether writing a node generates content, that is, whether
+        the tree contains L{Generated} placeholders.
+        @param node: A document or element.
+        @type node: (L{Document}|L{Element})
+        @rtype: bool
+        """
+        if isinstance(node, Document):
+            node = node.root()
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, Generated):
+                return True
+            if node is not None:
+                pending.extend(node.children)
+        return False
+
+    def write(self, node, stream):
+        """
+        Write the XML for a node to a (binary) stream.
+        @param node: A document or element.
+        @type node: (L{Document}|L{Element})
+        @param stream: A writable stream.
+        @type stream: I{file-like}
+        """
+        for chunk in self.chunks(node):
+            stream.write(chunk)
+
+    def tobytes(self, node):
+        """
+        Get the XML for a node.
+        @param node: A document or element.
+        @type node: (L{Document}|L{Element})
+        @return: The UTF-8 encoded XML.
+        @rtype: bytes
+        """
+        return b''.join(self.chunks(node))
+
+    def chunks(self, node):
+        """
+        Generate the XML for a node in chunks.  Suitable as a (chunked)
+        http request body.
+        @param node: A document or element.
+        @type node: (L{Document}|L{Element})
+        @return: A generator of UTF-8 encoded chunks.
+        @rtype: generator of bytes
+        """
+        pretty = self.pretty
+        bufsize = self.bufsize
+        buffer = []
+        size = 0
+        if isinstance(node, Document):
+            buffer.append(node.DECL)
+            node = node.root()
+            if node is None:
+                yield buffer[0].encode('utf-8')
+                return
+            if pretty:
+                buffer.append('\n')
+        pending = [(node, node.parent, 0)]
+        while pending:
+            item = pending.pop()
+            if item.__class__ is str:
+                buffer.append(item)
+                continue
+            if len(item) == 4:
+                self.__next(item, pending)
+                continue
+            node, parent, indent = item
+            if isinstance(node, Generated):
+                pending.append((node.generate(), parent, indent, True))
+                continue
+            start = len(buffer)
+            self.__open(node, parent, indent, buffer, pending)
+            for s in buffer[start:]:
+                size += len(s)
+            if size >= bufsize:
+                yield ''.join(buffer).encode('utf-8')
+                buffer = []
+                size = 0
+        if buffer:
+            yield ''.join(buffer).encode('utf-8')
+
+    def __open(self, node, parent, indent, buffer, pending):
+        """
+        Append the start tag and text of an element to the buffer
+        and schedule its children and end tag.
+        @param node: The element.
+        @type node: L{Element}
+        @param parent: The parent of I{node}.
+        @type parent: L{Element}
+        @param indent: The indent level.
+        @type indent: int
+        @param buffer: The output buffer.
+        @type buffer: [str,...]
+        @param pending: The (reversed) stack of elements and strings
+            to be written.
+        @type pending: [(L{Element}, L{Element}, int)|str,...]
+        """
+        if self.pretty:
+            tab = ' ' * (indent*3)
+        else:
+            tab = ''
+        qname = node.qname()
+        buffer.append(tab)
+        buffer.append('<')
+        buffer.append(qname)
+        self.__nsdeclarations(node, parent, buffer)
+        for a in node.attributes:
+            self.__attribute(a, buffer)
+        text = node.text
+        children = node.children
+        if not children and text is None:
+            buffer.append('/>')
+            return
+        buffer.append('>')
+        if text:
+            buffer.append(self.__escape(text))
+        if not children:
+            buffer.append('</%s>' % qname)
+            return
+        if self.pretty:
+            pending.append('\n%s</%s>' % (tab, qname))
+            for c in reversed(children):
+                pending.append((c, node, indent+1))
+                pending.append('\n')
+        else:
+            pending.append('</%s>' % qname)
+            for c in reversed(children):
+                pending.append((c, node, indent))
+
+    def __next(self, item, pending):
+        """
+        Schedule the next element generated by a L{Generated} placeholder
+        followed by the placeholder's remaining elements.
+        @param item: The generator entry: (generator, parent, indent, first).
+        @type item: (generator, L{Element}, int, bool)
+        @param pending: The (reversed) stack of elements and strings
+            to be written.
+        @type pending: [(L{Element}, L{Element}, int)|str,...]
+        """
+        generator, parent, indent, first = item
+        for node in generator:
+            pending.append((generator, parent, indent, False))
+            pending.append((node, parent, indent))
+            if self.pretty and not first:
+                pending.append('\n')
+            break
+
+    def __nsdeclarations(self, node, parent, buffer):
+        """
+        Append the namespace declarations of an element to the buffer.
+        See: L{Element.nsdeclarations()}.
+        @param node: The element.
+        @type node: L{Element}
+        @param parent: The parent of I{node}.
+        @type parent: L{Element}
+        @param buffer: The output buffer.
+        @type buffer: [str,...]
+        """
+        expns = node.expns
+        if parent is None:
+            pns = Namespace.default[1]
+        else:
+            pns = parent.expns
+        if expns != pns and expns is not None:
+            buffer.append(' xmlns="%s"' % expns)
+        for p, u in node.nsprefixes.items():
+            if parent is not None:
+                ns = parent.resolvePrefix(p)
+                if ns[1] == u: continue
+            buffer.append(' xmlns:%s="%s"' % (p, u))
+
+    def __attribute(self, a, buffer):
+        """
+        Append an attribute to the buffer.
+        See: L{Attribute.__str__()}.
+        @param a: The attribute.
+        @type a: L{Attribute}
+        @param buffer: The output buffer.
+        @type buffer: [str,...]
+        """
+        v = a.value
+        if v:
+            v = self.__escape(v)
+        buffer.append(' %s="%s"' % (a.qname(), v))
+
+    def __escape(self, text):
+        """
+        Escape XML special characters only when the text contains any.
+        @param text: The text.
+        @type text: L{Text}
+        @return: The escaped text.
+        @rtype: str
+        """
+        if text.escaped or not sax.encoder.needsEncoding(text):
+            return text
+        return text.escape()
+
+
+class Generated(Element):
+    """
+    A placeholder for (sibling) elements generated when the document is
+    written by the L{Writer}.  The placeholder itself is not written.
+    Each element is linked to the placeholder as its parent (but not
+    contained in its children) so that namespace prefixes resolve within
+    the tree.  Elements can be generated only once.
+    @ivar generator: The generator of elements.  Lists of elements are
+        flattened and I{None} is skipped.
+    @type generator: generator
+    """
+
+    __slots__ = ('generator',)
+
+    def __init__(self, name, generator):
+        """
+        @param name: The element name of the generated elements.
+        @type name: basestring
+        @param generator: The generator of elements.
+        @type generator: generator
+        """
+        Element.__init__(self, name)
+        self.generator = generator
+
+    def generate(self):
+        """
+        Generate the elements.
+        @return: A generator of elements.
+        @rtype: generator of L{Element}
+        """
+        for node in self.generator:
+            if node is None:
+                continue
+            if isinstance(node, (list, tuple)):
+                nodes = node
+            else:
+                nodes = (node,)
+            for node in nodes:
+                node.parent = self
+                yield node
+
+    def str(self, indent=0):
+        return '%*s<!-- %s (generated) -->' % (indent*3, '', self.qname())
+
+    def plain(self):
+        return '<!-- %s (generated) -->' % self.qname()
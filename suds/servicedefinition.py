@@ -82,7 +82,7 @@ class ServiceDefinition:
             for op in list(port.binding.operations.values()):
                 m = p[0].method(op.name)
                 binding = m.binding.input
-                method = (m.name, binding.param_defs(m))
+                method = (m.name, binding.planned(m, 'param_defs'))
                 p[1].append(method)
                 metrics.log.debug("method '%s' created: %s", m.name, timer)
             p[1].sort()
@@ -85,7 +85,61 @@ def footprint(sobject):
         n +=1
     return n
 
-    
+def order(sobject, ordering):
+    """
+    Set the attribute ordering of a suds object.  The metadata shared
+    by the objects of a L{Compact} class is not modified, the object
+    is given a copy.
+    @param sobject: A suds object.
+    @type sobject: L{Object}
+    @param ordering: The attribute ordering.
+    @type ordering: L{Ordering}
+    """
+    md = sobject.__metadata__
+    if getattr(md, 'ordering', None) is ordering:
+        return
+    if isinstance(sobject, Compact) and \
+        md is sobject.__class__.__metadata__:
+            md = clone(md)
+            sobject.__metadata__ = md
+    md.ordering = ordering
+
+def clone(sobject):
+    """
+    Get a structural copy of a suds object.  The objects (and lists)
+    in the branch are copied, the metadata is copied but the values it
+    references (schema types, orderings) are shared as are all other
+    (immutable) values.  See: L{suds.client.Factory.create()}.
+    @param sobject: A suds object (or any value).
+    @type sobject: L{Object}
+    @return: The copy.
+    @rtype: L{Object}
+    """
+    if isinstance(sobject, list):
+        return [clone(item) for item in sobject]
+    if not isinstance(sobject, Object):
+        return sobject
+    cls = sobject.__class__
+    result = cls.__new__(cls)
+    keylist = sobject.__keylist__
+    state = dict(sobject.__dict__)
+    md = state.get('__metadata__')
+    if md is not None:
+        state['__metadata__'] = clone(md)
+    result.__dict__.update(state)
+    if isinstance(sobject, Compact):
+        object.__setattr__(result, '__keys__', sobject.__keys__)
+    else:
+        object.__setattr__(result, '__keylist__', Keylist.fromkeys(keylist))
+    for k in keylist:
+        try:
+            v = getattr(sobject, k)
+        except AttributeError:
+            continue
+        object.__setattr__(result, k, clone(v))
+    return result
+
+
 class Factory:
     
     cache = {}
@@ -94,13 +148,62 @@ class Factory:
     def subclass(cls, name, bases, dict={}):
         if not isinstance(bases, tuple):
             bases = (bases,)
-        name = name
-        key = '.'.join((name, str(bases)))
+        key = (name, bases)
         subclass = cls.cache.get(key)
         if subclass is None:
             subclass = type(name, bases, dict)
             cls.cache[key] = subclass
         return subclass
+
+    @classmethod
+    def compact(cls, name, sxtype, ordering, sparse=False, ordered=True):
+        """
+        Get the L{Compact} class generated for a (resolved) schema type.
+        The fields named in the ordering are stored in slots and the
+        metadata (sxtype, ordering) is shared by the class.  A class is
+        generated once per (sxtype, name, sparse, ordered) and is kept
+        by the schema type (I{compacts}) so that it lives as long as
+        the schema.
+        @param name: The class name.
+        @type name: str
+        @param sxtype: The (resolved) schema type.
+        @type sxtype: L{suds.xsd.sxbase.SchemaObject}
+        @param ordering: The attribute ordering.
+        @type ordering: L{Ordering}
+        @param sparse: Generate a L{Sparse} class.
+        @type sparse: bool
+        @param ordered: The objects are iterated (printed) in the order
+            of the I{ordering}, else in the order the fields are set.
+        @type ordered: bool
+        @return: The generated class.
+        @rtype: I{class}
+        """
+        classes = sxtype.compacts
+        key = (name, sparse, ordered)
+        subclass = classes.get(key)
+        if subclass is None:
+            slots = ['__keys__']
+            for n in ordering:
+                n = str(n)
+                if n.isidentifier() and n not in slots:
+                    slots.append(n)
+            md = Metadata()
+            md.sxtype = sxtype
+            if ordered:
+                md.ordering = ordering
+            dict = {
+                '__slots__' : tuple(slots),
+                '__metadata__' : md,
+                '__printer__' : Printer(),
+                '__keysets__' : {},
+            }
+            if sparse:
+                bases = (Sparse, Compact)
+            else:
+                bases = (Compact,)
+            subclass = type(name, bases, dict)
+            classes[key] = subclass
+        return subclass
     
     @classmethod
     def object(cls, classname=None, dict={}):
@@ -112,6 +215,13 @@ class Factory:
         for a in list(dict.items()):
             setattr(inst, a[0], a[1])
         return inst
+
+    @classmethod
+    def sparse(cls, classname=None):
+        if classname is None:
+            classname = 'Object'
+        subclass = cls.subclass(classname, (Sparse, Object))
+        return subclass()
     
     @classmethod
     def metadata(cls):
@@ -123,10 +233,63 @@ class Factory:
         return subclass(value)
 
 
+class Keylist(dict):
+    """
+    The (insertion) ordered attribute names of a suds object.
+    Backed by a dict for constant time membership, insertion and
+    removal but otherwise used as the list it replaces.
+    """
+
+    def append(self, name):
+        self[name] = None
+
+    def remove(self, name):
+        try:
+            del self[name]
+        except KeyError:
+            raise ValueError(name)
+
+    def index(self, name):
+        return list(self).index(name)
+
+    def copy(self):
+        return Keylist(self)
+
+    def __getitem__(self, index):
+        return list(self)[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (Keylist, list, tuple)):
+            return list(self) == list(other)
+        return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class Ordering(tuple):
+    """
+    An (immutable) attribute ordering shared by the objects of a schema
+    type.  See: L{Iter}.  The names are indexed once.
+    @ivar names: The set of names.
+    @type names: frozenset
+    """
+
+    def __new__(cls, names=()):
+        ordering = tuple.__new__(cls, names)
+        ordering.names = frozenset(ordering)
+        return ordering
+
+
 class Object:
 
     def __init__(self):
-        self.__keylist__ = []
+        self.__keylist__ = Keylist()
         self.__printer__ = Printer()
         self.__metadata__ = Metadata()
 
@@ -175,7 +338,8 @@ class Iter:
 
     def __init__(self, sobject):
         self.sobject = sobject
-        self.keylist = self.__keylist(sobject)
+        self.names = sobject.__keylist__
+        self.keylist = self.__keylist(sobject, self.names)
         self.index = 0
 
     def __next__(self):
@@ -184,18 +348,22 @@ class Iter:
         while self.index < nkeys:
             k = keylist[self.index]
             self.index += 1
-            if hasattr(self.sobject, k):
-                v = getattr(self.sobject, k)
-                return (k, v)
+            if k not in self.names:
+                continue
+            try:
+                return (k, getattr(self.sobject, k))
+            except AttributeError:
+                pass
         raise StopIteration()
     
-    def __keylist(self, sobject):
-        keylist = sobject.__keylist__
+    def __keylist(self, sobject, keylist):
         try:
-            keyset = set(keylist)
             ordering = sobject.__metadata__.ordering
-            ordered = set(ordering)
-            if not ordered.issuperset(keyset):
+            if isinstance(ordering, Ordering):
+                ordered = ordering.names
+            else:
+                ordered = set(ordering)
+            if not ordered.issuperset(keylist):
                 log.debug(
                     '%s must be superset of %s, ordering ignored',
                     keylist, 
@@ -203,15 +371,110 @@ class Iter:
                 raise KeyError()
             return ordering
         except:
-            return keylist
+            return list(keylist)
         
     def __iter__(self):
         return self
 
 
+class Compact(Object):
+    """
+    The base of the (generated) compact classes.
+    The fields are stored in slots and the metadata is shared by the
+    class (modifying it affects all instances).  Names not defined by
+    the schema type are stored in the instance dict.  The names are
+    kept (in order) in a tuple that is shared by the instances having
+    the same names (see: L{__keysets__}) rather than in a L{Keylist}.
+    The I{__keylist__} of a compact object is a (read only) copy.
+    See: L{Factory.compact()}.
+    @cvar __keysets__: The shared name tuples (generated per class).
+    @type __keysets__: {tuple: tuple}
+    """
+
+    __slots__ = ()
+
+    __keysets__ = {}
+
+    def __init__(self):
+        object.__setattr__(self, '__keys__', ())
+
+    @property
+    def __keylist__(self):
+        return Keylist.fromkeys(self.__keys__)
+
+    def __setkeys(self, keys):
+        keys = self.__keysets__.setdefault(keys, keys)
+        object.__setattr__(self, '__keys__', keys)
+
+    def __setattr__(self, name, value):
+        builtin =  name.startswith('__') and name.endswith('__')
+        if not builtin:
+            keys = self.__keys__
+            if name not in keys:
+                self.__setkeys(keys + (name,))
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        try:
+            object.__delattr__(self, name)
+        except AttributeError:
+            cls = self.__class__.__name__
+            raise AttributeError("%s has no attribute '%s'" % (cls, name))
+        builtin =  name.startswith('__') and name.endswith('__')
+        if not builtin:
+            keys = self.__keys__
+            if name in keys:
+                self.__setkeys(tuple([k for k in keys if k != name]))
+
+    def __getitem__(self, name):
+        if isinstance(name, int):
+            name = self.__keys__[name]
+        return getattr(self, name)
+
+    def __len__(self):
+        return len(self.__keys__)
+
+    def __contains__(self, name):
+        return name in self.__keys__
+
+
+class Sparse:
+    """
+    The mixin of the (generated) sparse classes.  The I{deferred}
+    attributes are not set (nor listed in the keylist) until first
+    accessed, so that untouched branches are neither printed nor
+    marshalled.  See: L{suds.builder.Deferred}.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        builtin =  name.startswith('__') and name.endswith('__')
+        if not builtin and name not in self:
+            try:
+                deferred = self.__deferred__
+            except AttributeError:
+                deferred = None
+            if deferred is not None and deferred.build(self, name):
+                return object.__getattribute__(self, name)
+        cls = self.__class__.__name__
+        raise AttributeError("%s has no attribute '%s'" % (cls, name))
+
+    def __getstate__(self):
+        # the (unset) slots are skipped to not build deferred attributes
+        names = self.__class__.__dict__.get('__slots__')
+        if not names:
+            return self.__dict__
+        slots = {}
+        for name in names:
+            if name == '__keys__' or name in self:
+                slots[name] = object.__getattribute__(self, name)
+        return (self.__dict__, slots)
+
+
 class Metadata(Object):
     def __init__(self):
-        self.__keylist__ = []
+        self.__keylist__ = Keylist()
         self.__printer__ = Printer()
 
 
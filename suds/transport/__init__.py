@@ -30,10 +30,14 @@ class Request:
     A transport request
     @ivar url: The url for the request.
     @type url: str
-    @ivar message: The message to be sent in a POST request.
-    @type message: str
+    @ivar message: The message to be sent in a POST request.  An iterable
+        message is sent (chunked) as it is iterated.
+    @type message: (bytes|I{iterable} of bytes)
     @ivar headers: The http headers to be used for the request.
     @type headers: dict
+    @ivar stream: Indicates that the reply message may be returned as
+        a readable (file-like) stream instead of bytes.
+    @type stream: bool
     """
 
     def __init__(self, url, message=None):
@@ -46,6 +50,7 @@ class Request:
         self.url = url
         self.headers = {}
         self.message = message
+        self.stream = False
         
     def __str__(self):
         s = []
@@ -61,8 +66,9 @@ class Reply:
     A transport reply
     @ivar code: The http code returned.
     @type code: int
-    @ivar message: The message to be sent in a POST request.
-    @type message: str
+    @ivar message: The reply message received.  A readable stream
+        when requested by L{Request.stream}.
+    @type message: (bytes|stream)
     @ivar headers: The http headers to be used for the request.
     @type headers: dict
     """
@@ -121,6 +127,30 @@ class Transport:
             - cookies
             - sending message
             - brokering exceptions into L{TransportError}
+        When L{Request.stream} is set, implementations may return the
+        (non-empty) reply message as a readable stream that is parsed
+        while it is received.  The stream is closed by the caller.
+        @param request: A transport request.
+        @type request: L{Request}
+        @return: The reply
+        @rtype: L{Reply}
+        @raise TransportError: On all transport errors.
+        """
+        raise Exception('not-implemented')
+
+
+class AsyncTransport(Transport):
+    """
+    The asynchronous transport I{interface}.
+    Async transports also implement the (blocking) L{Transport} interface
+    which is used to load the WSDL and for calls that are not awaited.
+    """
+    
+    async def asend(self, request):
+        """
+        Send soap message without blocking the event loop.
+        Implementations are expected to handle the same concerns
+        as L{Transport.send}.
         @param request: A transport request.
         @type request: L{Request}
         @return: The reply
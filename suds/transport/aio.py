@@ -0,0 +1,550 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+"""
+Contains classes for an asynchronous (asyncio) HTTP transport.
+"""
+
+import ssl
+import time
+import socket
+import asyncio
+import http.client
+from io import BytesIO
+from urllib.request import Request as U2Request
+from suds.transport import AsyncTransport, TransportError, Reply
+from suds.transport.pool import PooledHttpTransport
+from logging import getLogger
+
+log = getLogger(__name__)
+
+
+class Response:
+    """
+    A parsed http response (status and headers).
+    Provides the subset of the I{http.client.HTTPResponse} interface
+    needed by the cookie jar.
+    @ivar status: The http status code.
+    @type status: int
+    @ivar reason: The http reason phrase.
+    @type reason: str
+    @ivar headers: The http headers.
+    @type headers: I{http.client.HTTPMessage}
+    @ivar will_close: Indicates the connection must be closed.
+    @type will_close: bool
+    """
+
+    def __init__(self, status, reason, headers, will_close):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.will_close = will_close
+
+    def info(self):
+        return self.headers
+
+
+class Connection:
+    """
+    A persistent (asyncio stream) connection.
+    @ivar reader: The stream reader.
+    @type reader: I{asyncio.StreamReader}
+    @ivar writer: The stream writer.
+    @type writer: I{asyncio.StreamWriter}
+    @ivar stamp: The time the connection was last used.
+    @type stamp: float
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.stamp = time.time()
+
+    def closed(self):
+        """
+        Get whether the connection has been closed by either end.
+        @rtype: bool
+        """
+        return self.writer.is_closing() or self.reader.at_eof()
+
+    def close(self):
+        try:
+            self.writer.close()
+        except RuntimeError:
+            # the event loop is closed and the transport can no longer
+            # be closed, so the socket is shut down and (later) closed
+            # when the transport is collected.
+            sock = self.writer.get_extra_info('socket')
+            if sock is None:
+                return
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class AsyncConnectionPool:
+    """
+    A pool of persistent HTTP/1.1 connections for use on a single
+    event loop.  Connections are pooled by I{key} = (scheme, host, port,
+    proxy) and checked out for the exclusive use of one request at a time.
+    @ivar maxsize: The maximum number of I{idle} connections kept.
+    @type maxsize: int
+    @ivar hostlimit: The maximum number of connections (idle + active)
+        per I{key}.  Callers wait when the limit is reached.
+    @type hostlimit: int
+    @ivar idletimeout: The number of seconds an idle connection is kept.
+    @type idletimeout: float
+    @ivar loop: The event loop the connections belong to.
+    @type loop: I{asyncio.AbstractEventLoop}
+    @ivar context: The TLS context shared by all https connections.
+    @type context: I{ssl.SSLContext}
+    @ivar hits: The number of requests served by an idle connection.
+    @type hits: int
+    @ivar misses: The number of requests that opened a new connection.
+    @type misses: int
+    """
+
+    def __init__(self, maxsize=10, hostlimit=4, idletimeout=60):
+        """
+        @param maxsize: The maximum number of I{idle} connections kept.
+        @type maxsize: int
+        @param hostlimit: The maximum number of connections per I{key}.
+        @type hostlimit: int
+        @param idletimeout: The number of seconds an idle connection is kept.
+        @type idletimeout: float
+        """
+        self.maxsize = maxsize
+        self.hostlimit = hostlimit
+        self.idletimeout = idletimeout
+        self.loop = asyncio.get_running_loop()
+        self.context = None
+        self.hits = 0
+        self.misses = 0
+        self.__idle = {}
+        self.__active = {}
+        self.__lock = asyncio.Condition()
+
+    async def checkout(self, key, timeout, reuse=True):
+        """
+        Check out a connection for the specified I{key}.  An idle connection
+        is reused when available, else a new connection is opened.  When
+        idle connections may not be reused, the oldest is closed to make
+        room for the new connection.  When the I{hostlimit} is reached,
+        the caller waits (at most I{timeout} seconds) for a connection
+        to be checked in.
+        @param key: A connection key: (scheme, host, port, proxy).
+        @type key: tuple
+        @param timeout: The connect timeout and the time to wait
+            for a connection.
+        @type timeout: float
+        @param reuse: Indicates an idle connection may be reused.
+        @type reuse: bool
+        @return: A tuple: (connection, reused)
+        @rtype: (L{Connection}, bool)
+        @raise TransportError: When no connection is checked in
+            within I{timeout} seconds.
+        """
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+        async with self.__lock:
+            while True:
+                self.__expire()
+                idle = self.__idle.get(key)
+                while idle and reuse:
+                    conn = idle.pop()
+                    if conn.closed():
+                        conn.close()
+                        continue
+                    self.__active[key] = self.__active.get(key, 0) + 1
+                    self.hits += 1
+                    return (conn, True)
+                if self.__count(key) < self.hostlimit:
+                    break
+                if idle:
+                    # not reused, so make room for a new connection
+                    conn = idle.pop(0)
+                    log.debug('connection (%s) evicted', key)
+                    conn.close()
+                    continue
+                if deadline is None:
+                    await self.__lock.wait()
+                    continue
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise TransportError(
+                        'no connection (%s) available after %s seconds'
+                            % (key, timeout), None)
+                try:
+                    await asyncio.wait_for(self.__lock.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+            self.__active[key] = self.__active.get(key, 0) + 1
+            self.misses += 1
+        try:
+            conn = await asyncio.wait_for(self.connect(key), timeout)
+            return (conn, False)
+        except:
+            await self.checkin(key, None)
+            raise
+
+    async def checkin(self, key, conn, reusable=True):
+        """
+        Return a checked out connection to the pool.
+        @param key: A connection key: (scheme, host, port, proxy).
+        @type key: tuple
+        @param conn: A connection previously checked out.
+        @type conn: L{Connection}
+        @param reusable: Indicates the connection may be reused.
+        @type reusable: bool
+        """
+        async with self.__lock:
+            self.__active[key] -= 1
+            if conn is not None:
+                if reusable and self.__nidle() < self.maxsize:
+                    conn.stamp = time.time()
+                    self.__idle.setdefault(key, []).append(conn)
+                    conn = None
+            self.__lock.notify()
+        if conn is not None:
+            conn.close()
+
+    async def connect(self, key):
+        """
+        Open a new connection for the specified I{key}.
+        @param key: A connection key: (scheme, host, port, proxy).
+        @type key: tuple
+        @return: A new connection.
+        @rtype: L{Connection}
+        """
+        scheme, host, port, proxy = key
+        context = None
+        if scheme == 'https':
+            if self.context is None:
+                self.context = ssl.create_default_context()
+            context = self.context
+        if proxy is None:
+            reader, writer = await asyncio.open_connection(
+                host, port, ssl=context)
+        elif context is None:
+            reader, writer = await asyncio.open_connection(*proxy)
+        else:
+            reader, writer = await asyncio.open_connection(*proxy)
+            await self.tunnel(reader, writer, host, port)
+            await writer.start_tls(context, server_hostname=host)
+        log.debug('connection (%s) created', key)
+        return Connection(reader, writer)
+
+    async def tunnel(self, reader, writer, host, port):
+        """
+        Establish a tunnel through an http proxy using I{CONNECT}.
+        @param reader: The (proxy) stream reader.
+        @type reader: I{asyncio.StreamReader}
+        @param writer: The (proxy) stream writer.
+        @type writer: I{asyncio.StreamWriter}
+        @param host: The target host.
+        @type host: str
+        @param port: The target port.
+        @type port: int
+        """
+        target = '%s:%d' % (host, port)
+        connect = 'CONNECT %s HTTP/1.1\r\nHost: %s\r\n\r\n' % (target, target)
+        writer.write(connect.encode('ascii'))
+        head = await reader.readuntil(b'\r\n\r\n')
+        status = int(head.split(None, 2)[1])
+        if status != 200:
+            writer.close()
+            raise TransportError('tunnel to (%s) failed' % target, status)
+
+    def clear(self):
+        """
+        Close and discard all idle connections.
+        """
+        idle = self.__idle
+        self.__idle = {}
+        for conns in list(idle.values()):
+            for conn in conns:
+                conn.close()
+
+    def stats(self):
+        """
+        Get the pool statistics.
+        @return: A dictionary of: hits, misses, idle and active counts.
+        @rtype: dict
+        """
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            idle=self.__nidle(),
+            active=sum(self.__active.values()))
+
+    def __count(self, key):
+        return self.__active.get(key, 0) + len(self.__idle.get(key, ()))
+
+    def __nidle(self):
+        return sum([len(c) for c in list(self.__idle.values())])
+
+    def __expire(self):
+        limit = time.time() - self.idletimeout
+        for key, conns in list(self.__idle.items()):
+            expired = [c for c in conns if c.stamp < limit]
+            if not len(expired):
+                continue
+            self.__idle[key] = [c for c in conns if c.stamp >= limit]
+            for conn in expired:
+                log.debug('connection (%s) expired', key)
+                conn.close()
+
+    def __str__(self):
+        return 'pool: %s' % self.stats()
+
+
+class AsyncHttpTransport(PooledHttpTransport, AsyncTransport):
+    """
+    HTTP transport for use with asyncio.  Awaited calls (see: I{Method.aio()})
+    are sent on non-blocking keep-alive connections held in an
+    L{AsyncConnectionPool} so that a single event loop can have a large
+    number of calls in flight.  Calls that are not awaited (including
+    loading the WSDL) are sent by the L{PooledHttpTransport}.
+    The I{hostlimit} option bounds the number of concurrent connections
+    to each endpoint and should be raised to match the desired concurrency.
+    @ivar apools: The (async) connection pools by event loop.
+    @type apools: {I{asyncio.AbstractEventLoop}: L{AsyncConnectionPool}}
+    """
+
+    stale = (
+        asyncio.IncompleteReadError,
+        ConnectionResetError,
+        ConnectionAbortedError,
+        BrokenPipeError,
+    )
+
+    def __init__(self, **kwargs):
+        """
+        @param kwargs: Keyword arguments.
+            See: L{PooledHttpTransport}
+        """
+        PooledHttpTransport.__init__(self, **kwargs)
+        self.apools = {}
+
+    async def asend(self, request):
+        if isinstance(request.url, bytes):
+            request.url = request.url.decode('utf-8')
+        url = request.url
+        self.addcredentials(request)
+        u2request = U2Request(url, request.message, request.headers)
+        self.addcookies(u2request)
+        request.headers.update(u2request.headers)
+        log.debug('sending:\n%s', request)
+        headers = dict(u2request.header_items())
+        response, body = \
+            await self.arequest('POST', url, request.message, headers)
+        self.getcookies(response, u2request)
+        if response.status >= 300:
+            raise TransportError(response.reason, response.status, BytesIO(body))
+        result = Reply(200, response.headers, body)
+        log.debug('received:\n%s', result)
+        return result
+
+    async def arequest(self, method, url, body, headers):
+        """
+        Perform an http request using a pooled (async) connection.
+        A request sent on a reused connection that the server has since
+        closed is retried (once) on a new connection.  An iterable body
+        is sent chunked, as it is iterated, and cannot be resent so it is
+        always sent on a new connection.
+        @param method: The http method.
+        @type method: str
+        @param url: The request url.
+        @type url: str
+        @param body: The (optional) request body.
+        @type body: (bytes|I{iterable} of bytes)
+        @param headers: The http headers.
+        @type headers: dict
+        @return: A tuple: (response, body)
+        @rtype: (L{Response}, bytes)
+        """
+        pool = self.aconnections()
+        key, path = self.endpoint(url)
+        timeout = self.options.timeout
+        message = self.encode(method, path, key, body, headers)
+        reuse = ( body is None or isinstance(body, bytes) )
+        while True:
+            conn, reused = await pool.checkout(key, timeout, reuse)
+            try:
+                conn.writer.write(message)
+                if not reuse:
+                    await self.writechunked(conn.writer, body)
+                response, content = await asyncio.wait_for(
+                    self.read(conn.reader, method), timeout)
+            except self.stale:
+                await pool.checkin(key, conn, False)
+                if reused:
+                    log.debug('connection (%s) stale, retrying', key)
+                    continue
+                raise
+            except:
+                await pool.checkin(key, conn, False)
+                raise
+            await pool.checkin(key, conn, not response.will_close)
+            log.debug('%s', pool)
+            return (response, content)
+
+    def encode(self, method, path, key, body, headers):
+        """
+        Encode an http/1.1 request.
+        @param method: The http method.
+        @type method: str
+        @param path: The request path.
+        @type path: str
+        @param key: The connection key: (scheme, host, port, proxy).
+        @type key: tuple
+        @param body: The (optional) request body.  An iterable body
+            is not included and is announced as chunked.
+        @type body: (bytes|I{iterable} of bytes)
+        @param headers: The http headers.
+        @type headers: dict
+        @return: The encoded request.
+        @rtype: bytes
+        """
+        scheme, host, port, proxy = key
+        names = set([k.lower() for k in headers])
+        lines = ['%s %s HTTP/1.1' % (method, path)]
+        if 'host' not in names:
+            if port == http.client.HTTP_PORT and scheme == 'http' \
+                or port == http.client.HTTPS_PORT and scheme == 'https':
+                lines.append('Host: %s' % host)
+            else:
+                lines.append('Host: %s:%d' % (host, port))
+        if body is not None and not isinstance(body, bytes):
+            if 'transfer-encoding' not in names:
+                lines.append('Transfer-Encoding: chunked')
+            body = None
+        elif 'content-length' not in names and body is not None:
+            lines.append('Content-Length: %d' % len(body))
+        head = ['\r\n'.join(lines).encode('latin-1')]
+        for k, v in list(headers.items()):
+            if not isinstance(v, bytes):
+                v = str(v).encode('latin-1')
+            head.append(b''.join((k.encode('latin-1'), b': ', v)))
+        head.append(b'')
+        head.append(body or b'')
+        return b'\r\n'.join(head)
+
+    async def writechunked(self, writer, body):
+        """
+        Write an iterable request body using the I{chunked} transfer
+        encoding.  The writer is drained after each chunk so that the
+        body is not buffered in full.
+        @param writer: The stream writer.
+        @type writer: I{asyncio.StreamWriter}
+        @param body: The request body.
+        @type body: I{iterable} of bytes
+        """
+        for chunk in body:
+            if not chunk:
+                continue
+            writer.write(b'%x\r\n' % len(chunk))
+            writer.write(chunk)
+            writer.write(b'\r\n')
+            await writer.drain()
+        writer.write(b'0\r\n\r\n')
+
+    async def read(self, reader, method):
+        """
+        Read an http response.
+        @param reader: The stream reader.
+        @type reader: I{asyncio.StreamReader}
+        @param method: The http method of the request.
+        @type method: str
+        @return: A tuple: (response, body)
+        @rtype: (L{Response}, bytes)
+        """
+        while True:
+            head = await reader.readuntil(b'\r\n\r\n')
+            line, head = head.split(b'\r\n', 1)
+            version, status, reason = \
+                (line.decode('latin-1').split(None, 2) + [''])[:3]
+            status = int(status)
+            if status != http.client.CONTINUE:
+                break
+        headers = http.client.parse_headers(BytesIO(head))
+        connection = headers.get('connection', '').lower()
+        will_close = connection == 'close' or \
+            (version == 'HTTP/1.0' and connection != 'keep-alive')
+        encoding = headers.get('transfer-encoding', '').lower()
+        length = headers.get('content-length')
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            body = b''
+        elif 'chunked' in encoding:
+            body = await self.readchunked(reader)
+        elif length is not None:
+            body = await reader.readexactly(int(length))
+        else:
+            body = await reader.read()
+            will_close = True
+        response = Response(status, reason.strip(), headers, will_close)
+        return (response, body)
+
+    async def readchunked(self, reader):
+        """
+        Read a I{chunked} response body.
+        @param reader: The stream reader.
+        @type reader: I{asyncio.StreamReader}
+        @return: The body.
+        @rtype: bytes
+        """
+        chunks = []
+        while True:
+            line = await reader.readuntil(b'\r\n')
+            size = int(line.split(b';', 1)[0], 16)
+            if size == 0:
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        while True:
+            line = await reader.readuntil(b'\r\n')
+            if line == b'\r\n':
+                break
+        return b''.join(chunks)
+
+    def aconnections(self):
+        """
+        Get the (async) connection pool for the running event loop,
+        created on first use.  The idle connections of the pools that
+        belong to closed event loops are closed and the pools discarded.
+        @return: The connection pool.
+        @rtype: L{AsyncConnectionPool}
+        """
+        loop = asyncio.get_running_loop()
+        pool = self.apools.get(loop)
+        if pool is None:
+            for closed in [l for l in list(self.apools) if l.is_closed()]:
+                discarded = self.apools.pop(closed, None)
+                if discarded is not None:
+                    discarded.clear()
+            pool = AsyncConnectionPool(
+                self.options.poolsize,
+                self.options.hostlimit,
+                self.options.idletimeout)
+            self.apools[loop] = pool
+        return pool
+
+    def __deepcopy__(self, memo={}):
+        clone = PooledHttpTransport.__deepcopy__(self, memo)
+        clone.apools = self.apools
+        return clone
@@ -82,7 +82,10 @@ class HttpTransport(Transport):
             log.debug('sending:\n%s', request)
             fp = self.u2open(u2request)
             self.getcookies(fp, u2request)
-            result = Reply(200, fp.headers, fp.read())
+            if request.stream and self.streamable(fp):
+                result = Reply(200, fp.headers, fp)
+            else:
+                result = Reply(200, fp.headers, fp.read())
             log.debug('received:\n%s', result)
         except HTTPError as e:
             if e.code in (202,204):
@@ -91,6 +94,21 @@ class HttpTransport(Transport):
                 raise TransportError(e.msg, e.code, e.fp)
         return result
 
+    def streamable(self, fp):
+        """
+        Get whether a reply body may be returned as a stream.
+        Only non-empty http response bodies are streamed.
+        @param fp: An http response.
+        @type fp: I{http.client.HTTPResponse}
+        @rtype: bool
+        """
+        if getattr(fp, 'length', None) == 0:
+            return False
+        peek = getattr(fp, 'peek', None)
+        if peek is None:
+            return False
+        return len(peek(1)) > 0
+
     def addcookies(self, u2request):
         """
         Add cookies in the cookiejar to the request.
@@ -44,6 +44,18 @@ class Options(Skin):
         - B{password} - The password used for http authentication.
                 - type: I{str}
                 - default: None
+        - B{poolsize} - The maximum number of idle (keep-alive) connections
+            kept by pooled transports.
+                - type: I{int}
+                - default: 10
+        - B{hostlimit} - The maximum number of connections per host
+            opened by pooled transports.
+                - type: I{int}
+                - default: 4
+        - B{idletimeout} - The number of seconds an idle connection is
+            kept by pooled transports.
+                - type: I{float}
+                - default: 60
     """    
     def __init__(self, **kwargs):
         domain = __name__
@@ -53,5 +65,8 @@ class Options(Skin):
             Definition('headers', dict, {}),
             Definition('username', str, None),
             Definition('password', str, None),
+            Definition('poolsize', int, 10),
+            Definition('hostlimit', int, 4),
+            Definition('idletimeout', (int,float), 60),
         ]
         Skin.__init__(self, domain, definitions, kwargs)
\ No newline at end of file
@@ -0,0 +1,504 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+"""
+Contains classes for a pooled (keep-alive) HTTP transport.
+"""
+
+import ssl
+import time
+import base64
+import threading
+import http.client
+from io import BytesIO
+from urllib.parse import urlsplit
+from urllib.request import Request as U2Request
+from suds.transport import TransportError, Reply
+from suds.transport.http_transport import HttpTransport
+from logging import getLogger
+
+log = getLogger(__name__)
+
+
+class HTTPSConnection(http.client.HTTPSConnection):
+    """
+    An HTTPS connection that resumes a previously negotiated
+    TLS session when one is provided.
+    @ivar session: A TLS session to be resumed (may be None).
+    @type session: I{ssl.SSLSession}
+    """
+
+    def __init__(self, host, port=None, session=None, **kwargs):
+        http.client.HTTPSConnection.__init__(self, host, port, **kwargs)
+        self.session = session
+
+    def connect(self):
+        http.client.HTTPConnection.connect(self)
+        if self._tunnel_host:
+            hostname = self._tunnel_host
+        else:
+            hostname = self.host
+        self.sock = self._context.wrap_socket(
+            self.sock,
+            server_hostname=hostname,
+            session=self.session)
+
+
+class ConnectionPool:
+    """
+    A thread safe pool of persistent HTTP/1.1 connections.
+    Connections are pooled by I{key} = (scheme, host, port, proxy) and
+    checked out for the exclusive use of one request at a time.
+    @ivar maxsize: The maximum number of I{idle} connections kept.
+    @type maxsize: int
+    @ivar hostlimit: The maximum number of connections (idle + active)
+        per I{key}.  Callers block when the limit is reached.
+    @type hostlimit: int
+    @ivar idletimeout: The number of seconds an idle connection is kept.
+    @type idletimeout: float
+    @ivar context: The TLS context shared by all https connections.
+    @type context: I{ssl.SSLContext}
+    @ivar hits: The number of requests served by an idle connection.
+    @type hits: int
+    @ivar misses: The number of requests that opened a new connection.
+    @type misses: int
+    """
+
+    def __init__(self, maxsize=10, hostlimit=4, idletimeout=60):
+        """
+        @param maxsize: The maximum number of I{idle} connections kept.
+        @type maxsize: int
+        @param hostlimit: The maximum number of connections per I{key}.
+        @type hostlimit: int
+        @param idletimeout: The number of seconds an idle connection is kept.
+        @type idletimeout: float
+        """
+        self.maxsize = maxsize
+        self.hostlimit = hostlimit
+        self.idletimeout = idletimeout
+        self.context = None
+        self.hits = 0
+        self.misses = 0
+        self.__idle = {}
+        self.__active = {}
+        self.__sessions = {}
+        self.__lock = threading.Condition()
+
+    def checkout(self, key, timeout, reuse=True):
+        """
+        Check out a connection for the specified I{key}.  An idle connection
+        is reused when available, else a new connection is created.  When
+        idle connections may not be reused, the oldest is closed to make
+        room for the new connection.  When the I{hostlimit} is reached,
+        the caller waits (at most I{timeout} seconds) for a connection
+        to be checked in.
+        @param key: A connection key: (scheme, host, port, proxy).
+        @type key: tuple
+        @param timeout: The socket timeout for new connections and the
+            time to wait for a connection.
+        @type timeout: float
+        @param reuse: Indicates an idle connection may be reused.
+        @type reuse: bool
+        @return: A tuple: (connection, reused)
+        @rtype: (I{HTTPConnection}, bool)
+        @raise TransportError: When no connection is checked in
+            within I{timeout} seconds.
+        """
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+        with self.__lock:
+            while True:
+                self.__expire()
+                idle = self.__idle.get(key)
+                if idle and reuse:
+                    conn = idle.pop()[0]
+                    self.__active[key] = self.__active.get(key, 0) + 1
+                    self.hits += 1
+                    return (conn, True)
+                if self.__count(key) < self.hostlimit:
+                    break
+                if idle:
+                    # not reused, so make room for a new connection
+                    conn = idle.pop(0)[0]
+                    log.debug('connection (%s) evicted', key)
+                    conn.close()
+                    continue
+                if deadline is None:
+                    self.__lock.wait()
+                    continue
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise TransportError(
+                        'no connection (%s) available after %s seconds'
+                            % (key, timeout), None)
+                self.__lock.wait(remaining)
+            self.__active[key] = self.__active.get(key, 0) + 1
+            self.misses += 1
+            session = self.__sessions.get(key)
+        try:
+            return (self.connect(key, timeout, session), False)
+        except:
+            self.checkin(key, None)
+            raise
+
+    def checkin(self, key, conn, reusable=True):
+        """
+        Return a checked out connection to the pool.
+        @param key: A connection key: (scheme, host, port, proxy).
+        @type key: tuple
+        @param conn: A connection previously checked out.
+        @type conn: I{HTTPConnection}
+        @param reusable: Indicates the connection may be reused.
+        @type reusable: bool
+        """
+        with self.__lock:
+            self.__active[key] -= 1
+            if conn is not None:
+                session = getattr(conn.sock, 'session', None)
+                if session is not None:
+                    self.__sessions[key] = session
+                if reusable and self.__nidle() < self.maxsize:
+                    idle = self.__idle.setdefault(key, [])
+                    idle.append((conn, time.time()))
+                    conn = None
+            self.__lock.notify()
+        if conn is not None:
+            conn.close()
+
+    def connect(self, key, timeout, session=None):
+        """
+        Create a new (unconnected) connection for the specified I{key}.
+        @param key: A connection key: (scheme, host, port, proxy).
+        @type key: tuple
+        @param timeout: The socket timeout.
+        @type timeout: float
+        @param session: A TLS session to be resumed.
+        @type session: I{ssl.SSLSession}
+        @return: A new connection.
+        @rtype: I{HTTPConnection}
+        """
+        scheme, host, port, proxy = key
+        if proxy is None:
+            target = (host, port)
+        else:
+            target = proxy
+        if scheme == 'https':
+            if self.context is None:
+                self.context = ssl.create_default_context()
+            conn = HTTPSConnection(
+                target[0],
+                target[1],
+                session=session,
+                timeout=timeout,
+                context=self.context)
+            if proxy is not None:
+                conn.set_tunnel(host, port)
+        else:
+            conn = http.client.HTTPConnection(
+                target[0],
+                target[1],
+                timeout=timeout)
+        log.debug('connection (%s) created', key)
+        return conn
+
+    def clear(self):
+        """
+        Close and discard all idle connections.
+        """
+        with self.__lock:
+            idle = self.__idle
+            self.__idle = {}
+        for conns in list(idle.values()):
+            for conn, stamp in conns:
+                conn.close()
+
+    def stats(self):
+        """
+        Get the pool statistics.
+        @return: A dictionary of: hits, misses, idle and active counts.
+        @rtype: dict
+        """
+        with self.__lock:
+            return dict(
+                hits=self.hits,
+                misses=self.misses,
+                idle=self.__nidle(),
+                active=sum(self.__active.values()))
+
+    def __count(self, key):
+        return self.__active.get(key, 0) + len(self.__idle.get(key, ()))
+
+    def __nidle(self):
+        return sum([len(c) for c in list(self.__idle.values())])
+
+    def __expire(self):
+        limit = time.time() - self.idletimeout
+        for key, conns in list(self.__idle.items()):
+            expired = [c for c in conns if c[1] < limit]
+            if not len(expired):
+                continue
+            self.__idle[key] = [c for c in conns if c[1] >= limit]
+            for conn, stamp in expired:
+                log.debug('connection (%s) expired', key)
+                conn.close()
+
+    def __str__(self):
+        return 'pool: %s' % self.stats()
+
+
+class ReplyStream:
+    """
+    A (file-like) reply body read directly from a pooled connection.
+    The connection is returned to the pool when the body has been
+    read in full or the stream is closed.
+    @ivar pool: The connection pool.
+    @type pool: L{ConnectionPool}
+    @ivar key: The connection key.
+    @type key: tuple
+    @ivar conn: The connection.
+    @type conn: I{HTTPConnection}
+    @ivar response: The http response.
+    @type response: I{HTTPResponse}
+    """
+
+    def __init__(self, pool, key, conn, response):
+        self.pool = pool
+        self.key = key
+        self.conn = conn
+        self.response = response
+
+    def read(self, n=-1):
+        if self.conn is None:
+            return b''
+        if n is None or n < 0:
+            n = None
+        try:
+            data = self.response.read(n)
+        except:
+            self.release(False)
+            raise
+        if self.response.isclosed():
+            # drained
+            self.release(not self.response.will_close)
+        return data
+
+    def close(self):
+        if self.conn is not None:
+            self.release(False)
+
+    def release(self, reusable):
+        conn = self.conn
+        self.conn = None
+        self.pool.checkin(self.key, conn, reusable)
+
+
+class PooledHttpTransport(HttpTransport):
+    """
+    HTTP transport that keeps persistent (keep-alive) HTTP/1.1 connections
+    in a L{ConnectionPool} so that consecutive requests to the same endpoint
+    do not pay for a new TCP connection and TLS handshake.  The pool is
+    thread safe and is shared by copies of the transport made when the
+    client is cloned.  Provides basic http authentication by appending the
+    I{Authorization} header on every request when a username and password
+    are specified.
+    @ivar pool: The connection pool.
+    @type pool: L{ConnectionPool}
+    """
+
+    stale = (
+        http.client.RemoteDisconnected,
+        http.client.BadStatusLine,
+        ConnectionResetError,
+        ConnectionAbortedError,
+        BrokenPipeError,
+    )
+
+    def __init__(self, **kwargs):
+        """
+        @param kwargs: Keyword arguments.
+            - B{proxy} - An http proxy to be specified on requests.
+                 The proxy is defined as {protocol:proxy,}
+                    - type: I{dict}
+                    - default: {}
+            - B{timeout} - Set the url open timeout (seconds).
+                    - type: I{float}
+                    - default: 90
+            - B{username} - The username used for http authentication.
+                    - type: I{str}
+                    - default: None
+            - B{password} - The password used for http authentication.
+                    - type: I{str}
+                    - default: None
+            - B{poolsize} - The maximum number of idle connections kept.
+                    - type: I{int}
+                    - default: 10
+            - B{hostlimit} - The maximum number of connections per host.
+                    - type: I{int}
+                    - default: 4
+            - B{idletimeout} - The number of seconds idle connections are kept.
+                    - type: I{float}
+                    - default: 60
+        """
+        HttpTransport.__init__(self, **kwargs)
+        self.pool = None
+        self.__lock = threading.Lock()
+
+    def open(self, request):
+        if isinstance(request.url, bytes):
+            request.url = request.url.decode('utf-8')
+        if urlsplit(request.url).scheme not in ('http', 'https'):
+            return HttpTransport.open(self, request)
+        log.debug('opening (%s)', request.url)
+        self.addcredentials(request)
+        response, body = self.request('GET', request.url, None, request.headers)
+        if response.status >= 300:
+            raise TransportError(response.reason, response.status, BytesIO(body))
+        return BytesIO(body)
+
+    def send(self, request):
+        if isinstance(request.url, bytes):
+            request.url = request.url.decode('utf-8')
+        url = request.url
+        self.addcredentials(request)
+        u2request = U2Request(url, request.message, request.headers)
+        self.addcookies(u2request)
+        request.headers.update(u2request.headers)
+        log.debug('sending:\n%s', request)
+        headers = dict(u2request.header_items())
+        response, body = self.request(
+            'POST', url, request.message, headers, request.stream)
+        self.getcookies(response, u2request)
+        if response.status >= 300:
+            raise TransportError(response.reason, response.status, BytesIO(body))
+        result = Reply(200, response.headers, body)
+        log.debug('received:\n%s', result)
+        return result
+
+    def request(self, method, url, body, headers, stream=False):
+        """
+        Perform an http request using a pooled connection.  A request sent
+        on a reused connection that the server has since closed is retried
+        (once) on a new connection.  An iterable body is sent chunked, as
+        it is iterated, and cannot be resent so it is always sent on a new
+        connection.
+        @param method: The http method.
+        @type method: str
+        @param url: The request url.
+        @type url: str
+        @param body: The (optional) request body.
+        @type body: (bytes|I{iterable} of bytes)
+        @param headers: The http headers.
+        @type headers: dict
+        @param stream: Return a (successful) response body as a stream.
+            The connection is returned to the pool when the stream
+            has been read or closed.
+        @type stream: bool
+        @return: A tuple: (response, body)
+        @rtype: (I{HTTPResponse}, (bytes|L{ReplyStream}))
+        """
+        pool = self.connections()
+        key, path = self.endpoint(url)
+        reuse = ( body is None or isinstance(body, bytes) )
+        while True:
+            conn, reused = pool.checkout(key, self.options.timeout, reuse)
+            try:
+                conn.request(method, path, body, headers)
+                response = conn.getresponse()
+                if stream and response.status < 300 \
+                    and self.streamable(response):
+                    return (response, ReplyStream(pool, key, conn, response))
+                content = response.read()
+            except self.stale:
+                pool.checkin(key, conn, False)
+                if reused:
+                    log.debug('connection (%s) stale, retrying', key)
+                    continue
+                raise
+            except:
+                pool.checkin(key, conn, False)
+                raise
+            pool.checkin(key, conn, not response.will_close)
+            log.debug('%s', pool)
+            return (response, content)
+
+    def endpoint(self, url):
+        """
+        Get the pool key and request path for the specified url.
+        @param url: A url.
+        @type url: str
+        @return: A tuple: (key, path) where key = (scheme, host, port, proxy)
+        @rtype: (tuple, str)
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme
+        host = parts.hostname
+        port = parts.port
+        if port is None:
+            port = (scheme == 'https' and 443 or 80)
+        proxy = self.proxyfor(scheme)
+        if proxy is not None and scheme == 'http':
+            path = url
+        else:
+            path = parts.path or '/'
+            if parts.query:
+                path = '?'.join((path, parts.query))
+        return ((scheme, host, port, proxy), path)
+
+    def proxyfor(self, scheme):
+        """
+        Get the (host, port) of the proxy defined for I{scheme}.
+        @param scheme: A url scheme.
+        @type scheme: str
+        @return: The proxy (host, port) or None.
+        @rtype: (str, int)
+        """
+        proxy = self.options.proxy.get(scheme)
+        if proxy is None:
+            return None
+        if '://' not in proxy:
+            proxy = 'http://%s' % proxy
+        parts = urlsplit(proxy)
+        return (parts.hostname, parts.port or 80)
+
+    def connections(self):
+        """
+        Get the connection pool, created (once) on first use.
+        @return: The connection pool.
+        @rtype: L{ConnectionPool}
+        """
+        with self.__lock:
+            if self.pool is None:
+                self.pool = ConnectionPool(
+                    self.options.poolsize,
+                    self.options.hostlimit,
+                    self.options.idletimeout)
+            return self.pool
+
+    def addcredentials(self, request):
+        credentials = self.credentials()
+        if not (None in credentials):
+            encoded = base64.b64encode(':'.join(credentials).encode('utf-8'))
+            basic = 'Basic %s' % encoded.decode('ascii')
+            request.headers['Authorization'] = basic
+
+    def credentials(self):
+        return (self.options.username, self.options.password)
+
+    def __deepcopy__(self, memo={}):
+        clone = HttpTransport.__deepcopy__(self, memo)
+        clone.pool = self.connections()
+        return clone
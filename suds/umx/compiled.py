@@ -0,0 +1,406 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+"""
+Provides schema I{compiled} unmarshaller classes.
+"""
+
+from logging import getLogger
+from suds import *
+from suds.umx import *
+from suds.umx.attrlist import AttrList
+from suds.umx.core import reserved
+from suds.umx.encoded import Encoded
+from suds.sax import Namespace
+from suds.sax.text import Text
+from suds.sudsobject import Factory, Object, merge
+from suds.resolver import Memo
+from suds.xsd.query import qualify
+
+log = getLogger(__name__)
+
+
+class Field:
+    """
+    A compiled schema element as found in the context of its parent type.
+    @ivar type: The schema object.
+    @type type: L{xsd.sxbase.SchemaObject}
+    @ivar key: The (python) attribute name.
+    @type key: str
+    @ivar unbounded: The element is a collection.
+    @type unbounded: bool
+    @ivar nillable: The element is nillable.
+    @type nillable: bool
+    @ivar real: The I{real} (fully resolved) type.
+    @type real: L{xsd.sxbase.SchemaObject}
+    """
+
+    def __init__(self, type, name):
+        """
+        @param type: The schema object.
+        @type type: L{xsd.sxbase.SchemaObject}
+        @param name: The element name.
+        @type name: str
+        """
+        described = type.descriptor()
+        resolved = described.resolved
+        self.type = type
+        self.key = reserved.get(name, name)
+        self.unbounded = described.unbounded
+        self.nillable = ( described.nillable or \
+            (resolved.builtin() and resolved.nillable ) )
+        self.real = resolved.descriptor().resolved
+
+
+class Routine:
+    """
+    A compiled unmarshal routine for a I{real} (resolved) schema type.
+    Child elements and attributes are mapped by name when first used.
+    @ivar type: The resolved schema type.
+    @type type: L{xsd.sxbase.SchemaObject}
+    @ivar translate: The text translator.
+    @type translate: callable
+    @ivar fields: The compiled fields by element name.
+    @type fields: {str: L{Field}}
+    @ivar attributes: The (key, translator) by attribute name.
+    @type attributes: {str: (str, callable)}
+    @ivar classes: The object classes by element name.
+    @type classes: {str: I{class}}
+    @ivar compact: Unmarshal into L{suds.sudsobject.Compact} objects.
+    @type compact: bool
+    """
+
+    def __init__(self, type, compact=False):
+        """
+        @param type: The resolved schema type.
+        @type type: L{xsd.sxbase.SchemaObject}
+        @param compact: Unmarshal into compact objects.
+        @type compact: bool
+        """
+        self.type = type
+        self.compact = compact
+        self.translate = type.resolve().translate
+        self.fields = {}
+        self.attributes = {}
+        self.classes = {}
+
+    def field(self, name):
+        """
+        Get the compiled field for a child element.
+        @param name: The element name.
+        @type name: str
+        @return: The field, else None.
+        @rtype: L{Field}
+        """
+        try:
+            return self.fields[name]
+        except KeyError:
+            child, ancestry = self.type.get_child(name)
+            if child is None:
+                field = None
+            else:
+                field = Field(child, name)
+            self.fields[name] = field
+            return field
+
+    def attribute(self, name):
+        """
+        Get the (python) key and translator for an attribute.
+        @param name: The attribute name.
+        @type name: str
+        @return: (key, translator).  The translator is None when the
+            attribute is not defined by the schema.
+        @rtype: (str, callable)
+        """
+        try:
+            return self.attributes[name]
+        except KeyError:
+            key = '_%s' % reserved.get(name, name)
+            attr, ancestry = self.type.get_attribute(name)
+            if attr is None:
+                translator = None
+            else:
+                translator = attr.resolve().resolve().translate
+            self.attributes[name] = (key, translator)
+            return (key, translator)
+
+    def object(self, name):
+        """
+        Create the (typed) suds object for an element.
+        @param name: The element name, used when the type is anonymous.
+        @type name: str
+        @return: The object.
+        @rtype: L{Object}
+        """
+        cls = self.classes.get(name)
+        if cls is None:
+            cls_name = self.type.name
+            if cls_name is None:
+                cls_name = name
+            if self.compact:
+                ordering = self.type.descriptor().ordering
+                cls = Factory.compact(
+                    cls_name, self.type, ordering, ordered=False)
+            else:
+                cls = Factory.subclass(cls_name, Object)
+            self.classes[name] = cls
+        data = cls()
+        data.__metadata__.sxtype = self.type
+        return data
+
+
+class Compiler:
+    """
+    The schema compiler.  Routines are compiled when first used
+    and kept for the life of the compiler.
+    @ivar schema: The schema.
+    @type schema: L{xsd.schema.Schema}
+    @ivar encoded: Compile for the soap (section 5) encoding.
+    @type encoded: bool
+    @ivar fields: The compiled (root) fields.
+    @type fields: {id: (L{xsd.sxbase.SchemaObject}, L{Field})}
+    @ivar routines: The compiled routines.
+    @type routines: {id: (L{xsd.sxbase.SchemaObject}, L{Routine})}
+    @ivar memo: The schema's type resolution cache.
+    @type memo: L{Memo}
+    @ivar compact: Unmarshal into L{suds.sudsobject.Compact} objects.
+    @type compact: bool
+    """
+
+    def __init__(self, unmarshaller):
+        """
+        @param unmarshaller: The (generic) unmarshaller being compiled.
+        @type unmarshaller: L{suds.umx.typed.Typed}
+        """
+        self.schema = unmarshaller.resolver.schema
+        self.encoded = isinstance(unmarshaller, Encoded)
+        self.fields = {}
+        self.routines = {}
+        self.memo = Memo.get(self.schema)
+        self.compact = unmarshaller.compact
+
+    def field(self, type, name):
+        """
+        Get the compiled (root) field for a reply type.
+        @param type: A reply type.
+        @type type: L{xsd.sxbase.SchemaObject}
+        @param name: The element name.
+        @type name: str
+        @rtype: L{Field}
+        """
+        entry = self.fields.get(id(type))
+        if entry is None or entry[0] is not type:
+            entry = (type, {})
+            self.fields[id(type)] = entry
+        field = entry[1].get(name)
+        if field is None:
+            field = Field(type, name)
+            entry[1][name] = field
+        return field
+
+    def routine(self, type):
+        """
+        Get the compiled routine for a resolved type.
+        @param type: A resolved type.
+        @type type: L{xsd.sxbase.SchemaObject}
+        @rtype: L{Routine}
+        """
+        entry = self.routines.get(id(type))
+        if entry is None or entry[0] is not type:
+            entry = (type, Routine(type, self.compact))
+            self.routines[id(type)] = entry
+        return entry[1]
+
+    def known(self, node):
+        """
+        Get the type referenced by the node's I{xsi:type}.
+        See: L{suds.resolver.NodeResolver.known()}.
+        @param node: An XML node.
+        @type node: L{sax.element.Element}
+        @return: The referenced type, else None.
+        @rtype: L{xsd.sxbase.SchemaObject}
+        """
+        ref = node.get('type', Namespace.xsins)
+        if ref is None:
+            return None
+        qref = qualify(ref, node, node.namespace())
+        return self.memo.query(qref, self.schema)
+
+
+class Compiled:
+    """
+    A schema I{compiled} unmarshaller.  The reply nodes are unmarshalled
+    by the L{Routine}s compiled for their types without a resolver and
+    without L{Content} objects.  The result is identical to the (generic)
+    unmarshaller which is used for soap encoded arrays and untyped
+    content, and to unmarshal directly from parser events.
+    @ivar umx: The (generic) unmarshaller.
+    @type umx: L{suds.umx.typed.Typed}
+    @ivar compiler: The schema compiler.
+    @type compiler: L{Compiler}
+    """
+
+    def __init__(self, umx, compiler):
+        """
+        @param umx: The (generic) unmarshaller.
+        @type umx: L{suds.umx.typed.Typed}
+        @param compiler: The schema compiler.
+        @type compiler: L{Compiler}
+        """
+        self.umx = umx
+        self.compiler = compiler
+
+    def process(self, node, type):
+        """
+        Process an object graph representation of the xml L{node}.
+        @param node: An XML tree.
+        @type node: L{sax.element.Element}
+        @param type: The I{optional} schema type.
+        @type type: L{xsd.sxbase.SchemaObject}
+        @return: A suds object.
+        @rtype: L{Object}
+        """
+        if type is None or self.array(node):
+            return self.umx.process(node, type)
+        field = self.compiler.field(type, node.name)
+        return self.append(node, field)
+
+    def append(self, node, field):
+        """
+        Unmarshal the node (as defined by the field).
+        See: L{suds.umx.core.Core.append()}.
+        @param node: An XML node.
+        @type node: L{sax.element.Element}
+        @param field: The compiled field.
+        @type field: L{Field}
+        @return: The unmarshalled value.
+        @rtype: I{any}
+        """
+        compiler = self.compiler
+        known = compiler.known(node)
+        if known is None:
+            real = field.real
+        else:
+            real = known.resolve()
+        routine = compiler.routine(real)
+        data = routine.object(node.name)
+        attributes = node.attributes
+        if attributes:
+            for attr in AttrList(attributes).real():
+                name = attr.name
+                key, translator = routine.attribute(name)
+                value = attr.value
+                if translator is None:
+                    log.warn('attribute (%s) type, not-found', name)
+                elif value is not None:
+                    value = translator(value)
+                setattr(data, key, value)
+        children = node.children
+        for child in children:
+            cfield = routine.field(child.name)
+            if cfield is None:
+                log.error(compiler.schema)
+                raise TypeNotFound(child.qname())
+            if self.array(child):
+                cval = self.umx.process(child, cfield.type)
+            else:
+                cval = self.append(child, cfield)
+            key = cfield.key
+            if key in data:
+                v = getattr(data, key)
+                if isinstance(v, list):
+                    v.append(cval)
+                else:
+                    setattr(data, key, [v, cval])
+                continue
+            if cfield.unbounded:
+                if cval is None:
+                    setattr(data, key, [])
+                else:
+                    setattr(data, key, [cval,])
+            else:
+                setattr(data, key, cval)
+        text = None
+        if node.hasText():
+            text = routine.translate(node.getText())
+        return self.postprocess(node, field, data, text)
+
+    def postprocess(self, node, field, data, text):
+        """
+        Perform final processing of the resulting data structure.
+        See: L{suds.umx.core.Core.postprocess()}.
+        @param node: An XML node.
+        @type node: L{sax.element.Element}
+        @param field: The compiled field.
+        @type field: L{Field}
+        @param data: The unmarshalled object.
+        @type data: L{Object}
+        @param text: The (translated) text.
+        @type text: I{any}
+        @return: The post-processed result.
+        @rtype: I{any}
+        """
+        if len(node.children) and node.hasText():
+            return node
+        attributes = AttrList(node.attributes)
+        if attributes.rlen() and \
+            not len(node.children) and \
+            node.hasText():
+                p = Factory.property(node.name, node.getText())
+                return merge(data, p)
+        if len(data):
+            return data
+        lang = attributes.lang()
+        if node.isnil():
+            return None
+        if not len(node.children) and text is None:
+            if field.nillable:
+                return None
+            else:
+                return Text('', lang=lang)
+        if isinstance(text, str):
+            return Text(text, lang=lang)
+        else:
+            return text
+
+    def array(self, node):
+        """
+        Get whether the node is a soap encoded array.
+        @param node: An XML node.
+        @type node: L{sax.element.Element}
+        @rtype: bool
+        """
+        if not self.compiler.encoded:
+            return False
+        ns = (None, 'http://schemas.xmlsoap.org/soap/encoding/')
+        return ( node.get('arrayType', ns) is not None )
+
+    #
+    # Unmarshalling directly from parser events (see: L{Events}) is
+    # done by the (generic) unmarshaller.
+    #
+
+    def reset(self):
+        self.umx.reset()
+
+    def begin(self, content):
+        self.umx.begin(content)
+
+    def finish(self, content):
+        return self.umx.finish(content)
+
+    def append_child(self, content, cont, cval):
+        self.umx.append_child(content, cont, cval)
@@ -58,9 +58,29 @@ class Core:
         @note: This is not the proper entry point.
         @see: L{process()}
         """
+        self.begin(content)
+        self.append_children(content)
+        return self.finish(content)
+    
+    def begin(self, content):
+        """
+        Begin processing the specified node: build the object and
+        append the attributes.
+        @param content: The current content being unmarshalled.
+        @type content: L{Content}
+        """
         self.start(content)
         self.append_attributes(content)
-        self.append_children(content)
+    
+    def finish(self, content):
+        """
+        Finish processing the specified node (after its children have
+        been appended): append the text and post-process.
+        @param content: The current content being unmarshalled.
+        @type content: L{Content}
+        @return: The post-processed result.
+        @rtype: I{any}
+        """
         self.append_text(content)
         self.end(content)
         return self.postprocess(content)
@@ -138,21 +158,34 @@ class Core:
         for child in content.node:
             cont = Content(child)
             cval = self.append(cont)
-            key = reserved.get(child.name, child.name)
-            if key in content.data:
-                v = getattr(content.data, key)
-                if isinstance(v, list):
-                    v.append(cval)
-                else:
-                    setattr(content.data, key, [v, cval])
-                continue
-            if self.unbounded(cont):
-                if cval is None:
-                    setattr(content.data, key, [])
-                else:
-                    setattr(content.data, key, [cval,])
+            self.append_child(content, cont, cval)
+    
+    def append_child(self, content, cont, cval):
+        """
+        Append an (unmarshalled) child node value into L{Content.data}
+        @param content: The current content being unmarshalled.
+        @type content: L{Content}
+        @param cont: The child content.
+        @type cont: L{Content}
+        @param cval: The child value.
+        @type cval: I{any}
+        """
+        child = cont.node
+        key = reserved.get(child.name, child.name)
+        if key in content.data:
+            v = getattr(content.data, key)
+            if isinstance(v, list):
+                v.append(cval)
             else:
-                setattr(content.data, key, cval)
+                setattr(content.data, key, [v, cval])
+            return
+        if self.unbounded(cont):
+            if cval is None:
+                setattr(content.data, key, [])
+            else:
+                setattr(content.data, key, [cval,])
+        else:
+            setattr(content.data, key, cval)
     
     def append_text(self, content):
         """
@@ -0,0 +1,118 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+"""
+Provides a sax handler that I{unmarshals} XML directly
+from the parser events.
+"""
+
+from logging import getLogger
+from suds import *
+from suds.umx import *
+from suds.sax.parser import Handler
+
+log = getLogger(__name__)
+
+
+class Events(Handler):
+    """
+    A sax handler that drives an unmarshaller from the parser events
+    instead of from a completed document.  Each content node (at the
+    specified depth) is unmarshalled as its elements are parsed: the
+    object is started when an element starts and its children are
+    appended as they end.  An element's children are discarded once
+    it has been unmarshalled so that the document is never built.
+    Only the elements above the content nodes and those not
+    unmarshalled (such as headers and faults) remain in the document.
+    @ivar umx: The unmarshaller.
+    @type umx: L{suds.umx.core.Core}
+    @ivar depth: The depth of the content nodes where the
+        document root is at depth (1).
+    @type depth: int
+    @ivar typer: A function used to get the schema type of each content
+        node as: typer(node, n) where I{n} is the number of content nodes
+        already typed.  Nodes for which (None) is returned are skipped.
+    @type typer: callable
+    @ivar contents: The stack of content being unmarshalled, parallel
+        to the stack of nodes.  (None) for skipped nodes.
+    @type contents: [L{Content},...]
+    @ivar typed: The number of content nodes typed.
+    @type typed: int
+    @ivar completed: The unmarshalled content nodes.
+    @type completed: [(L{Element}, I{value}),...]
+    """
+
+    def __init__(self, umx, depth, typer):
+        """
+        @param umx: The unmarshaller.
+        @type umx: L{suds.umx.core.Core}
+        @param depth: The depth of the content nodes.
+        @type depth: int
+        @param typer: A function used to get the schema type of
+            each content node.
+        @type typer: callable
+        """
+        Handler.__init__(self)
+        self.umx = umx
+        self.depth = depth
+        self.typer = typer
+        self.contents = [None]
+        self.typed = 0
+        self.completed = []
+
+    def start(self, name, attrs):
+        Handler.start(self, name, attrs)
+        node = self.nodes[-1]
+        parent = self.contents[-1]
+        content = None
+        if parent is not None:
+            content = Content(node)
+        elif len(self.nodes) == self.depth+1:
+            type = self.typer(node, self.typed)
+            if type is not None:
+                self.typed += 1
+                self.umx.reset()
+                content = Content(node)
+                content.type = type
+        if content is not None:
+            self.umx.begin(content)
+        self.contents.append(content)
+
+    def end(self, name):
+        node = self.nodes[-1]
+        Handler.end(self, name)
+        content = self.contents.pop()
+        if content is None:
+            return
+        value = self.umx.finish(content)
+        if value is not node:
+            node.detachChildren()
+        parent = self.contents[-1]
+        if parent is None:
+            node.detach()
+            self.completed.append((node, value))
+        else:
+            self.umx.append_child(parent, content, value)
+
+    def drain(self):
+        """
+        Get and clear the unmarshalled content nodes.
+        @return: The unmarshalled content nodes.
+        @rtype: [(L{Element}, I{value}),...]
+        """
+        completed = self.completed
+        self.completed = []
+        return completed
@@ -42,14 +42,19 @@ class Typed(Core):
     A I{typed} XML unmarshaller
     @ivar resolver: A schema type resolver.
     @type resolver: L{NodeResolver}
+    @ivar compact: Unmarshal into L{suds.sudsobject.Compact} objects.
+    @type compact: bool
     """
     
-    def __init__(self, schema):
+    def __init__(self, schema, compact=False):
         """
         @param schema: A schema object.
         @type schema: L{xsd.schema.Schema}
+        @param compact: Unmarshal into compact objects.
+        @type compact: bool
         """
         self.resolver = NodeResolver(schema)
+        self.compact = compact
         
     def process(self, node, type):
         """
@@ -88,7 +93,12 @@ class Typed(Core):
         cls_name = real.name
         if cls_name is None:
             cls_name = content.node.name
-        content.data = Factory.object(cls_name)
+        if self.compact:
+            ordering = real.descriptor().ordering
+            cls = Factory.compact(cls_name, real, ordering, ordered=False)
+            content.data = cls()
+        else:
+            content.data = Factory.object(cls_name)
         md = content.data.__metadata__
         md.sxtype = real
         
@@ -96,11 +106,12 @@ class Typed(Core):
         self.resolver.pop()
         
     def unbounded(self, content):
-        return content.type.unbounded()
+        return content.type.descriptor().unbounded
     
     def nillable(self, content):
-        resolved = content.type.resolve()
-        return ( content.type.nillable or \
+        described = content.type.descriptor()
+        resolved = described.resolved
+        return ( described.nillable or \
             (resolved.builtin() and resolved.nillable ) )
     
     def append_attribute(self, name, value, content):
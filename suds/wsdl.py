@@ -97,6 +97,11 @@ class Definitions(WObject):
     """
     Represents the I{root} container of the WSDL objects as defined
     by <wsdl:definitions/>
+    @cvar inputplan: The planned (binding) values used by the requests.
+        See: L{add_plans()}.
+    @type inputplan: (str,..)
+    @cvar outputplan: The planned (binding) values used by the replies.
+    @type outputplan: (str,..)
     @ivar id: The object id.
     @type id: str
     @ivar options: An options dictionary.
@@ -123,6 +128,10 @@ class Definitions(WObject):
     
     Tag = 'definitions'
 
+    inputplan = ('param_defs', 'headpart_types', 'bodypart_types')
+
+    outputplan = ('returned_types', 'resolved_types')
+
     def __init__(self, url, options):
         """
         @param url: A URL to the WSDL.
@@ -159,6 +168,7 @@ class Definitions(WObject):
         self.set_wrapped()
         for s in self.services:
             self.add_methods(s)
+            self.add_plans(s)
         log.debug("wsdl at '%s' loaded:\n%s", url, self)
         
     def mktns(self, root):
@@ -245,6 +255,24 @@ class Definitions(WObject):
                 m.binding.output = bindings.get(key)
                 op = ptype.operation(name)
                 p.methods[name] = m
+
+    def add_plans(self, service):
+        """
+        Build the binding plans of the service methods so that they are
+        pickled (cached) with the wsdl.  Operations that cannot be
+        resolved are skipped (and fail when invoked).
+        """
+        for p in service.ports:
+            for m in list(p.methods.values()):
+                prepared = (
+                    (m.binding.input, self.inputplan),
+                    (m.binding.output, self.outputplan))
+                try:
+                    for binding, names in prepared:
+                        if binding is not None:
+                            binding.prepare(m, names)
+                except Exception as e:
+                    log.debug('method "%s" not planned: %s', m.name, e)
                 
     def set_wrapped(self):
         """ set (wrapped|bare) flag on messages """
@@ -83,4 +83,6 @@ class Filter:
         else:
             result = ( x not in self.items )
         return result
+    def unrestricted(self):
+        return ( not self.inclusive and not len(self.items) )
 
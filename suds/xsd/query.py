@@ -97,7 +97,7 @@ class BlindQuery(Query):
     def execute(self, schema):
         if schema.builtin(self.ref):
             name = self.ref[0]
-            b = Factory.create(schema, name)
+            b = Factory.intern(schema, self.ref)
             log.debug('%s, found builtin (%s)', self.id, name)
             return b
         result = None
@@ -123,7 +123,7 @@ class TypeQuery(Query):
     def execute(self, schema):
         if schema.builtin(self.ref):
             name = self.ref[0]
-            b = Factory.create(schema, name)
+            b = Factory.intern(schema, self.ref)
             log.debug('%s, found builtin (%s)', self.id, name)
             return b
         result = schema.types.get(self.ref)
@@ -72,8 +72,10 @@ class SchemaCollection:
             self.children.append(schema)
             self.namespaces[key] = schema
         else:
-            existing.root.children += schema.root.children
-            existing.root.nsprefixes.update(schema.root.nsprefixes)
+            existing.root.children = \
+                list(existing.root.children) + list(schema.root.children)
+            for p,u in list(schema.root.nsprefixes.items()):
+                existing.root.addPrefix(p, u)
         
     def load(self, options):
         """
@@ -96,6 +98,8 @@ class SchemaCollection:
         log.debug('loaded:\n%s', self)
         merged = self.merge()
         log.debug('MERGED:\n%s', merged)
+        if merged is not None:
+            merged.describe()
         return merged
         
     def autoblend(self):
@@ -183,6 +187,12 @@ class Schema:
     @ivar form_qualified: The flag indicating:
         (@elementFormDefault).
     @type form_qualified: bool
+    @ivar memo: The type resolution cache, created when first needed.
+        Not pickled.  See: L{resolver.Memo}.
+    @type memo: L{resolver.Memo}
+    @ivar interned: The interned builtins by qref.  Not pickled.
+        See: L{sxbuiltin.Factory.intern()}.
+    @type interned: {qref: (I{class}, L{XBuiltin})}
     """
     
     Tag = 'schema'
@@ -211,6 +221,8 @@ class Schema:
         self.attributes = {}
         self.groups = {}
         self.agrps = {}
+        self.memo = None
+        self.interned = {}
         if options.doctor is not None:
             options.doctor.examine(root)
         form = self.root.get('elementFormDefault')
@@ -224,6 +236,7 @@ class Schema:
             log.debug('built:\n%s', self)
             self.dereference()
             log.debug('dereferenced:\n%s', self)
+            self.describe()
                 
     def mktns(self):
         """
@@ -327,6 +340,26 @@ class Schema:
             d = deps[midx]
             log.debug('(%s) merging %s <== %s', self.tns[1], Repr(x), Repr(d))
             x.merge(d)
+
+    def describe(self):
+        """
+        Build the (frozen) descriptors for all of the (dereferenced)
+        content, including content merged from other schemas.  Content
+        that cannot be resolved (yet) is described when first used.
+        See: L{sxbase.Descriptor}.
+        """
+        all = []
+        for child in self.children:
+            child.content(all)
+        for child in self.all:
+            child.content(all)
+        for x in all:
+            if 'descriptor' in x.cache:
+                continue
+            try:
+                x.descriptor()
+            except TypeNotFound as e:
+                log.debug('%s, not described: %s', x.id, e)
         
     def locate(self, ns):
         """
@@ -404,6 +437,19 @@ class Schema:
             result.append(c.str(indent+1))
         result.append('')
         return '\n'.join(result)
+
+    def __getstate__(self):
+        nopickle = ('memo', 'interned')
+        state = self.__dict__.copy()
+        for k in nopickle:
+            if k in state:
+                del state[k]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.memo = None
+        self.interned = {}
         
     def __repr__(self):
         myrep = '<%s tns="%s"/>' % (self.id, self.tns[1])
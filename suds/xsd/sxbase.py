@@ -24,6 +24,7 @@ from suds import *
 from suds.xsd import *
 from suds.sax.element import Element
 from suds.sax import Namespace
+from suds.sudsobject import Ordering
 
 log = getLogger(__name__)
 
@@ -46,6 +47,9 @@ class SchemaObject(object):
     @type default: object
     @ivar rawchildren: A list raw of all children.
     @type rawchildren: [L{SchemaObject},...]
+    @ivar compacts: The compact classes generated for this type.
+        Not pickled.  See: L{sudsobject.Factory.compact()}.
+    @type compacts: {(name, sparse, ordered): I{class}}
     """
 
     @classmethod
@@ -103,6 +107,7 @@ class SchemaObject(object):
         self.default = root.get('default')
         self.rawchildren = []
         self.cache = {}
+        self.compacts = {}
         
     def attributes(self, filter=Filter()):
         """
@@ -112,6 +117,9 @@ class SchemaObject(object):
         @return: A list of tuples (attr, ancestry)
         @rtype: [(L{SchemaObject}, [L{SchemaObject},..]),..]
         """
+        described = self.cache.get('descriptor')
+        if described is not None and filter.unrestricted():
+            return list(described.attributes)
         result = []
         for child, ancestry in self:
             if child.isattr() and child in filter:
@@ -126,6 +134,9 @@ class SchemaObject(object):
         @return: A list tuples: (child, ancestry)
         @rtype: [(L{SchemaObject}, [L{SchemaObject},..]),..]
         """
+        described = self.cache.get('descriptor')
+        if described is not None and filter.unrestricted():
+            return list(described.children)
         result = []
         for child, ancestry in self:
             if not child.isattr() and child in filter:
@@ -140,6 +151,9 @@ class SchemaObject(object):
         @return: A tuple: the requested (attribute, ancestry).
         @rtype: (L{SchemaObject}, [L{SchemaObject},..])
         """
+        described = self.cache.get('descriptor')
+        if described is not None:
+            return described.get_attribute(name)
         for child, ancestry in self.attributes():
             if child.name == name:
                 return (child, ancestry)
@@ -153,11 +167,29 @@ class SchemaObject(object):
         @return: A tuple: the requested (child, ancestry).
         @rtype: (L{SchemaObject}, [L{SchemaObject},..])
         """
+        described = self.cache.get('descriptor')
+        if described is not None:
+            return described.get_child(name)
         for child, ancestry in self.children():
             if child.any() or child.name == name:
                 return (child, ancestry)
         return (None, [])
 
+    def descriptor(self):
+        """
+        Get the (frozen) descriptor of this object's flattened content.
+        The descriptor is built when first requested and is only valid
+        once the schema has been dereferenced.
+        See: L{schema.Schema.describe()}.
+        @return: The descriptor.
+        @rtype: L{Descriptor}
+        """
+        result = self.cache.get('descriptor')
+        if result is None:
+            result = Descriptor(self)
+            self.cache['descriptor'] = result
+        return result
+
     def namespace(self, prefix=None):
         """
         Get this properties namespace
@@ -468,6 +500,16 @@ class SchemaObject(object):
         @rtype: [str,...]
         """
         return ()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if 'compacts' in state:
+            del state['compacts']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__['compacts'] = {}
             
     def __str__(self):
         return str(self.str())
@@ -596,10 +638,112 @@ class Iter:
         return self
 
 
+class Descriptor:
+    """
+    A frozen (precomputed) description of a dereferenced schema object.
+    The flattened content, the (python) attribute ordering, the resolved
+    type and the occurrence flags are computed once and shared by the
+    builder, the marshallers and the unmarshallers.
+    @ivar type: The described schema object.
+    @type type: L{SchemaObject}
+    @ivar resolved: The resolved type.  See: L{SchemaObject.resolve()}.
+    @type resolved: L{SchemaObject}
+    @ivar content: The flattened content.
+    @type content: ((L{SchemaObject}, (L{SchemaObject},..)),..)
+    @ivar children: The I{non-attribute} content.
+    @type children: ((L{SchemaObject}, (L{SchemaObject},..)),..)
+    @ivar attributes: The attribute content.
+    @type attributes: ((L{SchemaObject}, (L{SchemaObject},..)),..)
+    @ivar ordering: The (python) attribute names in schema order.
+        XML attribute names are prefixed by (_).
+    @type ordering: L{Ordering}
+    @ivar unbounded: The object is a collection.
+    @type unbounded: bool
+    @ivar optional: The object is optional.
+    @type optional: bool
+    @ivar nillable: The object is nillable.
+    @type nillable: bool
+    """
+
+    def __init__(self, type):
+        """
+        @param type: The schema object to describe.
+        @type type: L{SchemaObject}
+        """
+        self.type = type
+        self.resolved = type.resolve()
+        self.content = tuple([(c, tuple(a)) for c, a in Iter(type)])
+        self.children = tuple([x for x in self.content if not x[0].isattr()])
+        self.attributes = tuple([x for x in self.content if x[0].isattr()])
+        ordering = []
+        for child, ancestry in self.content:
+            if child.name is None:
+                continue
+            if child.isattr():
+                ordering.append('_%s' % child.name)
+            else:
+                ordering.append(str(child.name))
+        self.ordering = Ordering(ordering)
+        self.unbounded = type.unbounded()
+        self.optional = type.optional()
+        self.nillable = type.nillable
+        #
+        # children are matched (in order) by name or by
+        # the first <xs:any/> which matches any name.
+        #
+        self.__wildcard = None
+        self.__children = {}
+        for x in self.children:
+            if x[0].any():
+                self.__wildcard = x
+                break
+            self.__children.setdefault(x[0].name, x)
+        self.__attributes = {}
+        for x in self.attributes:
+            self.__attributes.setdefault(x[0].name, x)
+
+    def get_child(self, name):
+        """
+        Get (find) a I{non-attribute} child by name.
+        See: L{SchemaObject.get_child()}.
+        @param name: A child name.
+        @type name: str
+        @return: A tuple: the requested (child, ancestry).
+        @rtype: (L{SchemaObject}, (L{SchemaObject},..))
+        """
+        result = self.__children.get(name, self.__wildcard)
+        if result is None:
+            return (None, [])
+        return result
+
+    def get_attribute(self, name):
+        """
+        Get (find) an attribute by name.
+        See: L{SchemaObject.get_attribute()}.
+        @param name: An attribute name.
+        @type name: str
+        @return: A tuple: the requested (attribute, ancestry).
+        @rtype: (L{SchemaObject}, (L{SchemaObject},..))
+        """
+        result = self.__attributes.get(name)
+        if result is None:
+            return (None, [])
+        return result
+
+    def __len__(self):
+        return len(self.content)
+
+
 class XBuiltin(SchemaObject):
     """
-    Represents an (xsd) schema <xs:*/> node
+    Represents an (xsd) schema <xs:*/> node.
+    Builtins are interned (shared) and are immutable once frozen.
+    See: L{sxbuiltin.Factory.intern()}.
+    @ivar frozen: The object is immutable.
+    @type frozen: bool
     """
+
+    frozen = False
     
     def __init__(self, schema, name):
         """
@@ -610,6 +754,20 @@ class XBuiltin(SchemaObject):
         SchemaObject.__init__(self, schema, root)
         self.name = name
         self.nillable = True
+
+    def freeze(self):
+        """
+        Make this object immutable so that it may be shared.
+        @return: self
+        @rtype: L{XBuiltin}
+        """
+        object.__setattr__(self, 'frozen', True)
+        return self
+
+    def __setattr__(self, name, value):
+        if self.frozen:
+            raise AttributeError('builtin (%s) is immutable' % self.name)
+        object.__setattr__(self, name, value)
             
     def namespace(self, prefix=None):
         return Namespace.xsdns
@@ -28,6 +28,53 @@ import datetime as dt
 
 
 log = getLogger(__name__)
+
+
+class Lexicon:
+    """
+    A bounded cache of python values by (XML) lexical value used by
+    the builtin translators.  The cache is cleared when full and when
+    the I{local} timezone changes.
+    @ivar parser: The lexical value parser.
+    @type parser: callable
+    @ivar limit: The maximum number of cached values.
+    @type limit: int
+    @ivar values: The cached values.
+    @type values: {str: I{any}}
+    """
+
+    def __init__(self, parser, limit=1024):
+        """
+        @param parser: The lexical value parser.
+        @type parser: callable
+        @param limit: The maximum number of cached values.
+        @type limit: int
+        """
+        self.parser = parser
+        self.limit = limit
+        self.values = {}
+        self.local = Timezone.LOCAL
+
+    def __call__(self, s):
+        """
+        Get the python value for a lexical value.
+        @param s: A lexical value.
+        @type s: str
+        @return: The parsed value.
+        @rtype: I{any}
+        """
+        if self.local != Timezone.LOCAL:
+            self.values = {}
+            self.local = Timezone.LOCAL
+        try:
+            return self.values[s]
+        except KeyError:
+            pass
+        result = self.parser(s)
+        if len(self.values) >= self.limit:
+            self.values = {}
+        self.values[s] = result
+        return result
     
     
 class XString(XBuiltin):
@@ -47,7 +94,13 @@ class XAny(XBuiltin):
         self.nillable = False
     
     def get_child(self, name):
-        child = XAny(self.schema, name)
+        key = ('child', name)
+        child = self.cache.get(key)
+        if child is None:
+            child = XAny(self.schema, name)
+            if self.frozen:
+                child.freeze()
+            self.cache[key] = child
         return (child, [])
     
     def any(self):
@@ -84,7 +137,7 @@ class XInteger(XBuiltin):
         
     def translate(self, value, topython=True):
         if topython:
-            if isinstance(value, str) and len(value):
+            if isinstance(value, str) and value:
                 return int(value)
             else:
                 return None
@@ -101,7 +154,7 @@ class XLong(XBuiltin):
         
     def translate(self, value, topython=True):
         if topython:
-            if isinstance(value, str) and len(value):
+            if isinstance(value, str) and value:
                 return int(value)
             else:
                 return None
@@ -119,7 +172,7 @@ class XFloat(XBuiltin):
         
     def translate(self, value, topython=True):
         if topython:
-            if isinstance(value, str) and len(value):
+            if isinstance(value, str) and value:
                 return float(value)
             else:
                 return None
@@ -134,11 +187,13 @@ class XDate(XBuiltin):
     """
     Represents an (xsd) xs:date builtin type.
     """
+
+    lexicon = Lexicon(Date.parse)
         
     def translate(self, value, topython=True):
         if topython:
-            if isinstance(value, str) and len(value):
-                return Date(value).date
+            if isinstance(value, str) and value:
+                return XDate.lexicon(value)
             else:
                 return None
         else:
@@ -152,11 +207,13 @@ class XTime(XBuiltin):
     """
     Represents an (xsd) xs:time builtin type.
     """
+
+    lexicon = Lexicon(Time.parse)
         
     def translate(self, value, topython=True):
         if topython:
-            if isinstance(value, str) and len(value):
-                return Time(value).time
+            if isinstance(value, str) and value:
+                return XTime.lexicon(value)
             else:
                 return None
         else:
@@ -171,10 +228,12 @@ class XDateTime(XBuiltin):
     Represents an (xsd) xs:datetime builtin type.
     """
 
+    lexicon = Lexicon(DateTime.parse)
+
     def translate(self, value, topython=True):
         if topython:
-            if isinstance(value, str) and len(value):
-                return DateTime(value).datetime
+            if isinstance(value, str) and value:
+                return XDateTime.lexicon(value)
             else:
                 return None
         else:
@@ -185,6 +244,11 @@ class XDateTime(XBuiltin):
             
             
 class Factory:
+    """
+    The builtin factory.
+    @cvar tags: The class (or function) by xsd tag name.
+    @type tags: {str: I{class}}
+    """
 
     tags =\
     {
@@ -272,3 +336,29 @@ class Factory:
             return fn(schema, name)
         else:
             return XBuiltin(schema, name)
+
+    @classmethod
+    def intern(cls, schema, ref):
+        """
+        Get the (shared) builtin object for a reference.  The object is
+        created (and frozen) once per (schema, ref) and is re-created only
+        when the tag has been mapped to another class.  The objects are
+        kept in the schema's I{interned} table.
+        See: L{maptag()}.
+        @param schema: A schema object.
+        @type schema: L{schema.Schema}
+        @param ref: The qualified reference.
+        @type ref: qref
+        @return: The interned object.
+        @rtype: L{XBuiltin}
+        """
+        table = schema.interned
+        fn = cls.tags.get(ref[0])
+        entry = table.get(ref)
+        if entry is None or entry[0] is not fn:
+            b = cls.create(schema, ref[0])
+            if isinstance(b, XBuiltin):
+                b.freeze()
+            entry = (fn, b)
+            table[ref] = entry
+        return entry[1]
@@ -14,12 +14,33 @@
 # Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
 # written by: Jeff Ortel ( jortel@redhat.com )
 
+import os
 import sys
 import logging
+import tempfile
 
 def setup_logging():
     if sys.version_info < (2, 5):
         fmt = '%(asctime)s [%(levelname)s] @%(filename)s:%(lineno)d\n%(message)s\n'
     else:
         fmt = '%(asctime)s [%(levelname)s] %(funcName)s() @%(filename)s:%(lineno)d\n%(message)s\n'
-    logging.basicConfig(level=logging.INFO, format=fmt)
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO, format=fmt)
+
+def wsdl_client(wsdl, **kwargs):
+    """
+    Create an (uncached) client for the wsdl text.  The wsdl is written
+    to a temporary file that is removed once it has been read.
+    @param wsdl: The wsdl text.
+    @type wsdl: str
+    @param kwargs: The client options.
+    @return: The client.
+    @rtype: L{suds.client.Client}
+    """
+    from suds.client import Client
+    fd, path = tempfile.mkstemp(suffix='.wsdl')
+    os.write(fd, wsdl.encode('utf-8'))
+    os.close(fd)
+    try:
+        return Client('file://%s' % path, cache=None, **kwargs)
+    finally:
+        os.unlink(path)
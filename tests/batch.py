@@ -0,0 +1,218 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import re
+import copy
+import time
+import threading
+import unittest
+from suds.properties import Endpoint, Unskin
+from suds.transport import TransportError, Reply
+from suds.transport.http_transport import HttpTransport
+from suds.transport.options import Options
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+wsdl = '''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:tns="urn:batch" targetNamespace="urn:batch">
+ <types>
+  <xs:schema targetNamespace="urn:batch" elementFormDefault="qualified">
+   <xs:element name="echo">
+    <xs:complexType><xs:sequence>
+     <xs:element name="n" type="xs:int"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+   <xs:element name="echoResponse">
+    <xs:complexType><xs:sequence>
+     <xs:element name="n" type="xs:int"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+  </xs:schema>
+ </types>
+ <message name="echoIn"><part name="parameters" element="tns:echo"/></message>
+ <message name="echoOut"><part name="parameters" element="tns:echoResponse"/></message>
+ <portType name="Batch">
+  <operation name="echo">
+   <input message="tns:echoIn"/><output message="tns:echoOut"/>
+  </operation>
+ </portType>
+ <binding name="BatchBinding" type="tns:Batch">
+  <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="echo">
+   <soap:operation soapAction="echo"/>
+   <input><soap:body use="literal"/></input>
+   <output><soap:body use="literal"/></output>
+  </operation>
+ </binding>
+ <service name="BatchService">
+  <port name="Batch" binding="tns:BatchBinding">
+   <soap:address location="http://localhost:7080/batch"/>
+  </port>
+ </service>
+</definitions>
+'''
+
+reply = '''<?xml version="1.0" encoding="UTF-8"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+<env:Body><echoResponse xmlns="urn:batch"><n>%d</n></echoResponse>
+</env:Body></env:Envelope>'''
+
+
+class Calls:
+    """
+    The calls in flight, shared by the (copied) transports.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.threads = set()
+
+
+class Echo(HttpTransport):
+    """
+    Replies with the number sent, later for smaller numbers so that
+    the calls complete out of order.  Negative numbers fail.
+    """
+
+    def __init__(self, calls=None):
+        HttpTransport.__init__(self)
+        self.calls = calls
+
+    def send(self, request):
+        calls = self.calls
+        with calls.lock:
+            calls.active += 1
+            calls.peak = max(calls.peak, calls.active)
+            calls.threads.add(threading.current_thread())
+        try:
+            n = int(re.search(rb'<ns\d:n>(-?\d+)<', request.message).group(1))
+            time.sleep(0.002 * (4 - n % 4))
+            if n < 0:
+                raise TransportError('not found', 404)
+            return Reply(200, {}, (reply % n).encode('utf-8'))
+        finally:
+            with calls.lock:
+                calls.active -= 1
+
+    def __deepcopy__(self, memo={}):
+        clone = HttpTransport.__deepcopy__(self, memo)
+        clone.calls = self.calls
+        return clone
+
+
+class BatchTest(TestCase):
+
+    def setUp(self):
+        self.calls = Calls()
+        self.client = wsdl_client(wsdl, transport=Echo(self.calls))
+
+    def testMap(self):
+        numbers = list(range(20))
+        with self.client.batch(max_workers=4) as batch:
+            results = list(batch.map('echo', numbers))
+        self.assertEqual([r for r in results], numbers)
+        self.assertTrue(len(self.calls.threads) > 1)
+
+    def testMethodMap(self):
+        numbers = list(range(20))
+        method = self.client.service.echo
+        results = list(method.map([(n,) for n in numbers], max_workers=4))
+        self.assertEqual(results, numbers)
+
+    def testSubmit(self):
+        with self.client.batch(max_workers=2) as batch:
+            futures = [batch.submit(self.client.service.echo, n)
+                for n in range(6)]
+            self.assertEqual([f.result() for f in futures], list(range(6)))
+
+    def testExceptions(self):
+        numbers = [1, -2, 3, -4, 5]
+        with self.client.batch(max_workers=2) as batch:
+            results = list(batch.map('echo', numbers, return_exceptions=True))
+        self.assertEqual([results[n] for n in (0, 2, 4)], [1, 3, 5])
+        for n in (1, 3):
+            self.assertTrue(isinstance(results[n], Exception), results[n])
+        with self.client.batch(max_workers=2) as batch:
+            results = batch.map('echo', numbers)
+            self.assertEqual(next(results), 1)
+            self.assertRaises(Exception, next, results)
+
+    def testPending(self):
+        consumed = []
+        def numbers():
+            for n in range(16):
+                consumed.append(n)
+                yield n
+        with self.client.batch(max_workers=8, maxpending=2) as batch:
+            results = batch.map('echo', numbers())
+            self.assertEqual(next(results), 0)
+            self.assertTrue(len(consumed) <= 3, consumed)
+            self.assertEqual(list(results), list(range(1, 16)))
+        self.assertTrue(self.calls.peak <= 2, self.calls.peak)
+
+    def testWorkers(self):
+        with self.client.batch(max_workers=2) as batch:
+            list(batch.map('echo', range(8)))
+            clients = set()
+            for future in [batch.executor.submit(batch.worker)
+                    for n in range(8)]:
+                clients.add(future.result())
+        self.assertTrue(len(clients) <= 2)
+        for client in clients:
+            self.assertFalse(client is self.client)
+            self.assertTrue(client.wsdl is self.client.wsdl)
+
+
+class CloneTest(TestCase):
+    """
+    The transport options are linked to the client options and the
+    link endpoints must survive (deep) copying.
+    """
+
+    def testClone(self):
+        client = wsdl_client(wsdl, transport=Echo(Calls()))
+        clone = client.clone()
+        self.assertFalse(clone.options is client.options)
+        self.assertFalse(clone.options.transport is client.options.transport)
+        clone.set_options(timeout=5, location='http://localhost:1/x')
+        self.assertEqual(clone.options.transport.options.timeout, 5)
+        self.assertNotEqual(client.options.timeout, 5)
+        self.assertNotEqual(client.options.location, clone.options.location)
+        self.assertEqual(clone.service.echo(3), 3)
+
+    def testEndpoint(self):
+        properties = Unskin(Options())
+        endpoint = Endpoint(None, properties)
+        copied = copy.deepcopy(endpoint)
+        self.assertFalse(copied.target is properties)
+        self.assertEqual(copied.get('timeout'), properties.get('timeout'))
+        self.assertEqual(sorted(copied.keys()), sorted(properties.keys()))
+        uninitialized = Endpoint.__new__(Endpoint)
+        self.assertRaises(AttributeError, getattr, uninitialized, 'target')
+        self.assertRaises(AttributeError, getattr, uninitialized, 'timeout')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,6 +18,7 @@ import sys
 sys.path.append('../')
 import unittest
 from suds.sax.date import Timezone as Tz
+from suds.sax import date
 from suds.xsd.sxbuiltin import *
 from unittest import TestCase
 from tests import *
@@ -544,6 +545,62 @@ class DateTimeTest(TestCase):
             % (Y, M, D, h, m, s, offset)
         return s
 
+
+
+class ParseTest(TestCase):
+
+    dates = (
+        '1941-12-07',
+        '1941-12-07Z',
+        '1941-12-07-06:00',
+        '1941-12-7',)
+
+    times = (
+        '10:30:22',
+        '10:30:22Z',
+        '10:30:22.5',
+        '10:30:22.123456789',
+        '10:30:22.123+05:30',
+        '10:30:22-06:00',
+        '10:30:22 -06:00',)
+
+    datetimes = (
+        '1941-12-07T10:30:22',
+        '1941-12-07T10:30:22z',
+        '1941-12-07T10:30:22.5Z',
+        '1941-12-07T23:30:22.123456789-06:00',
+        '1941-12-07T10:30:22+03:00',
+        '0001-01-01T00:00:00+06:00',)
+
+    def testDate(self):
+        for s in self.dates:
+            self.assertEqual(date.Date.parse(s), date.Date(s).date)
+
+    def testTime(self):
+        for tz in (-6, 0, 3):
+            Timezone.LOCAL = tz
+            for s in self.times:
+                self.assertEqual(date.Time.parse(s), date.Time(s).time)
+
+    def testDateTime(self):
+        for tz in (-6, 0, 3):
+            Timezone.LOCAL = tz
+            for s in self.datetimes:
+                self.assertEqual(
+                    date.DateTime.parse(s), date.DateTime(s).datetime)
+
+    def testInvalid(self):
+        for s in ('1941-12-07T10:30', '1941-13-07T10:30:22', '1941-12-07T10:30:22.'):
+            self.assertRaises(ValueError, date.DateTime.parse, s)
+
+    def testLexiconTimezone(self):
+        xdt = XDateTime.__new__(XDateTime)
+        s = '1941-12-07T10:30:22-06:00'
+        Timezone.LOCAL = -6
+        self.assertEqual(xdt.translate(s).hour, 10)
+        Timezone.LOCAL = 0
+        self.assertEqual(xdt.translate(s).hour, 16)
+
         
 if __name__ == '__main__':
     unittest.main()
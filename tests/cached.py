@@ -0,0 +1,156 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import os
+import shutil
+import tempfile
+import unittest
+from suds.cache import ObjectCache
+from suds.client import Client
+from suds.xsd import query
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+wsdl = '''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:tns="urn:cached" targetNamespace="urn:cached">
+ <types>
+  <xs:schema targetNamespace="urn:cached" elementFormDefault="qualified">
+   <xs:complexType name="Item">
+    <xs:sequence>
+     <xs:element name="name" type="xs:string"/>
+     <xs:element name="count" type="xs:int" minOccurs="0"/>
+    </xs:sequence>
+   </xs:complexType>
+   <xs:element name="token" type="xs:string"/>
+   <xs:element name="put">
+    <xs:complexType><xs:sequence>
+     <xs:element name="item" type="tns:Item" maxOccurs="unbounded"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+   <xs:element name="putResponse">
+    <xs:complexType><xs:sequence>
+     <xs:element name="n" type="xs:int"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+  </xs:schema>
+ </types>
+ <message name="putIn"><part name="parameters" element="tns:put"/></message>
+ <message name="putOut"><part name="parameters" element="tns:putResponse"/></message>
+ <message name="header"><part name="token" element="tns:token"/></message>
+ <portType name="Cached">
+  <operation name="put">
+   <input message="tns:putIn"/><output message="tns:putOut"/>
+  </operation>
+ </portType>
+ <binding name="CachedBinding" type="tns:Cached">
+  <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="put">
+   <soap:operation soapAction="put"/>
+   <input>
+    <soap:body use="literal"/>
+    <soap:header message="tns:header" part="token" use="literal"/>
+   </input>
+   <output><soap:body use="literal"/></output>
+  </operation>
+ </binding>
+ <service name="CachedService">
+  <port name="Cached" binding="tns:CachedBinding">
+   <soap:address location="http://localhost:7080/cached"/>
+  </port>
+ </service>
+</definitions>
+'''
+
+reply = b'''<?xml version="1.0" encoding="UTF-8"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+<env:Body><putResponse xmlns="urn:cached"><n>3</n></putResponse></env:Body>
+</env:Envelope>'''
+
+
+class CachedTest(TestCase):
+    """
+    The operation plans are built when the wsdl is loaded so that the
+    (pickled) wsdl in the object cache holds them.
+    """
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = ObjectCache(os.path.join(self.dir, 'cache'))
+        path = os.path.join(self.dir, 'cached.wsdl')
+        fp = open(path, 'w')
+        try:
+            fp.write(wsdl)
+        finally:
+            fp.close()
+        self.url = 'file://%s' % path
+        self.queries = 0
+        self.executes = {}
+        for q in (query.ElementQuery, query.TypeQuery):
+            self.executes[q] = q.__dict__['execute']
+            q.execute = self.counted(self.executes[q])
+
+    def tearDown(self):
+        for q, execute in list(self.executes.items()):
+            q.execute = execute
+        shutil.rmtree(self.dir)
+
+    def counted(self, execute):
+        def fn(query, schema):
+            self.queries += 1
+            return execute(query, schema)
+        return fn
+
+    def client(self):
+        return Client(self.url, cache=self.cache, cachingpolicy=1)
+
+    def invoke(self, client):
+        client.set_options(soapheaders=('T',))
+        item = client.factory.create('Item')
+        item.name = 'a'
+        result = client.service.put([item], __inject={'reply':reply})
+        return (str(client.last_sent()), result)
+
+    def testPlanned(self):
+        live = self.client()
+        method = live.service.put.method
+        entries = method.binding.input.plan(method).entries
+        self.assertEqual(
+            sorted(entries),
+            ['bodypart_types', 'headpart_types', 'param_defs',
+             'resolved_types', 'returned_types'])
+
+    def testInvokeCached(self):
+        live = self.client()
+        expected = self.invoke(live)
+        os.unlink(self.url[7:])
+        cached = self.client()
+        self.assertFalse(cached.wsdl is live.wsdl)
+        method = cached.service.put.method
+        self.assertEqual(len(method.binding.input.plans), 1)
+        self.queries = 0
+        self.assertEqual(self.invoke(cached), expected)
+        self.assertEqual(self.queries, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import gc
+import pickle
+import unittest
+import weakref
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+wsdl = '''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:tns="urn:collect" targetNamespace="urn:collect">
+ <types>
+  <xs:schema targetNamespace="urn:collect" elementFormDefault="qualified">
+   <xs:complexType name="Item">
+    <xs:sequence>
+     <xs:element name="name" type="xs:string"/>
+     <xs:element name="count" type="xs:int" minOccurs="0"/>
+    </xs:sequence>
+    <xs:attribute name="id" type="xs:string"/>
+   </xs:complexType>
+   <xs:element name="get">
+    <xs:complexType><xs:sequence>
+     <xs:element name="item" type="tns:Item"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+   <xs:element name="getResponse">
+    <xs:complexType><xs:sequence>
+     <xs:element name="item" type="tns:Item" maxOccurs="unbounded"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+  </xs:schema>
+ </types>
+ <message name="getIn"><part name="parameters" element="tns:get"/></message>
+ <message name="getOut"><part name="parameters" element="tns:getResponse"/></message>
+ <portType name="Collect">
+  <operation name="get">
+   <input message="tns:getIn"/><output message="tns:getOut"/>
+  </operation>
+ </portType>
+ <binding name="CollectBinding" type="tns:Collect">
+  <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="get">
+   <soap:operation soapAction="get"/>
+   <input><soap:body use="literal"/></input>
+   <output><soap:body use="literal"/></output>
+  </operation>
+ </binding>
+ <service name="CollectService">
+  <port name="Collect" binding="tns:CollectBinding">
+   <soap:address location="http://localhost:7080/collect"/>
+  </port>
+ </service>
+</definitions>
+'''
+
+reply = b'''<?xml version="1.0" encoding="UTF-8"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+<env:Body><getResponse xmlns="urn:collect">
+<item id="1"><name>a</name><count>3</count></item>
+<item id="2"><name>b</name></item>
+</getResponse></env:Body></env:Envelope>'''
+
+
+class CollectTest(TestCase):
+    """
+    The caches kept for a schema must not keep it (and the client)
+    alive once the client is discarded.
+    """
+
+    def discarded(self, **kwargs):
+        client = wsdl_client(wsdl, **kwargs)
+        item = client.factory.create('Item')
+        item.name = 'a'
+        client.service.get(item, __inject={'reply':reply})
+        schema = client.wsdl.schema
+        self.used(schema)
+        ref = weakref.ref(schema)
+        del client, item, schema
+        gc.collect()
+        return ref
+
+    def used(self, schema):
+        pass
+
+    def testCollected(self):
+        ref = self.discarded()
+        self.assertTrue(ref() is None, 'schema not collected')
+
+
+class MemoTest(CollectTest):
+
+    def used(self, schema):
+        self.assertTrue(schema.memo is not None)
+        self.assertTrue(schema.memo.hits + schema.memo.misses > 0)
+
+    def testPickled(self):
+        client = wsdl_client(wsdl)
+        client.service.get({'name':'a'}, __inject={'reply':reply})
+        schema = client.wsdl.schema
+        self.assertTrue(schema.memo is not None)
+        loaded = pickle.loads(pickle.dumps(schema))
+        self.assertTrue(loaded.memo is None)
+
+
+
+class CompactTest(CollectTest):
+
+    def discarded(self, **kwargs):
+        return CollectTest.discarded(self, compact=True, **kwargs)
+
+    def used(self, schema):
+        item = schema.types[('Item', 'urn:collect')]
+        self.assertTrue(len(item.compacts) > 0)
+
+    def testCompiledCollected(self):
+        ref = self.discarded(compiled=True)
+        self.assertTrue(ref() is None, 'schema not collected')
+
+    def testPickled(self):
+        client = wsdl_client(wsdl, compact=True)
+        client.service.get({'name':'a'}, __inject={'reply':reply})
+        item = client.wsdl.schema.types[('Item', 'urn:collect')]
+        self.assertTrue(len(item.compacts) > 0)
+        loaded = pickle.loads(pickle.dumps(item))
+        self.assertEqual(loaded.compacts, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
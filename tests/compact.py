@@ -0,0 +1,140 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import unittest
+from suds.sudsobject import Compact
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+wsdl = '''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:tns="urn:compact" targetNamespace="urn:compact">
+ <types>
+  <xs:schema targetNamespace="urn:compact" elementFormDefault="qualified">
+   <xs:complexType name="Item">
+    <xs:sequence>
+     <xs:element name="name" type="xs:string"/>
+     <xs:element name="count" type="xs:int" minOccurs="0"/>
+    </xs:sequence>
+    <xs:attribute name="id" type="xs:string"/>
+    <xs:attribute name="kind" type="xs:string"/>
+   </xs:complexType>
+   <xs:element name="get">
+    <xs:complexType><xs:sequence>
+     <xs:element name="count" type="xs:int"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+   <xs:element name="getResponse">
+    <xs:complexType><xs:sequence>
+     <xs:element name="item" type="tns:Item" maxOccurs="unbounded"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+  </xs:schema>
+ </types>
+ <message name="getIn"><part name="parameters" element="tns:get"/></message>
+ <message name="getOut"><part name="parameters" element="tns:getResponse"/></message>
+ <portType name="Compact">
+  <operation name="get">
+   <input message="tns:getIn"/><output message="tns:getOut"/>
+  </operation>
+ </portType>
+ <binding name="CompactBinding" type="tns:Compact">
+  <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="get">
+   <soap:operation soapAction="get"/>
+   <input><soap:body use="literal"/></input>
+   <output><soap:body use="literal"/></output>
+  </operation>
+ </binding>
+ <service name="CompactService">
+  <port name="Compact" binding="tns:CompactBinding">
+   <soap:address location="http://localhost:7080/compact"/>
+  </port>
+ </service>
+</definitions>
+'''
+
+reply = b'''<?xml version="1.0" encoding="UTF-8"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+<env:Body><getResponse xmlns="urn:compact">
+<item kind="k" id="1"><count>3</count><name>a</name></item>
+<item id="2"><name>b</name></item>
+</getResponse></env:Body></env:Envelope>'''
+
+
+class CompactTest(TestCase):
+
+    def replies(self, compiled):
+        result = []
+        for compact in (False, True):
+            client = wsdl_client(wsdl, compiled=compiled, compact=compact)
+            items = client.service.get(1, __inject={'reply':reply})
+            result.append((client, items))
+        return result
+
+    def equalsDefault(self, compiled):
+        (client, items), (cclient, citems) = self.replies(compiled)
+        for item, citem in zip(items, citems):
+            self.assertTrue(isinstance(citem, Compact))
+            self.assertEqual(str(item), str(citem))
+            self.assertEqual(
+                list(dict(item).items()), list(dict(citem).items()))
+            for k in dict(citem):
+                self.assertTrue(type(k) is str)
+        return (client, items), (cclient, citems)
+
+    def testReply(self):
+        self.equalsDefault(False)
+
+    def testCompiledReply(self):
+        self.equalsDefault(True)
+
+    def testMarshalled(self):
+        (client, items), (cclient, citems) = self.equalsDefault(False)
+        method = cclient.service.get.method
+        binding = method.binding.input
+        binding.get_message(method, [citems[0]], {})
+        self.assertEqual(list(dict(citems[0])), ['name', 'count', '_id', '_kind'])
+        self.assertEqual(list(dict(citems[1])), ['_id', 'name'])
+
+    def testKeys(self):
+        (client, items), (cclient, citems) = self.equalsDefault(False)
+        for item, citem in zip(items, citems):
+            self.assertEqual(citem.__keylist__, item.__keylist__)
+            self.assertEqual(len(citem), len(item))
+            self.assertEqual(citem[0], item[0])
+            for o in (item, citem):
+                del o.name
+                self.assertFalse('name' in o)
+                o.name = 'x'
+            self.assertEqual(citem.__keylist__, item.__keylist__)
+            self.assertEqual(str(citem), str(item))
+        a = cclient.factory.create('Item')
+        b = cclient.factory.create('Item')
+        self.assertTrue(a.__keys__ is b.__keys__)
+        a.name = 'a'
+        b.name = 'b'
+        self.assertTrue(a.__keys__ is b.__keys__)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,260 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import datetime
+import unittest
+from suds import null
+from suds.sax.text import Text, Raw
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+wsdl = '''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:soapenc="http://schemas.xmlsoap.org/soap/encoding/"
+  xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:tns="urn:r" xmlns:o="urn:other" targetNamespace="urn:r">
+ <types>
+  <xs:schema targetNamespace="urn:other" elementFormDefault="unqualified">
+   <xs:complexType name="Addr"><xs:sequence>
+     <xs:element name="street" type="xs:string"/><xs:element name="zip" type="xs:int" minOccurs="0"/>
+   </xs:sequence><xs:attribute name="kind" type="xs:string"/></xs:complexType>
+  </xs:schema>
+  <xs:schema targetNamespace="urn:r" elementFormDefault="qualified">
+   <xs:import namespace="urn:other"/>
+   <xs:import namespace="http://schemas.xmlsoap.org/soap/encoding/"/>
+   <xs:simpleType name="Color"><xs:restriction base="xs:string"><xs:enumeration value="red"/><xs:enumeration value="blue"/></xs:restriction></xs:simpleType>
+   <xs:complexType name="Base"><xs:sequence>
+     <xs:element name="id" type="xs:int"/>
+     <xs:element name="label" type="xs:string" nillable="true"/>
+   </xs:sequence><xs:attribute name="ver" type="xs:string"/></xs:complexType>
+   <xs:complexType name="Derived"><xs:complexContent><xs:extension base="tns:Base"><xs:sequence>
+     <xs:element name="extra" type="xs:string" minOccurs="0"/>
+   </xs:sequence></xs:extension></xs:complexContent></xs:complexType>
+   <xs:complexType name="Item"><xs:sequence>
+     <xs:element name="when" type="xs:dateTime" minOccurs="0"/>
+     <xs:element name="day" type="xs:date" minOccurs="0"/>
+     <xs:element name="flag" type="xs:boolean" minOccurs="0"/>
+     <xs:element name="price" type="xs:float" minOccurs="0"/>
+     <xs:element name="color" type="tns:Color" minOccurs="0"/>
+     <xs:element name="dflt" type="xs:string" default="zz" minOccurs="0"/>
+     <xs:element name="nil" type="xs:string" nillable="true"/>
+     <xs:element name="base" type="tns:Base" minOccurs="0" maxOccurs="unbounded"/>
+     <xs:element name="addr" type="o:Addr" minOccurs="0"/>
+     <xs:choice minOccurs="0"><xs:element name="a" type="xs:string"/><xs:element name="b" type="xs:int"/></xs:choice>
+     <xs:element name="anything" type="xs:anyType" minOccurs="0"/>
+   </xs:sequence><xs:attribute name="code" type="xs:string"/></xs:complexType>
+   <xs:complexType name="ArrayOfInt"><xs:complexContent><xs:restriction base="soapenc:Array">
+     <xs:attribute ref="soapenc:arrayType" wsdl:arrayType="xs:int[]"/></xs:restriction></xs:complexContent></xs:complexType>
+   <xs:complexType name="Holder"><xs:sequence>
+     <xs:element name="nums" type="tns:ArrayOfInt" minOccurs="0"/>
+     <xs:element name="item" type="tns:Item" minOccurs="0"/>
+   </xs:sequence></xs:complexType>
+   <xs:element name="put"><xs:complexType><xs:sequence>
+     <xs:element name="item" type="tns:Item" maxOccurs="unbounded"/>
+     <xs:element name="tag" type="xs:string" minOccurs="0" maxOccurs="unbounded"/>
+   </xs:sequence></xs:complexType></xs:element>
+   <xs:element name="putResponse"><xs:complexType><xs:sequence><xs:element name="n" type="xs:int"/></xs:sequence></xs:complexType></xs:element>
+   <xs:element name="auth" type="xs:string"/>
+  </xs:schema>
+ </types>
+ <message name="putIn"><part name="parameters" element="tns:put"/></message>
+ <message name="putOut"><part name="parameters" element="tns:putResponse"/></message>
+ <message name="encIn"><part name="holder" type="tns:Holder"/><part name="nums" type="tns:ArrayOfInt"/><part name="item" type="tns:Item"/></message>
+ <message name="getOut"><part name="parameters" element="tns:put"/></message>
+ <message name="fetchOut"><part name="holder" type="tns:Holder"/><part name="nums" type="tns:ArrayOfInt"/></message>
+ <message name="hdr"><part name="auth" element="tns:auth"/></message>
+ <portType name="P">
+  <operation name="put"><input message="tns:putIn"/><output message="tns:putOut"/></operation>
+  <operation name="enc"><input message="tns:encIn"/><output message="tns:putOut"/></operation>
+  <operation name="get"><input message="tns:putIn"/><output message="tns:getOut"/></operation>
+  <operation name="fetch"><input message="tns:encIn"/><output message="tns:fetchOut"/></operation>
+ </portType>
+ <binding name="DocB" type="tns:P">
+  <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="put"><soap:operation soapAction="put"/><input><soap:body use="literal"/><soap:header message="tns:hdr" part="auth" use="literal"/></input><output><soap:body use="literal"/></output></operation>
+  <operation name="enc"><soap:operation soapAction="enc"/><input><soap:body use="literal"/></input><output><soap:body use="literal"/></output></operation>
+  <operation name="get"><soap:operation soapAction="get"/><input><soap:body use="literal"/></input><output><soap:body use="literal"/></output></operation>
+  <operation name="fetch"><soap:operation soapAction="fetch"/><input><soap:body use="literal"/></input><output><soap:body use="literal"/></output></operation>
+ </binding>
+ <binding name="EncB" type="tns:P">
+  <soap:binding style="rpc" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="put"><soap:operation soapAction="put"/><input><soap:body use="literal" namespace="urn:r"/></input><output><soap:body use="literal" namespace="urn:r"/></output></operation>
+  <operation name="enc"><soap:operation soapAction="enc"/><input><soap:body use="encoded" encodingStyle="http://schemas.xmlsoap.org/soap/encoding/" namespace="urn:r"/></input><output><soap:body use="encoded" encodingStyle="http://schemas.xmlsoap.org/soap/encoding/" namespace="urn:r"/></output></operation>
+  <operation name="get"><soap:operation soapAction="get"/><input><soap:body use="literal" namespace="urn:r"/></input><output><soap:body use="literal" namespace="urn:r"/></output></operation>
+  <operation name="fetch"><soap:operation soapAction="fetch"/><input><soap:body use="encoded" encodingStyle="http://schemas.xmlsoap.org/soap/encoding/" namespace="urn:r"/></input><output><soap:body use="encoded" encodingStyle="http://schemas.xmlsoap.org/soap/encoding/" namespace="urn:r"/></output></operation>
+ </binding>
+ <service name="S">
+  <port name="Doc" binding="tns:DocB"><soap:address location="http://localhost:1/doc"/></port>
+  <port name="Enc" binding="tns:EncB"><soap:address location="http://localhost:1/enc"/></port>
+ </service>
+</definitions>
+'''
+
+literal = b'''<?xml version="1.0" encoding="UTF-8"?>
+<e:Envelope xmlns:e="http://schemas.xmlsoap.org/soap/envelope/"
+  xmlns:r="urn:r" xmlns:o="urn:other"
+  xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema">
+<e:Body><r:put>
+<r:item code="C1"><r:when>2020-01-02T03:04:05Z</r:when><r:flag>true</r:flag>
+<r:price>1.5</r:price><r:color>red</r:color><r:dflt/><r:nil xsi:nil="true"/>
+<r:base ver="1"><r:id>1</r:id><r:label xsi:nil="true"/></r:base>
+<r:base xsi:type="r:Derived" ver="2"><r:id>2</r:id><r:label>x</r:label>
+<r:extra>e</r:extra></r:base>
+<r:addr kind="k"><street>s</street><zip>3</zip></r:addr><r:a>aa</r:a>
+<r:anything xsi:type="xs:int">5</r:anything></r:item>
+<r:item><r:nil></r:nil><r:base><r:id>9</r:id><r:label/></r:base></r:item>
+<r:tag>a</r:tag><r:tag>b</r:tag>
+</r:put></e:Body></e:Envelope>'''
+
+encoded = b'''<?xml version="1.0" encoding="UTF-8"?>
+<e:Envelope xmlns:e="http://schemas.xmlsoap.org/soap/envelope/"
+  xmlns:se="http://schemas.xmlsoap.org/soap/encoding/" xmlns:r="urn:r"
+  xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema">
+<e:Body>
+<r:fetchResponse><holder href="#id1"/>
+<nums xsi:type="se:Array" se:arrayType="xs:int[3]"><i>1</i><i>2</i>
+<i xsi:nil="true"/></nums></r:fetchResponse>
+<multiRef id="id1" xsi:type="r:Holder">
+<r:nums se:arrayType="xs:int[1]"><i>7</i></r:nums>
+<r:item code="X"><r:flag>false</r:flag><r:nil xsi:nil="true"/>
+<r:base xsi:type="r:Derived"><r:id>2</r:id><r:label/><r:extra>e</r:extra>
+</r:base></r:item></multiRef>
+</e:Body></e:Envelope>'''
+
+
+class MarshalTest(TestCase):
+    """
+    The compiled marshallers must produce the same envelopes as
+    the generic (literal and encoded) marshallers.
+    """
+
+    def cases(self, client):
+        f = client.factory
+        d = f.create('Derived')
+        d.id = 7
+        d.label = 'L'
+        d.extra = 'E'
+        d._ver = '2'
+        b = f.create('Base')
+        b.id = 1
+        b.label = None
+        it = f.create('Item')
+        it.when = datetime.datetime(2020, 1, 2, 3, 4, 5)
+        it.day = datetime.date(2020, 1, 2)
+        it.flag = True
+        it.price = 1.5
+        it.color = 'red'
+        it.base = [b, d]
+        it.addr = {'street':'S<&>', 'zip':5, '_kind':'home'}
+        it.a = 'x'
+        it._code = 'C'
+        it.nil = None
+        it2 = {'nil':null(), 'flag':False, 'base':[], 'addr':None,
+            'b':3, 'anything':'any', '_code':''}
+        it3 = {'nil':Text('t&'), 'when':None, 'base':{'id':3, 'label':'q'}}
+        return [
+            ('put', ([it, it2, it3], ['t1', 't2']), {}),
+            ('put', (it2,), {}),
+            ('put', (), {'item':[it3], 'tag':Raw('<x/>')}),
+            ('put', ([f.create('Item')],), {}),
+            ('enc', ({'nums':[1, 2], 'item':it}, [3, 4, 5], it3), {}),
+            ('enc', ({'item':it2}, None, it), {}),
+            ('enc', (None, [], {'addr':{'street':'q'}}), {}),
+        ]
+
+    def envelopes(self, port, compiled, **options):
+        client = wsdl_client(
+            wsdl, port=port, nosend=True, compiled=compiled, **options)
+        client.set_options(soapheaders={'auth':'tok'})
+        result = []
+        for name, args, kwargs in self.cases(client):
+            try:
+                ctx = getattr(client.service, name)(*args, **kwargs)
+                result.append(ctx.envelope)
+            except Exception as e:
+                result.append(repr(e))
+        return result
+
+    def assertSame(self, port, **options):
+        generic = self.envelopes(port, False, **options)
+        compiled = self.envelopes(port, True, **options)
+        self.assertEqual(len(generic), len(compiled))
+        for g, c in zip(generic, compiled):
+            self.assertEqual(g, c)
+        return generic
+
+    def testLiteral(self):
+        envelopes = self.assertSame('Doc')
+        self.assertTrue(b'xsi:type="ns1:Derived"' in envelopes[0])
+
+    def testEncoded(self):
+        envelopes = self.assertSame('Enc')
+        self.assertTrue(b'xsi:type="ns2:Derived"' in envelopes[4])
+
+    def testOptions(self):
+        for port in ('Doc', 'Enc'):
+            self.assertSame(port, xstq=False)
+            self.assertSame(port, prefixes=False)
+            self.assertSame(port, prettyxml=True)
+
+
+
+class UnmarshalTest(TestCase):
+    """
+    The compiled unmarshallers must return the same objects as
+    the generic (typed and encoded) unmarshallers.
+    """
+
+    def replies(self, port, name, reply, **options):
+        result = []
+        for compiled in (False, True):
+            client = wsdl_client(
+                wsdl, port=port, compiled=compiled, **options)
+            method = getattr(client.service, name)
+            result.append(str(method([], __inject={'reply':reply})))
+        return result
+
+    def testLiteral(self):
+        generic, compiled = self.replies('Doc', 'get', literal)
+        self.assertEqual(generic, compiled)
+        self.assertTrue('(Derived){' in compiled)
+        self.assertTrue('_code = "C1"' in compiled)
+
+    def testEncoded(self):
+        generic, compiled = self.replies('Enc', 'fetch', encoded)
+        self.assertEqual(generic, compiled)
+        self.assertTrue('(Holder){' in compiled)
+        self.assertTrue('(Derived){' in compiled)
+
+    def testOptions(self):
+        for port, name, reply in (
+                ('Doc', 'get', literal), ('Enc', 'fetch', encoded)):
+            for options in ({'compact':True}, {'keepreply':False}):
+                generic, compiled = \
+                    self.replies(port, name, reply, **options)
+                self.assertEqual(generic, compiled)
+
+
+if __name__ == '__main__':
+    unittest.main()
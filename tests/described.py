@@ -0,0 +1,224 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import unittest
+from suds.xsd.sxbase import Iter
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+wsdl = '''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:tns="urn:described" targetNamespace="urn:described">
+ <types>
+  <xs:schema targetNamespace="urn:described" elementFormDefault="qualified">
+   <xs:attributeGroup name="Stamped">
+    <xs:attribute name="at" type="xs:dateTime"/>
+    <xs:attribute name="by" type="xs:string"/>
+   </xs:attributeGroup>
+   <xs:group name="Named">
+    <xs:sequence>
+     <xs:element name="name" type="xs:string"/>
+     <xs:element name="alias" type="xs:string" minOccurs="0"/>
+    </xs:sequence>
+   </xs:group>
+   <xs:complexType name="Base">
+    <xs:sequence>
+     <xs:element name="id" type="xs:int"/>
+     <xs:group ref="tns:Named"/>
+    </xs:sequence>
+    <xs:attribute name="ver" type="xs:string"/>
+   </xs:complexType>
+   <xs:complexType name="Open">
+    <xs:complexContent>
+     <xs:extension base="tns:Base">
+      <xs:sequence>
+       <xs:element name="before" type="xs:string"/>
+       <xs:choice>
+        <xs:element name="a" type="xs:string"/>
+        <xs:element name="b" type="xs:int"/>
+       </xs:choice>
+       <xs:any namespace="##other" processContents="lax"
+         minOccurs="0" maxOccurs="unbounded"/>
+       <xs:element name="after" type="xs:string"/>
+       <xs:element name="id" type="xs:string"/>
+      </xs:sequence>
+      <xs:attributeGroup ref="tns:Stamped"/>
+      <xs:attribute name="ver" type="xs:int"/>
+     </xs:extension>
+    </xs:complexContent>
+   </xs:complexType>
+   <xs:complexType name="Twice">
+    <xs:sequence>
+     <xs:element name="x" type="xs:string"/>
+     <xs:element ref="tns:item"/>
+     <xs:element name="x" type="xs:int"/>
+     <xs:any minOccurs="0"/>
+     <xs:any minOccurs="0"/>
+    </xs:sequence>
+   </xs:complexType>
+   <xs:element name="item" type="tns:Base"/>
+   <xs:element name="put">
+    <xs:complexType><xs:sequence>
+     <xs:element name="open" type="tns:Open" maxOccurs="unbounded"/>
+     <xs:element name="twice" type="tns:Twice" minOccurs="0"/>
+     <xs:element name="after" type="xs:string" nillable="true"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+  </xs:schema>
+ </types>
+ <message name="putIn"><part name="parameters" element="tns:put"/></message>
+ <portType name="Described">
+  <operation name="put"><input message="tns:putIn"/></operation>
+ </portType>
+ <binding name="DescribedBinding" type="tns:Described">
+  <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="put">
+   <soap:operation soapAction="put"/>
+   <input><soap:body use="literal"/></input>
+  </operation>
+ </binding>
+ <service name="DescribedService">
+  <port name="Described" binding="tns:DescribedBinding">
+   <soap:address location="http://localhost:7080/described"/>
+  </port>
+ </service>
+</definitions>
+'''
+
+unknown = ('unknown', 'before', 'after', 'id', 'ver', 'at', 'x', None)
+
+
+def walked(x):
+    """
+    The (uncached) content of I{x} by walking the raw children.
+    """
+    return [(c, list(a)) for c, a in Iter(x)]
+
+
+def get_child(x, name):
+    for child, ancestry in walked(x):
+        if child.isattr():
+            continue
+        if child.any() or child.name == name:
+            return (child, ancestry)
+    return (None, [])
+
+
+def get_attribute(x, name):
+    for child, ancestry in walked(x):
+        if child.isattr() and child.name == name:
+            return (child, ancestry)
+    return (None, [])
+
+
+class DescriptorTest(TestCase):
+    """
+    The (cached) lookups of the frozen descriptors must match
+    the uncached L{Iter} walk of the schema content.
+    """
+
+    def setUp(self):
+        self.client = wsdl_client(wsdl, nosend=True)
+        schema = self.client.wsdl.schema
+        self.described = []
+        for child in schema.children:
+            for x in child.content():
+                if 'descriptor' in x.cache:
+                    self.described.append(x)
+
+    def type(self, name):
+        return self.client.wsdl.schema.types[(name, 'urn:described')]
+
+    def names(self, x):
+        names = set(unknown)
+        for child, ancestry in walked(x):
+            names.add(child.name)
+        return names
+
+    def assertLookup(self, x, name, found, expected):
+        self.assertTrue(found[0] is expected[0], '%s: %s' % (x.id, name))
+        self.assertEqual(list(found[1]), expected[1])
+
+    def testDescribed(self):
+        for name in ('Base', 'Open', 'Twice'):
+            self.assertTrue(self.type(name) in self.described, name)
+        self.assertTrue(len(self.described) > 10)
+
+    def testContent(self):
+        for x in self.described:
+            walk = walked(x)
+            children = [c for c in walk if not c[0].isattr()]
+            attributes = [c for c in walk if c[0].isattr()]
+            self.assertEqual(
+                [(c, list(a)) for c, a in x.children()], children)
+            self.assertEqual(
+                [(c, list(a)) for c, a in x.attributes()], attributes)
+            self.assertEqual(len(x.descriptor()), len(walk))
+
+    def testGetChild(self):
+        for x in self.described:
+            if x.any():
+                continue
+            for name in self.names(x):
+                self.assertLookup(
+                    x, name, x.get_child(name), get_child(x, name))
+
+    def testGetAttribute(self):
+        for x in self.described:
+            if x.any():
+                continue
+            for name in self.names(x):
+                self.assertLookup(
+                    x, name, x.get_attribute(name), get_attribute(x, name))
+
+    def testAny(self):
+        open = self.type('Open')
+        for name in ('after', 'unknown'):
+            child, ancestry = open.get_child(name)
+            self.assertTrue(child.any(), name)
+            self.assertTrue(child.get_child(name)[0].any())
+        self.assertEqual(open.get_child('before')[0].name, 'before')
+        self.assertEqual(open.get_child('id')[0].type, ('int',
+            'http://www.w3.org/2001/XMLSchema'))
+        self.assertEqual(open.get_attribute('ver')[0].type, ('string',
+            'http://www.w3.org/2001/XMLSchema'))
+        self.assertEqual(open.get_attribute('by')[0].name, 'by')
+        self.assertEqual(open.get_attribute('after'), (None, []))
+        twice = self.type('Twice')
+        self.assertEqual(twice.get_child('x')[0].type[0], 'string')
+        self.assertEqual(twice.get_child('item')[0].name, 'item')
+
+    def testOrdering(self):
+        for x in self.described:
+            ordering = []
+            for child, ancestry in walked(x):
+                if child.name is None:
+                    continue
+                if child.isattr():
+                    ordering.append('_%s' % child.name)
+                else:
+                    ordering.append(child.name)
+            self.assertEqual(list(x.descriptor().ordering), ordering)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import datetime
+import unittest
+from suds.sax.document import Document
+from suds.sax.element import Element
+from unittest import TestCase
+from tests import *
+from tests.compiled import wsdl
+
+setup_logging()
+
+
+def canonical(node):
+    """
+    Get a prefix independent view of the tree: prefixed names and
+    (qualified) attribute values are replaced by their namespaces.
+    The prefixes assigned by the template (plan) and by the normalizer
+    differ only in numbering.
+    """
+    def qualified(prefix, name, node):
+        if prefix is None:
+            return name
+        return (node.resolvePrefix(prefix)[1], name)
+    attributes = []
+    for a in node.attributes:
+        value = a.getValue()
+        if ':' in value:
+            prefix, name = value.split(':', 1)
+            ns = node.resolvePrefix(prefix, None)
+            if ns is not None:
+                value = (ns[1], name)
+        attributes.append((qualified(a.prefix, a.name, node), value))
+    attributes.sort(key=repr)
+    return (
+        (node.namespace()[1], node.name),
+        attributes,
+        node.getText(),
+        [canonical(c) for c in node.children])
+
+
+class EnvelopeTest(TestCase):
+    """
+    The envelopes built from the compiled (request) templates must be
+    the same (but for the numbering of the generated prefixes) as those
+    built without templates for the same arguments and soap headers.
+    Recompiled templates (see: Binding.templates) must give identical
+    envelopes.
+    """
+
+    def cases(self, client):
+        f = client.factory
+        d = f.create('Derived')
+        d.id = 7
+        d.label = 'L'
+        d.extra = 'E'
+        b = f.create('Base')
+        b.id = 1
+        it = f.create('Item')
+        it.when = datetime.datetime(2020, 1, 2, 3, 4, 5)
+        it.base = [b, d]
+        it.addr = {'street':'S', 'zip':5, '_kind':'home'}
+        it._code = 'C'
+        it2 = {'flag':False, 'b':3, 'anything':'any'}
+        return [
+            ('put', ([it, it2], ['t1', 't2']), {}),
+            ('put', (), {'item':[it2]}),
+            ('put', ([],), {}),
+            ('enc', ({'nums':[1, 2], 'item':it}, [3, 4, 5], it2), {}),
+            ('enc', (None, [], {'addr':{'street':'q'}}), {}),
+            ('enc', ({'item':it}, None, {'addr':{'street':'q'}}), {}),
+            ('get', ([it2], 'x'), {}),
+        ]
+
+    def headers(self):
+        auth = Element('auth', ns=('h', 'urn:h'))
+        auth.setText('raw')
+        return [
+            (),
+            {'auth':'tok'},
+            ('tok',),
+            (auth,),
+        ]
+
+    def untemplated(self, client, name, args, kwargs):
+        """
+        Build the envelope as L{Binding.get_message()} did
+        before the templates.
+        """
+        method = getattr(client.service, name).method
+        binding = method.binding.input
+        header = binding.header(binding.headercontent(method))
+        body = binding.body(binding.bodycontent(method, args, kwargs))
+        env = binding.envelope(header, body)
+        if binding.options().prefixes:
+            body.normalizePrefixes()
+            env.promotePrefixes()
+        else:
+            env.refitPrefixes()
+        return Document(env)
+
+    def templated(self, client, name, args, kwargs, clear=False):
+        method = getattr(client.service, name).method
+        binding = method.binding.input
+        if clear:
+            binding.templates.clear()
+        return binding.get_message(method, args, kwargs)
+
+    def built(self, fn, *args):
+        try:
+            return fn(*args)
+        except Exception as e:
+            return repr(e)
+
+    def assertSame(self, port, **options):
+        client = wsdl_client(wsdl, port=port, nosend=True, **options)
+        for headers in self.headers():
+            client.set_options(soapheaders=headers)
+            for name, args, kwargs in self.cases(client):
+                untemplated = self.built(
+                    self.untemplated, client, name, args, kwargs)
+                compiled = [
+                    self.built(self.templated, client, name, args, kwargs, clear)
+                    for clear in (True, False, False)]
+                if isinstance(untemplated, str):
+                    self.assertEqual(compiled, [untemplated]*3)
+                    continue
+                expected = str(compiled[0])
+                for document in compiled:
+                    self.assertEqual(str(document), expected)
+                    self.assertEqual(
+                        canonical(document.root()),
+                        canonical(untemplated.root()))
+                ctx = getattr(client.service, name)(*args, **kwargs)
+                self.assertEqual(ctx.envelope.decode('utf-8'),
+                    compiled[0].plain())
+
+    def testLiteral(self):
+        self.assertSame('Doc')
+
+    def testRpc(self):
+        self.assertSame('Enc')
+
+    def testNoPrefixes(self):
+        self.assertSame('Doc', prefixes=False)
+        self.assertSame('Enc', prefixes=False)
+
+    def testCompact(self):
+        self.assertSame('Doc', compact=True)
+
+    def testHeader(self):
+        client = wsdl_client(wsdl, port='Doc', nosend=True)
+        client.set_options(soapheaders={'auth':'tok'})
+        document = self.templated(client, 'put', ([],), {})
+        header = document.root().getChild('Header')
+        self.assertEqual(header.getChild('auth').getText(), 'tok')
+        client.set_options(soapheaders=())
+        document = self.templated(client, 'put', ([],), {})
+        self.assertEqual(len(document.root().getChild('Header')), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import unittest
+from suds import WebFault
+from unittest import TestCase
+from tests import *
+from tests.compiled import wsdl, literal, encoded
+
+setup_logging()
+
+headed = b'''<?xml version="1.0" encoding="UTF-8"?>
+<e:Envelope xmlns:e="http://schemas.xmlsoap.org/soap/envelope/" xmlns:r="urn:r">
+<e:Header><r:auth>token</r:auth></e:Header>
+<e:Body><r:putResponse><r:n>3</r:n></r:putResponse></e:Body></e:Envelope>'''
+
+empty = b'''<?xml version="1.0" encoding="UTF-8"?>
+<e:Envelope xmlns:e="http://schemas.xmlsoap.org/soap/envelope/" xmlns:r="urn:r">
+<e:Body><r:put/></e:Body></e:Envelope>'''
+
+fault = b'''<?xml version="1.0" encoding="UTF-8"?>
+<e:Envelope xmlns:e="http://schemas.xmlsoap.org/soap/envelope/">
+<e:Body><e:Fault>
+<faultcode>e:Server</faultcode><faultstring>failed</faultstring>
+<detail><reason>why</reason></detail>
+</e:Fault></e:Body></e:Envelope>'''
+
+
+class EventsTest(TestCase):
+    """
+    Replies unmarshalled from the parser events (keepreply=False) must
+    give the same objects as those unmarshalled from the document.
+    """
+
+    def results(self, port, name, reply, **options):
+        result = []
+        for keepreply in (True, False):
+            client = wsdl_client(
+                wsdl, port=port, keepreply=keepreply, **options)
+            method = getattr(client.service, name)
+            try:
+                result.append(str(method([], __inject={'reply':reply})))
+            except WebFault as e:
+                result.append(str(e.fault))
+            except Exception as e:
+                result.append('%s: %s' % (e.__class__.__name__, e))
+        return result
+
+    def assertSame(self, port, name, reply, **options):
+        for more in ({}, {'compiled':True}, {'compact':True},
+                {'faults':False}):
+            more.update(options)
+            kept, events = self.results(port, name, reply, **more)
+            self.assertEqual(kept, events)
+
+    def testLiteral(self):
+        self.assertSame('Doc', 'get', literal)
+        self.assertSame('Doc', 'get', empty)
+        self.assertSame('Doc', 'put', headed)
+
+    def testEncoded(self):
+        self.assertSame('Enc', 'fetch', encoded)
+
+    def testFault(self):
+        self.assertSame('Doc', 'get', fault)
+        self.assertSame('Enc', 'fetch', fault)
+        self.assertSame('Enc', 'get', fault)
+        self.assertSame('Doc', 'put', fault)
+
+    def testResult(self):
+        kept, events = self.results('Doc', 'get', literal)
+        self.assertTrue('(Derived){' in events)
+        self.assertTrue('tag[] = ' in events, events)
+
+    def testDocument(self):
+        client = wsdl_client(wsdl, port='Doc', keepreply=False)
+        result = client.service.get([], __inject={'reply':literal})
+        self.assertEqual(len(result.item), 2)
+        body = client.last_received().childAtPath('Envelope/Body/put')
+        self.assertEqual(body.children, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
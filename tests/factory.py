@@ -0,0 +1,173 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import unittest
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+wsdl = '''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:tns="urn:factory" targetNamespace="urn:factory">
+ <types>
+  <xs:schema targetNamespace="urn:factory" elementFormDefault="qualified">
+   <xs:simpleType name="Color">
+    <xs:restriction base="xs:string">
+     <xs:enumeration value="red"/>
+     <xs:enumeration value="blue"/>
+    </xs:restriction>
+   </xs:simpleType>
+   <xs:complexType name="Addr">
+    <xs:sequence>
+     <xs:element name="street" type="xs:string"/>
+     <xs:element name="lines" type="xs:string" maxOccurs="unbounded"/>
+    </xs:sequence>
+    <xs:attribute name="kind" type="xs:string"/>
+   </xs:complexType>
+   <xs:complexType name="Item">
+    <xs:sequence>
+     <xs:element name="name" type="xs:string"/>
+     <xs:element name="color" type="tns:Color"/>
+     <xs:element name="addr" type="tns:Addr"/>
+     <xs:element name="tags" type="xs:string" maxOccurs="unbounded"/>
+     %s
+    </xs:sequence>
+   </xs:complexType>
+   <xs:element name="put">
+    <xs:complexType><xs:sequence>
+     <xs:element name="item" type="tns:Item"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+  </xs:schema>
+ </types>
+ <message name="putIn"><part name="parameters" element="tns:put"/></message>
+ <portType name="Factory">
+  <operation name="put"><input message="tns:putIn"/></operation>
+ </portType>
+ <binding name="FactoryBinding" type="tns:Factory">
+  <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="put">
+   <soap:operation soapAction="put"/>
+   <input><soap:body use="literal"/></input>
+  </operation>
+ </binding>
+ <service name="FactoryService">
+  <port name="Factory" binding="tns:FactoryBinding">
+   <soap:address location="http://localhost:7080/factory"/>
+  </port>
+ </service>
+</definitions>
+'''
+
+
+class FactoryTest(TestCase):
+    """
+    The factory returns copies of a cached prototype; the objects it
+    returns must not share any state that can be changed.
+    """
+
+    options = {}
+
+    def client(self, extra=''):
+        return wsdl_client(wsdl % extra, **self.options)
+
+    def testMutated(self):
+        factory = self.client().factory
+        expected = factory.create('Item')
+        item = factory.create('Item')
+        item.name = 'a'
+        item.tags.append('t')
+        item.addr.street = 's'
+        item.addr.lines.append('l')
+        item.addr._kind = 'k'
+        item.extra = 1
+        item.addr.extra = 2
+        created = factory.create('Item')
+        self.assertEqual(str(created), str(expected))
+        self.assertEqual(created.tags, [])
+        self.assertEqual(created.addr.lines, [])
+        self.assertFalse(created.addr is item.addr)
+        self.assertFalse(created.tags is item.tags)
+        self.assertFalse(hasattr(created, 'extra'))
+        self.assertFalse(hasattr(created.addr, 'extra'))
+        self.assertEqual(created.addr._kind, expected.addr._kind)
+
+    def testMetadata(self):
+        factory = self.client().factory
+        item = factory.create('Item')
+        item.__metadata__.extra = 1
+        created = factory.create('Item')
+        self.assertFalse(hasattr(created.__metadata__, 'extra'))
+        self.assertTrue(
+            created.__metadata__.sxtype is item.__metadata__.sxtype)
+
+    def testEnum(self):
+        factory = self.client().factory
+        color = factory.create('Color')
+        self.assertEqual((color.red, color.blue), ('red', 'blue'))
+        color.red = 'x'
+        color.green = 'green'
+        created = factory.create('Color')
+        self.assertFalse(created is color)
+        self.assertEqual(created.red, 'red')
+        self.assertFalse(hasattr(created, 'green'))
+
+    def testSeparator(self):
+        factory = self.client().factory
+        expected = str(factory.create('Item'))
+        self.assertTrue(factory.prototypes)
+        factory.separator('/')
+        self.assertEqual(factory.prototypes, {})
+        self.assertEqual(str(factory.create('Item')), expected)
+        self.assertEqual(str(factory.create('Item/addr')),
+            str(factory.create('Addr')))
+
+    def testWsdl(self):
+        factory = self.client().factory
+        item = factory.create('Item')
+        self.assertFalse('count' in item)
+        other = self.client('<xs:element name="count" type="xs:int"/>')
+        factory.wsdl = other.wsdl
+        item = factory.create('Item')
+        self.assertTrue('count' in item)
+        self.assertTrue(factory.resolver.wsdl is other.wsdl)
+        self.assertEqual(str(item), str(other.factory.create('Item')))
+
+
+class CompactTest(FactoryTest):
+
+    options = {'compact':True}
+
+    def testMetadata(self):
+        factory = self.client().factory
+        item = factory.create('Item')
+        created = factory.create('Item')
+        self.assertTrue(item.__metadata__ is item.__class__.__metadata__)
+        self.assertTrue(created.__metadata__ is item.__metadata__)
+
+
+class SparseTest(CompactTest):
+
+    options = {'compact':True, 'sparse':True}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import unittest
+from suds.sax.attribute import Attribute
+from suds.sax import splitPrefix
+from suds.sax.element import Element, Index
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+names = ('a', 'b', 'c', 'a', 'd', 'e', 'b', 'f', 'g', 'a', 'h', 'i')
+
+
+class IndexTest(TestCase):
+    """
+    Child and attribute lookups on elements with more children (or
+    attributes) than L{Index.threshold} must match a linear scan after
+    the children (or attributes) have been changed.
+    """
+
+    def setUp(self):
+        self.assertTrue(len(names) > Index.threshold)
+        self.root = Element('root')
+        self.root.addPrefix('x', 'urn:x')
+        for n, name in enumerate(names):
+            child = Element(name)
+            child.setText(str(n))
+            self.root.append(child)
+        self.root.append(
+            [Attribute('a%d' % n, str(n)) for n in range(len(names))])
+        self.lookup()
+
+    def lookup(self):
+        for name in set(names) | set(['x:a', 'z']):
+            self.root.getChild(name)
+            self.root.getChildren(name)
+            self.root.get(name)
+
+    def assertIndexed(self):
+        children = self.root.children
+        for name in set([c.name for c in children]) | set(['x:a', 'z']):
+            prefix, n = splitPrefix(name)
+            ns = None
+            if prefix is not None:
+                ns = self.root.resolvePrefix(prefix)
+            matched = [c for c in children if c.match(n, ns)]
+            first = (matched or [None])[0]
+            self.assertTrue(self.root.getChild(name) is first, name)
+            self.assertEqual(
+                [id(c) for c in self.root.getChildren(name)],
+                [id(c) for c in matched], name)
+        for a in self.root.attributes:
+            self.assertTrue(self.root.getAttribute(a.name) is a, a.name)
+            self.assertEqual(self.root.get(a.name), a.value)
+        self.assertTrue(self.root.getAttribute('zz') is None)
+
+    def testIndexed(self):
+        self.assertEqual(len(self.root.getChildren('a')), 3)
+        self.assertEqual(self.root.getChild('b').getText(), '1')
+        self.assertTrue(self.root.getChild('x:a') is None)
+        self.assertIndexed()
+
+    def testAppendDirect(self):
+        child = Element('a')
+        self.root.children.append(child)
+        child.parent = self.root
+        self.assertTrue(self.root.getChildren('a')[-1] is child)
+        self.assertIndexed()
+        child = Element('j')
+        self.root.children.insert(0, child)
+        self.assertTrue(self.root.getChild('j') is child)
+        self.assertIndexed()
+
+    def testAppend(self):
+        child = Element('z')
+        self.root.append(child)
+        self.assertTrue(self.root.getChild('z') is child)
+        self.root.insert(Element('a'), 0)
+        self.assertEqual(self.root.getChild('a').getText(), None)
+        self.root.append(Attribute('z', 'Z'))
+        self.assertEqual(self.root.get('z'), 'Z')
+        self.assertIndexed()
+
+    def testRemove(self):
+        first = self.root.getChild('a')
+        self.root.remove(first)
+        self.assertEqual(self.root.getChild('a').getText(), '3')
+        self.assertIndexed()
+        self.lookup()
+        self.root.children.remove(self.root.getChild('a'))
+        self.assertEqual(self.root.getChild('a').getText(), '9')
+        self.assertIndexed()
+        a0 = self.root.getAttribute('a0')
+        self.root.remove(a0)
+        self.assertTrue(self.root.getAttribute('a0') is None)
+        self.assertIndexed()
+
+    def testReplaceChild(self):
+        first = self.root.getChild('a')
+        self.root.replaceChild(first, Element('y'))
+        self.assertEqual(len(self.root), len(names))
+        self.assertEqual(self.root.getChild('a').getText(), '3')
+        self.assertTrue(self.root.getChild('y') is not None)
+        self.assertIndexed()
+        self.lookup()
+        b = self.root.getChild('b')
+        self.root.replaceChild(b, [Element('b'), Element('b')])
+        self.assertEqual(len(self.root.getChildren('b')), 3)
+        self.assertIndexed()
+
+    def testDetach(self):
+        self.root.getChild('b').detach()
+        self.assertEqual(self.root.getChild('b').getText(), '6')
+        self.assertIndexed()
+        self.lookup()
+        for c in self.root.getChildren('a'):
+            c.detach()
+        self.assertTrue(self.root.getChild('a') is None)
+        self.assertIndexed()
+        self.root.detachChildren()
+        self.assertTrue(self.root.getChild('b') is None)
+
+    def testRename(self):
+        self.root.getChild('b').rename('y')
+        self.assertEqual(self.root.getChild('b').getText(), '6')
+        self.assertEqual(self.root.getChild('y').getText(), '1')
+        self.assertIndexed()
+        self.root.unset('a1')
+        self.assertTrue(self.root.getAttribute('a1') is None)
+        self.assertIndexed()
+
+    def testNamespace(self):
+        child = Element('a', ns=('x', 'urn:x'))
+        self.root.append(child)
+        self.assertTrue(self.root.getChild('x:a') is child)
+        self.assertEqual(self.root.getChildren('a', ('x', 'urn:x')), [child])
+        self.assertEqual(len(self.root.getChildren('a')), 4)
+        self.assertIndexed()
+
+
+if __name__ == '__main__':
+    unittest.main()
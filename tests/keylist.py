@@ -0,0 +1,183 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import copy
+import unittest
+from suds.sudsobject import Factory, Keylist, asdict
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+wsdl = '''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:tns="urn:keylist" targetNamespace="urn:keylist">
+ <types>
+  <xs:schema targetNamespace="urn:keylist" elementFormDefault="qualified">
+   <xs:complexType name="Addr">
+    <xs:sequence>
+     <xs:element name="street" type="xs:string"/>
+     <xs:element name="zip" type="xs:int" minOccurs="0"/>
+    </xs:sequence>
+   </xs:complexType>
+   <xs:complexType name="Person">
+    <xs:sequence>
+     <xs:element name="name" type="xs:string"/>
+     <xs:element name="age" type="xs:int"/>
+     <xs:element name="phone" type="xs:string" maxOccurs="unbounded"/>
+     <xs:element name="addr" type="tns:Addr"/>
+    </xs:sequence>
+    <xs:attribute name="id" type="xs:string"/>
+   </xs:complexType>
+  </xs:schema>
+ </types>
+ <portType name="Keylist"/>
+ <binding name="KeylistBinding" type="tns:Keylist">
+  <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+ </binding>
+ <service name="KeylistService">
+  <port name="Keylist" binding="tns:KeylistBinding">
+   <soap:address location="http://localhost:7080/keylist"/>
+  </port>
+ </service>
+</definitions>
+'''
+
+#
+# The output of the (list backed) objects before the Keylist.
+#
+
+printed = '''(Person){
+   name = "n"
+   phone[] = 
+      "1",
+      "2",
+   addr = 
+      (Addr){
+         street = "s"
+         zip = None
+      }
+   _id = "x"
+   age = 4
+ }'''
+
+names = ['name', 'phone', 'addr', '_id', 'age']
+
+
+class KeylistTest(TestCase):
+    """
+    The (dict backed) L{Keylist} must be usable as the list of
+    attribute names it replaces.
+    """
+
+    def person(self):
+        person = Factory.object('Person')
+        person.name = 'n'
+        person.age = 3
+        person.phone = ['1', '2']
+        person.addr = Factory.object('Addr', dict(street='s', zip=None))
+        person._id = 'x'
+        return person
+
+    def testList(self):
+        person = self.person()
+        keylist = person.__keylist__
+        self.assertEqual(keylist, ['name', 'age', 'phone', 'addr', '_id'])
+        self.assertEqual(keylist, ('name', 'age', 'phone', 'addr', '_id'))
+        self.assertNotEqual(keylist, ['name', 'phone', 'age', 'addr', '_id'])
+        self.assertNotEqual(keylist, set(keylist))
+        self.assertEqual(list(keylist), ['name', 'age', 'phone', 'addr', '_id'])
+        self.assertEqual(repr(keylist), repr(list(keylist)))
+        self.assertEqual(keylist[0], 'name')
+        self.assertEqual(keylist[-1], '_id')
+        self.assertEqual(keylist[1:3], ['age', 'phone'])
+        self.assertEqual(keylist.index('addr'), 3)
+        self.assertEqual(len(keylist), 5)
+        self.assertTrue('age' in keylist)
+        self.assertFalse('zip' in keylist)
+        self.assertRaises(ValueError, keylist.remove, 'zip')
+        copied = keylist.copy()
+        self.assertTrue(isinstance(copied, Keylist))
+        copied.remove('age')
+        self.assertEqual(len(keylist), 5)
+        self.assertEqual(copied, ['name', 'phone', 'addr', '_id'])
+
+    def testIndexed(self):
+        person = self.person()
+        self.assertEqual(person[0], 'n')
+        self.assertEqual(person[2], ['1', '2'])
+        self.assertEqual(person[-1], 'x')
+        self.assertEqual(person['age'], 3)
+        self.assertEqual(len(person), 5)
+
+    def testDelete(self):
+        person = self.person()
+        del person.age
+        self.assertEqual(person.__keylist__, ['name', 'phone', 'addr', '_id'])
+        self.assertFalse('age' in person.__keylist__)
+        self.assertFalse(hasattr(person, 'age'))
+        person.age = 4
+        self.assertEqual(person.__keylist__, names)
+        person.name = 'm'
+        self.assertEqual(person.__keylist__, names)
+        self.assertRaises(AttributeError, delattr, person, 'missing')
+        self.assertEqual(person.__keylist__, names)
+
+    def testPrinted(self):
+        person = self.person()
+        del person.age
+        person.age = 4
+        self.assertEqual(str(person), printed)
+        self.assertEqual(list(dict(person).keys()), names)
+        self.assertEqual(list(asdict(person).keys()), names)
+        self.assertEqual([k for k, v in person], names)
+        self.assertEqual(dict(person)['phone'], ['1', '2'])
+
+    def testCopied(self):
+        person = self.person()
+        copied = copy.deepcopy(person)
+        self.assertEqual(copied.__keylist__, person.__keylist__)
+        self.assertEqual(str(copied), str(person))
+        del copied.name
+        copied.name = 'm'
+        self.assertEqual(copied.__keylist__[-1], 'name')
+        self.assertEqual(person.__keylist__[0], 'name')
+
+    def testFactory(self):
+        for options in ({}, {'compact':True}, {'compact':True, 'sparse':True}):
+            client = wsdl_client(wsdl, **options)
+            person = client.factory.create('Person')
+            keylist = person.__keylist__
+            self.assertEqual(
+                keylist, ['_id', 'name', 'age', 'phone', 'addr'], options)
+            self.assertEqual(person[1], person.name)
+            self.assertEqual(person[0], person._id)
+            del person.name
+            person.name = 'n'
+            self.assertEqual(person.__keylist__[-1], 'name')
+            self.assertEqual(
+                person.__keylist__, ['_id', 'age', 'phone', 'addr', 'name'])
+            ordered = ['name', 'age', 'phone', 'addr', '_id']
+            self.assertEqual([k for k, v in person], ordered)
+            self.assertEqual(list(dict(person).keys()), ordered)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+#
+# sax node memory benchmark.
+# Parses a large reply and reports the memory retained by the
+# document (tracemalloc) per element node.
+#
+
+import sys
+sys.path.append('../')
+import gc
+import tracemalloc
+from suds.sax.parser import Parser
+from tests.parsing import reply
+
+def nodes(node):
+    n = 1
+    for child in node.children:
+        n += nodes(child)
+    return n
+
+def benchmark(n=20000):
+    xml = reply(n)
+    parser = Parser()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    document = parser.parse(string=xml)
+    gc.collect()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = nodes(document.root())
+    retained = after - before
+    print('%d nodes: %.1f MB retained, %.1f MB peak, %d bytes/node' % (
+        count, retained/1e6, (peak-before)/1e6, retained/count))
+
+if __name__ == '__main__':
+    benchmark()
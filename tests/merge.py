@@ -0,0 +1,128 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import unittest
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+wsdl = '''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:tns="urn:merge" targetNamespace="urn:merge">
+ <types>
+  <xs:schema targetNamespace="urn:merge" elementFormDefault="qualified"%s>
+%s
+  </xs:schema>
+  <xs:schema targetNamespace="urn:merge" elementFormDefault="qualified"
+    xmlns:m2="urn:merge">
+   <xs:complexType name="Second">
+    <xs:sequence>
+     <xs:element name="first" type="m2:T8"/>
+     <xs:element name="name" type="xs:string"/>
+    </xs:sequence>
+   </xs:complexType>
+   <xs:element name="put">
+    <xs:complexType><xs:sequence>
+     <xs:element name="second" type="m2:Second"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+  </xs:schema>
+ </types>
+ <message name="putIn"><part name="parameters" element="tns:put"/></message>
+ <portType name="Merge">
+  <operation name="put"><input message="tns:putIn"/></operation>
+ </portType>
+ <binding name="MergeBinding" type="tns:Merge">
+  <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="put">
+   <soap:operation soapAction="put"/>
+   <input><soap:body use="literal"/></input>
+  </operation>
+ </binding>
+ <service name="MergeService">
+  <port name="Merge" binding="tns:MergeBinding">
+   <soap:address location="http://localhost:7080/merge"/>
+  </port>
+ </service>
+</definitions>
+'''
+
+complexType = '''
+   <xs:complexType name="T%d">
+    <xs:sequence><xs:element name="v" type="xs:int"/></xs:sequence>
+   </xs:complexType>'''
+
+types = ''.join([complexType % n for n in range(9)])
+
+
+class MergeTest(TestCase):
+    """
+    Schemas with the same target namespace are merged into the first.
+    The first has more children than are indexed (see: Element.Index).
+    """
+
+    def client(self, first=types, prefixes=''):
+        return wsdl_client(wsdl % (prefixes, first), nosend=True)
+
+    def merged(self, client):
+        schemas = [s for s in client.wsdl.schema.container.children
+            if s.tns[1] == 'urn:merge']
+        self.assertEqual(len(schemas), 1)
+        return schemas[0]
+
+    def testMerged(self):
+        client = self.client()
+        root = self.merged(client).root
+        self.assertEqual(len(root.getChildren('complexType')), 10)
+        self.assertEqual(len(root.getChildren('element')), 1)
+        self.assertTrue(root.getChild('element') is root.children[-1])
+        self.assertEqual(root.resolvePrefix('m2'), ('m2', 'urn:merge'))
+        names = [c.get('name') for c in root.children]
+        self.assertEqual(names[:9], ['T%d' % n for n in range(9)])
+        self.assertEqual(names[9:], ['Second', 'put'])
+
+    def testTypes(self):
+        client = self.client()
+        second = client.factory.create('Second')
+        self.assertEqual(second.first.__metadata__.sxtype.name, 'T8')
+        second.first.v = 3
+        second.name = 'n'
+        envelope = client.service.put(second).envelope.decode('utf-8')
+        self.assertTrue('<ns1:v>3</ns1:v>' in envelope, envelope)
+        self.assertTrue('<ns1:name>n</ns1:name>' in envelope, envelope)
+
+    def testEmpty(self):
+        client = self.client('')
+        root = self.merged(client).root
+        self.assertEqual(len(root.children), 2)
+        self.assertEqual(root.resolvePrefix('m2'), ('m2', 'urn:merge'))
+        self.assertTrue(('Second', 'urn:merge') in client.wsdl.schema.types)
+        self.assertTrue(('put', 'urn:merge') in client.wsdl.schema.elements)
+
+    def testPrefixes(self):
+        client = self.client(prefixes=' xmlns:m1="urn:merge"')
+        root = self.merged(client).root
+        self.assertEqual(root.resolvePrefix('m1'), ('m1', 'urn:merge'))
+        self.assertEqual(root.resolvePrefix('m2'), ('m2', 'urn:merge'))
+
+
+if __name__ == '__main__':
+    unittest.main()
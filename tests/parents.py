@@ -0,0 +1,133 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import gc
+import copy
+import pickle
+import unittest
+from weakref import ref
+from suds.sax.parser import Parser
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+xml = b'''<?xml version="1.0" encoding="UTF-8"?>
+<e:Envelope xmlns:e="http://schemas.xmlsoap.org/soap/envelope/"
+  xmlns:r="urn:r" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+<e:Body><r:reply r:kind="list">
+<r:item id="1"><r:name>a</r:name><r:value xsi:type="r:Int">1</r:value></r:item>
+<r:item id="2"><r:name>b</r:name><r:value xsi:nil="true"/></r:item>
+</r:reply></e:Body></e:Envelope>'''
+
+
+def walk(node):
+    yield node
+    for child in node.children:
+        for n in walk(child):
+            yield n
+
+
+class ParentTest(TestCase):
+    """
+    Parent links are held weakly so that trees are freed by refcount
+    and are restored when a tree is unpickled or copied.
+    """
+
+    def parse(self):
+        return Parser().parse(string=xml)
+
+    def assertLinked(self, root):
+        for node in walk(root):
+            for child in node.children:
+                self.assertTrue(child.parent is node)
+            for attribute in node.attributes:
+                self.assertTrue(attribute.parent is node)
+
+    def testLinked(self):
+        document = self.parse()
+        root = document.root()
+        self.assertTrue(root.parent is None)
+        self.assertLinked(root)
+        value = root.childAtPath('Body/reply/item/value')
+        self.assertTrue(value.getRoot() is root)
+        self.assertEqual(value.resolvePrefix('r'), ('r', 'urn:r'))
+
+    def testFreed(self):
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            document = self.parse()
+            root = document.root()
+            refs = [ref(node) for node in walk(root)]
+            del document, root
+            self.assertEqual([r for r in refs if r() is not None], [])
+        finally:
+            if enabled:
+                gc.enable()
+
+    def testDetached(self):
+        document = self.parse()
+        item = document.root().childAtPath('Body/reply/item')
+        name = item.getChild('name')
+        del document
+        gc.collect()
+        self.assertTrue(item.parent is None)
+        self.assertTrue(item.getRoot() is item)
+        self.assertTrue(name.parent is item)
+        self.assertEqual(item.getChild('name').getText(), 'a')
+
+    def testPickled(self):
+        document = self.parse()
+        root = document.root()
+        for restored in (
+                pickle.loads(pickle.dumps(document)).root(),
+                pickle.loads(pickle.dumps(root))):
+            self.assertEqual(str(restored), str(root))
+            self.assertTrue(restored.parent is None)
+            self.assertLinked(restored)
+            value = restored.childAtPath('Body/reply/item/value')
+            self.assertEqual(value.resolvePrefix('r'), ('r', 'urn:r'))
+            self.assertEqual(value.get('type'), 'r:Int')
+            self.assertTrue(value.getRoot() is restored)
+
+    def testPickledSubtree(self):
+        document = self.parse()
+        item = document.root().childAtPath('Body/reply/item')
+        restored = pickle.loads(pickle.dumps(item))
+        self.assertTrue(restored.parent is None)
+        self.assertLinked(restored)
+        self.assertEqual(
+            [(n.qname(), n.getText()) for n in walk(restored)],
+            [(n.qname(), n.getText()) for n in walk(item)])
+
+    def testCopied(self):
+        document = self.parse()
+        root = document.root()
+        item = root.childAtPath('Body/reply/item')
+        copied = copy.deepcopy(item)
+        self.assertTrue(copied.parent is None)
+        self.assertLinked(copied)
+        self.assertFalse(copied.getChild('name') is item.getChild('name'))
+        copied = copy.deepcopy(root)
+        self.assertEqual(str(copied), str(root))
+        self.assertLinked(copied)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+#
+# sax parser benchmark.
+# Parses a large reply with the expat reader (the default backend) and
+# with the xml.sax reader, from a string and incrementally from a file.
+#
+
+import sys
+sys.path.append('../')
+from io import BytesIO
+from timeit import timeit
+from suds.sax.parser import Parser, SaxReader, ExpatReader
+
+item = '''<r:item code="C%d" r:kind="k"><r:name>name %d</r:name>
+<r:price>1.5</r:price><r:flag>true</r:flag><r:note xsi:nil="true"/>
+<r:addr><street>street &amp; avenue</street><zip>%d</zip></r:addr></r:item>
+'''
+
+def reply(n):
+    s = []
+    s.append('<?xml version="1.0" encoding="UTF-8"?>')
+    s.append('<e:Envelope xmlns:e="http://schemas.xmlsoap.org/soap/envelope/"')
+    s.append(' xmlns:r="urn:r" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">')
+    s.append('<e:Body><r:listResponse>')
+    for i in range(n):
+        s.append(item % (i, i, i))
+    s.append('</r:listResponse></e:Body></e:Envelope>')
+    return ''.join(s).encode('utf-8')
+
+def benchmark(n=2000, number=10):
+    xml = reply(n)
+    parser = Parser()
+    for name, backend in (('sax', SaxReader), ('expat', ExpatReader)):
+        parser.backend = backend
+        def string():
+            parser.parse(string=xml)
+        def file():
+            parser.parse(file=BytesIO(xml))
+        for source, fn in (('string', string), ('file', file)):
+            fn()
+            t = timeit(fn, number=number)
+            print('%-6s %-7s %8.1f ms/reply (%d items)' % (
+                name, source, t*1e3/number, n))
+
+if __name__ == '__main__':
+    benchmark()
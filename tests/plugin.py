@@ -0,0 +1,189 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import unittest
+from suds.plugin import *
+from suds.transport import Reply
+from suds.transport.http_transport import HttpTransport
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+wsdl = '''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:tns="urn:plugin" targetNamespace="urn:plugin">
+ <types>
+  <xs:schema targetNamespace="urn:plugin" elementFormDefault="qualified">
+   <xs:element name="echo">
+    <xs:complexType><xs:sequence>
+     <xs:element name="s" type="xs:string"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+   <xs:element name="echoResponse">
+    <xs:complexType><xs:sequence>
+     <xs:element name="s" type="xs:string"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+  </xs:schema>
+ </types>
+ <message name="echoIn"><part name="parameters" element="tns:echo"/></message>
+ <message name="echoOut"><part name="parameters" element="tns:echoResponse"/></message>
+ <portType name="Plugin">
+  <operation name="echo">
+   <input message="tns:echoIn"/><output message="tns:echoOut"/>
+  </operation>
+ </portType>
+ <binding name="PluginBinding" type="tns:Plugin">
+  <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="echo">
+   <soap:operation soapAction="echo"/>
+   <input><soap:body use="literal"/></input>
+   <output><soap:body use="literal"/></output>
+  </operation>
+ </binding>
+ <service name="PluginService">
+  <port name="Plugin" binding="tns:PluginBinding">
+   <soap:address location="http://localhost:7080/plugin"/>
+  </port>
+ </service>
+</definitions>
+'''
+
+reply = b'''<?xml version="1.0" encoding="UTF-8"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+<env:Body><echoResponse xmlns="urn:plugin"><s>reply</s></echoResponse>
+</env:Body></env:Envelope>'''
+
+
+class Echo(HttpTransport):
+    """
+    Keeps the message sent and replies with the I{reply}.
+    """
+
+    sent = None
+
+    def send(self, request):
+        Echo.sent = request.message
+        return Reply(200, {}, reply)
+
+
+class Init(InitPlugin):
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def initialized(self, context):
+        self.calls.append('initialized')
+        self.wsdl = context.wsdl
+
+
+class Document(DocumentPlugin):
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def loaded(self, context):
+        self.calls.append('loaded')
+        context.document = context.document.replace(
+            b'name="s" type="xs:string"', b'name="s" type="xs:int"', 1)
+
+    def parsed(self, context):
+        self.calls.append('document.parsed')
+        self.url = context.url
+
+
+class Message(MessagePlugin):
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def marshalled(self, context):
+        self.calls.append('marshalled')
+        context.envelope.getChild('Body')[0].set('marked', '1')
+
+    def sending(self, context):
+        self.calls.append('sending')
+        context.envelope = context.envelope.replace(b'>7<', b'>8<')
+
+    def received(self, context):
+        self.calls.append('received')
+        context.reply = context.reply.replace(b'>reply<', b'>received<')
+
+    def parsed(self, context):
+        self.calls.append('parsed')
+        s = context.reply.childAtPath('Envelope/Body/echoResponse/s')
+        s.setText(s.getText() + '+parsed')
+
+    def unmarshalled(self, context):
+        self.calls.append('unmarshalled')
+        context.reply = context.reply.upper()
+
+
+class Failed(MessagePlugin):
+
+    def marshalled(self, context):
+        raise Exception('failed')
+
+    def unmarshalled(self, context):
+        raise Exception('failed')
+
+
+class PluginTest(TestCase):
+    """
+    The plugin hooks are called and the changes they make to the
+    context are used.
+    """
+
+    def testHooks(self):
+        calls = []
+        plugins = [Init(calls), Document(calls), Message(calls)]
+        client = wsdl_client(wsdl, plugins=plugins, transport=Echo())
+        self.assertEqual(calls, ['loaded', 'document.parsed', 'initialized'])
+        self.assertTrue(plugins[0].wsdl is client.wsdl)
+        self.assertTrue(plugins[1].url.endswith('.wsdl'))
+        del calls[:]
+        result = client.service.echo(7)
+        self.assertEqual(
+            calls,
+            ['marshalled', 'sending', 'received', 'parsed', 'unmarshalled'])
+        self.assertTrue(b'marked="1"' in Echo.sent, Echo.sent)
+        self.assertTrue(b'>8<' in Echo.sent, Echo.sent)
+        self.assertEqual(result, 'RECEIVED+PARSED')
+
+    def testFailed(self):
+        calls = []
+        plugins = [Failed(), Message(calls)]
+        client = wsdl_client(wsdl, plugins=plugins, transport=Echo())
+        result = client.service.echo('7')
+        self.assertEqual(result, 'RECEIVED+PARSED')
+        self.assertEqual(len(calls), 5)
+
+    def testImplemented(self):
+        container = PluginContainer([Failed(), Init([])])
+        self.assertTrue(container.message.implemented('marshalled'))
+        self.assertFalse(container.message.implemented('received'))
+        self.assertTrue(container.init.implemented('initialized'))
+        self.assertFalse(container.document.implemented('loaded'))
+        self.assertFalse(PluginContainer([]).message.implemented('sending'))
+
+
+if __name__ == '__main__':
+    unittest.main()
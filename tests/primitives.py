@@ -0,0 +1,152 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+#
+# builtin (primitive) type lookup benchmark.
+# Compares the interned builtins (sxbuiltin.Factory.intern()) with the
+# previous lookup that created a new builtin object per query:
+#   - query: blind and type queries for builtin references.
+#   - reply: unmarshalling (injected) replies containing many
+#     primitive-typed nodes, each carrying an xsi:type, using the
+#     generic and the compiled unmarshallers.  The type resolution
+#     memo is discarded before every reply so that each xsi:type
+#     is queried.
+#
+
+import sys
+sys.path.append('../')
+from timeit import timeit
+from tests import wsdl_client
+from suds.xsd import query
+from suds.xsd.query import BlindQuery, TypeQuery
+from suds.xsd.sxbuiltin import Factory
+
+wsdl = '''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:tns="urn:bench" targetNamespace="urn:bench">
+ <types>
+  <xs:schema targetNamespace="urn:bench" elementFormDefault="qualified">
+   <xs:element name="fetch">
+    <xs:complexType><xs:sequence>
+     <xs:element name="count" type="xs:int"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+   <xs:element name="fetchResponse">
+    <xs:complexType><xs:sequence>
+     <xs:element name="row" minOccurs="0" maxOccurs="unbounded">
+      <xs:complexType><xs:sequence>
+       <xs:element name="id" type="xs:int"/>
+       <xs:element name="name" type="xs:string"/>
+       <xs:element name="price" type="xs:double"/>
+       <xs:element name="active" type="xs:boolean"/>
+       <xs:element name="value" type="xs:anyType"/>
+      </xs:sequence></xs:complexType>
+     </xs:element>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+  </xs:schema>
+ </types>
+ <message name="fetchIn"><part name="parameters" element="tns:fetch"/></message>
+ <message name="fetchOut"><part name="parameters" element="tns:fetchResponse"/></message>
+ <portType name="Fetch">
+  <operation name="fetch">
+   <input message="tns:fetchIn"/><output message="tns:fetchOut"/>
+  </operation>
+ </portType>
+ <binding name="FetchBinding" type="tns:Fetch">
+  <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="fetch">
+   <soap:operation soapAction="fetch"/>
+   <input><soap:body use="literal"/></input>
+   <output><soap:body use="literal"/></output>
+  </operation>
+ </binding>
+ <service name="FetchService">
+  <port name="Fetch" binding="tns:FetchBinding">
+   <soap:address location="http://localhost:7080/fetch"/>
+  </port>
+ </service>
+</definitions>
+'''
+
+row = '''<row>
+ <id xsi:type="xs:int">%d</id>
+ <name xsi:type="xs:string">row</name>
+ <price xsi:type="xs:double">1.5</price>
+ <active xsi:type="xs:boolean">true</active>
+ <value xsi:type="xs:long">%d</value>
+</row>'''
+
+def reply(rows):
+    return ''.join((
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/"',
+        ' xmlns:xs="http://www.w3.org/2001/XMLSchema"',
+        ' xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">',
+        '<env:Body><fetchResponse xmlns="urn:bench">',
+        ''.join([row % (i, i) for i in range(rows)]),
+        '</fetchResponse></env:Body></env:Envelope>',))
+
+def created(schema, ref):
+    """ the (previous) lookup: a new builtin per query """
+    return Factory.create(schema, ref[0])
+
+def paths():
+    """ the (interned|created) lookup paths """
+    interned = Factory.intern
+    for name, fn in (('interned', interned), ('created', created)):
+        query.Factory.intern = fn
+        try:
+            yield name
+        finally:
+            query.Factory.intern = interned
+
+def benchmark_query(n=20000):
+    client = wsdl_client(wsdl)
+    schema = client.wsdl.schema
+    ns = 'http://www.w3.org/2001/XMLSchema'
+    refs = [(name, ns) for name in \
+        ('int', 'string', 'double', 'boolean', 'long')]
+    def run():
+        for ref in refs:
+            BlindQuery(ref).execute(schema)
+            TypeQuery(ref).execute(schema)
+    for name in paths():
+        t = timeit(run, number=n)
+        print('query %-8s %8.2f us/lookup' % \
+            (name, t*1e6/(n*len(refs)*2)))
+
+def benchmark_reply(rows=500, n=10):
+    xml = reply(rows).encode('utf-8')
+    nodes = rows*5
+    for compiled in (False, True):
+        client = wsdl_client(wsdl, compiled=compiled)
+        schema = client.wsdl.schema
+        method = client.service.fetch
+        def run():
+            schema.memo = None
+            method(1, __inject={'reply':xml})
+        for name in paths():
+            run()
+            t = timeit(run, number=n)
+            print('reply compiled=%-5s %-8s %8.2f us/node' % \
+                (compiled, name, t*1e6/(n*nodes)))
+
+if __name__ == '__main__':
+    benchmark_query()
+    benchmark_reply()
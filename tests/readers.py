@@ -0,0 +1,127 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import unittest
+from io import BytesIO
+from suds.sax.parser import Parser, SaxReader, ExpatReader
+from xml.sax import SAXParseException
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+documents = (
+    b'''<?xml version="1.0" encoding="UTF-8"?>
+<e:Envelope xmlns:e="http://schemas.xmlsoap.org/soap/envelope/"
+  xmlns="urn:default" xmlns:a="urn:a">
+<e:Header><a:token e:mustUnderstand="1">t</a:token></e:Header>
+<e:Body>
+ <reply a:kind="x" id="1"><name>caf\xc3\xa9 \xe2\x82\xac \xf0\x9f\x98\x80</name>
+  <empty/><blank>   </blank><mixed>a<b>b</b>c<!-- comment -->d</mixed>
+  <escaped>&lt;&amp;&gt;&quot;&apos;&#65;&#x42;</escaped>
+  <cdata><![CDATA[<not> & markup]]></cdata>
+  <inner xmlns="urn:inner" xmlns:a="urn:other"><a:x a:y="1">z</a:x></inner>
+  <undeclared xmlns=""><plain attr="a&#10;b"/></undeclared>
+ </reply>
+</e:Body></e:Envelope>''',
+    b'''<?xml version="1.0" encoding="ISO-8859-1"?>
+<root xmlns:p="urn:p"><p:name>caf\xe9</p:name><?pi data?></root>''',
+    b'''<?xml version="1.0"?>
+<!DOCTYPE root [<!ENTITY who "world">]>
+<root>hello &who;</root>''',
+    '''<?xml version="1.0"?><root><s>caf\xe9 \u20ac</s></root>''',
+)
+
+
+def dump(node, level=0):
+    """
+    Get a (comparable) description of an element tree.
+    """
+    s = []
+    attributes = [(a.prefix, a.name, a.value) for a in node.attributes]
+    s.append((level, node.prefix, node.name, node.expns,
+        sorted(node.nsprefixes.items()), attributes,
+        node.text, type(node.text)))
+    for child in node.children:
+        s.extend(dump(child, level+1))
+    return s
+
+
+class Parsed:
+    """
+    Parse using a specified reader (backend).
+    """
+
+    def __init__(self, backend, bufsize=Parser.bufsize):
+        self.parser = Parser()
+        self.parser.backend = backend
+        self.parser.bufsize = bufsize
+
+    def parse(self, **kwargs):
+        document = self.parser.parse(**kwargs)
+        return (dump(document.root()), str(document))
+
+
+class ReaderTest(TestCase):
+    """
+    The expat and I{xml.sax} readers must build the same trees.
+    """
+
+    def assertSame(self, **kwargs):
+        sax = Parsed(SaxReader).parse(**kwargs)
+        expat = Parsed(ExpatReader).parse(**kwargs)
+        self.assertEqual(sax, expat)
+        return expat
+
+    def testString(self):
+        for document in documents:
+            self.assertSame(string=document)
+
+    def testFile(self):
+        for document in documents:
+            if isinstance(document, str):
+                continue
+            expected = self.assertSame(string=document)
+            for bufsize in (1, 3, 7, 0x10000):
+                for backend in (SaxReader, ExpatReader):
+                    parsed = Parsed(backend, bufsize)
+                    self.assertEqual(
+                        parsed.parse(file=BytesIO(document)), expected)
+
+    def testContent(self):
+        tree, text = self.assertSame(string=documents[0])
+        names = [node[2] for node in tree]
+        self.assertTrue('mustUnderstand' in str(tree))
+        self.assertTrue('<escaped>&lt;&amp;&gt;&quot;&apos;AB</escaped>' in text, text)
+        self.assertTrue('<cdata>&lt;not&gt; &amp; markup</cdata>' in text, text)
+        self.assertEqual(names.count('mixed'), 1)
+        tree, text = self.assertSame(string=documents[1])
+        self.assertTrue('caf\xe9' in text)
+        tree, text = self.assertSame(string=documents[2])
+        self.assertTrue('hello world' in text)
+
+    def testMalformed(self):
+        for backend in (SaxReader, ExpatReader):
+            self.assertRaises(
+                SAXParseException,
+                Parsed(backend).parse,
+                string=b'<root><a></root>')
+
+
+if __name__ == '__main__':
+    unittest.main()
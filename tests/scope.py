@@ -0,0 +1,168 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import unittest
+from suds.sax.element import Element
+from suds.sax.parser import Parser
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+xml = b'''<?xml version="1.0" encoding="UTF-8"?>
+<a:root xmlns:a="urn:a" xmlns:b="urn:b">
+<a:one><a:two xmlns:b="urn:b2"><a:three><a:four/></a:three></a:two></a:one>
+<b:other xmlns:c="urn:c"><b:five/></b:other>
+</a:root>'''
+
+prefixes = ('a', 'b', 'c', 'd')
+
+
+def resolved(node, prefix):
+    """
+    Resolve a prefix (uncached) by walking up the tree.
+    """
+    while node is not None:
+        if prefix in node.nsprefixes:
+            return (prefix, node.nsprefixes[prefix])
+        node = node.parent
+    return None
+
+
+def walk(node):
+    yield node
+    for child in node.children:
+        for n in walk(child):
+            yield n
+
+
+class ScopeTest(TestCase):
+    """
+    The cached in-scope prefix mappings must be invalidated when the
+    mappings or the tree change.
+    """
+
+    def setUp(self):
+        self.root = Parser().parse(string=xml).root()
+        self.four = self.root.childAtPath('one/two/three/four')
+        self.five = self.root.childAtPath('other/five')
+        self.cache()
+
+    def cache(self):
+        for node in walk(self.root):
+            for p in prefixes:
+                node.resolvePrefix(p, None)
+
+    def assertScoped(self, root=None):
+        if root is None:
+            root = self.root
+        for node in walk(root):
+            for p in prefixes:
+                self.assertEqual(
+                    node.resolvePrefix(p, None), resolved(node, p),
+                    '%s: %s' % (node.qname(), p))
+
+    def testCached(self):
+        self.assertEqual(self.four.resolvePrefix('b'), ('b', 'urn:b2'))
+        self.assertEqual(self.five.resolvePrefix('b'), ('b', 'urn:b'))
+        self.assertEqual(self.five.resolvePrefix('c'), ('c', 'urn:c'))
+        self.assertTrue(self.four.scope() is self.four.parent.scope())
+        self.assertScoped()
+
+    def testAddPrefix(self):
+        self.root.addPrefix('d', 'urn:d')
+        self.root.addPrefix('a', 'urn:a2')
+        self.assertEqual(self.four.resolvePrefix('d'), ('d', 'urn:d'))
+        self.assertEqual(self.four.resolvePrefix('a'), ('a', 'urn:a2'))
+        self.root.childAtPath('one/two/three').addPrefix('c', 'urn:c3')
+        self.assertEqual(self.four.resolvePrefix('c'), ('c', 'urn:c3'))
+        self.assertScoped()
+
+    def testUpdateAndClear(self):
+        self.root.updatePrefix('b', 'urn:b3')
+        self.assertEqual(self.five.resolvePrefix('b'), ('b', 'urn:b3'))
+        self.assertEqual(self.four.resolvePrefix('b'), ('b', 'urn:b3'))
+        self.assertScoped()
+        self.root.childAtPath('other').clearPrefix('c')
+        self.assertEqual(self.five.resolvePrefix('c', None), None)
+        self.assertScoped()
+
+    def testSetPrefix(self):
+        three = self.root.childAtPath('one/two/three')
+        three.setPrefix('e', 'urn:e')
+        self.assertEqual(self.four.resolvePrefix('e'), ('e', 'urn:e'))
+        self.assertEqual(three.namespace(), ('e', 'urn:e'))
+        self.root.setPrefix('a', 'urn:a4')
+        self.assertEqual(self.four.resolvePrefix('a'), ('a', 'urn:a4'))
+        self.assertScoped()
+
+    def testAppend(self):
+        other = self.root.childAtPath('other')
+        two = self.root.childAtPath('one/two')
+        three = two.getChild('three')
+        two.remove(three)
+        self.assertEqual(three.resolvePrefix('a', None), None)
+        other.append(three)
+        self.assertEqual(self.four.resolvePrefix('b'), ('b', 'urn:b'))
+        self.assertEqual(self.four.resolvePrefix('c'), ('c', 'urn:c'))
+        self.assertScoped()
+        self.cache()
+        two.insert(three.detach())
+        self.assertEqual(self.four.resolvePrefix('b'), ('b', 'urn:b2'))
+        self.assertScoped()
+
+    def testDetach(self):
+        two = self.root.childAtPath('one/two')
+        two.detach()
+        self.assertTrue(two.parent is None)
+        self.assertEqual(self.four.resolvePrefix('a', None), None)
+        self.assertEqual(self.four.resolvePrefix('b'), ('b', 'urn:b2'))
+        self.assertScoped(two)
+        self.assertScoped()
+        other = self.root.childAtPath('other')
+        children = other.detachChildren()
+        self.assertEqual(self.five.resolvePrefix('c', None), None)
+        for child in children:
+            self.assertScoped(child)
+
+    def testReplace(self):
+        other = self.root.childAtPath('other')
+        two = self.root.childAtPath('one/two')
+        three = two.getChild('three')
+        two.replaceChild(three, Element('x'))
+        other.append(three)
+        self.assertEqual(self.four.resolvePrefix('c'), ('c', 'urn:c'))
+        self.assertScoped()
+
+    def testParent(self):
+        three = self.root.childAtPath('one/two/three')
+        three.parent = self.root.childAtPath('other')
+        self.assertEqual(self.four.resolvePrefix('c'), ('c', 'urn:c'))
+        self.assertEqual(self.four.resolvePrefix('b'), ('b', 'urn:b'))
+
+    def testConstructed(self):
+        parent = Element('p')
+        parent.addPrefix('p', 'urn:p')
+        child = Element('c', parent)
+        self.assertEqual(child.resolvePrefix('p'), ('p', 'urn:p'))
+        parent.addPrefix('p', 'urn:p2')
+        self.assertEqual(child.resolvePrefix('p'), ('p', 'urn:p2'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import copy
+import unittest
+from suds.sudsobject import Compact, Sparse
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+wsdl = '''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:tns="urn:sparse" targetNamespace="urn:sparse">
+ <types>
+  <xs:schema targetNamespace="urn:sparse" elementFormDefault="qualified">
+   <xs:complexType name="Addr">
+    <xs:sequence>
+     <xs:element name="street" type="xs:string"/>
+     <xs:element name="zip" type="xs:int" minOccurs="0"/>
+    </xs:sequence>
+    <xs:attribute name="kind" type="xs:string"/>
+   </xs:complexType>
+   <xs:complexType name="Person">
+    <xs:sequence>
+     <xs:element name="name" type="xs:string"/>
+     <xs:element name="home" type="tns:Addr" minOccurs="0"/>
+    </xs:sequence>
+   </xs:complexType>
+   <xs:complexType name="Item">
+    <xs:sequence>
+     <xs:element name="name" type="xs:string"/>
+     <xs:element name="owner" type="tns:Person"/>
+     <xs:element name="addr" type="tns:Addr" minOccurs="0"/>
+    </xs:sequence>
+   </xs:complexType>
+   <xs:element name="put">
+    <xs:complexType><xs:sequence>
+     <xs:element name="item" type="tns:Item"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+   <xs:element name="putResponse">
+    <xs:complexType><xs:sequence>
+     <xs:element name="n" type="xs:int"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+  </xs:schema>
+ </types>
+ <message name="putIn"><part name="parameters" element="tns:put"/></message>
+ <message name="putOut"><part name="parameters" element="tns:putResponse"/></message>
+ <portType name="Sparse">
+  <operation name="put">
+   <input message="tns:putIn"/><output message="tns:putOut"/>
+  </operation>
+ </portType>
+ <binding name="SparseBinding" type="tns:Sparse">
+  <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="put">
+   <soap:operation soapAction="put"/>
+   <input><soap:body use="literal"/></input>
+   <output><soap:body use="literal"/></output>
+  </operation>
+ </binding>
+ <service name="SparseService">
+  <port name="Sparse" binding="tns:SparseBinding">
+   <soap:address location="http://localhost:7080/sparse"/>
+  </port>
+ </service>
+</definitions>
+'''
+
+
+class SparseTest(TestCase):
+
+    options = {}
+
+    def client(self, **kwargs):
+        kwargs.update(self.options)
+        return wsdl_client(wsdl, sparse=True, nosend=True, **kwargs)
+
+    def envelope(self, client, item):
+        return client.service.put(item).envelope.decode('utf-8')
+
+    def testUntouched(self):
+        client = self.client()
+        item = client.factory.create('Item')
+        self.assertTrue(isinstance(item, Sparse))
+        self.assertFalse('addr' in item)
+        self.assertFalse('addr' in dict(item))
+        self.assertFalse('addr' in str(item))
+        self.assertTrue('owner' in item)
+        self.assertFalse('home' in item.owner)
+        item.name = 'n'
+        item.owner.name = 'o'
+        envelope = self.envelope(client, item)
+        self.assertTrue('<ns1:owner>' in envelope, envelope)
+        self.assertFalse('addr' in envelope, envelope)
+        self.assertFalse('home' in envelope, envelope)
+
+    def testTouched(self):
+        client = self.client()
+        item = client.factory.create('Item')
+        item.name = 'n'
+        item.addr.street = 's'
+        item.addr._kind = 'k'
+        self.assertTrue('addr' in item)
+        self.assertTrue('addr' in dict(item))
+        self.assertTrue('street = "s"' in str(item))
+        envelope = self.envelope(client, item)
+        self.assertTrue('<ns1:addr kind="k">' in envelope, envelope)
+        self.assertTrue('<ns1:street>s</ns1:street>' in envelope, envelope)
+        del item.addr
+        self.assertFalse('addr' in item)
+        self.assertRaises(AttributeError, getattr, item, 'nosuch')
+
+    def testCopies(self):
+        client = self.client()
+        a = client.factory.create('Item')
+        b = client.factory.create('Item')
+        a.addr.street = 'a'
+        self.assertTrue('addr' in a)
+        self.assertFalse('addr' in b)
+        c = client.factory.create('Item')
+        self.assertFalse('addr' in c)
+        b.addr.street = 'b'
+        self.assertEqual(a.addr.street, 'a')
+        self.assertFalse(a.addr is b.addr)
+
+    def testDeepcopy(self):
+        client = self.client()
+        item = client.factory.create('Item')
+        item.name = 'n'
+        copied = copy.deepcopy(item)
+        self.assertEqual(str(copied), str(item))
+        self.assertFalse('addr' in copied)
+        copied.addr.street = 'c'
+        self.assertTrue('addr' in copied)
+        self.assertFalse('addr' in item)
+        item.addr.street = 'i'
+        again = copy.deepcopy(item)
+        self.assertEqual(str(again), str(item))
+        self.assertFalse(again.addr is item.addr)
+        self.assertEqual(
+            self.envelope(client, again), self.envelope(client, item))
+
+
+class SparseCompactTest(SparseTest):
+
+    options = {'compact':True}
+
+    def testCompact(self):
+        client = self.client()
+        item = client.factory.create('Item')
+        self.assertTrue(isinstance(item, Compact))
+        self.assertTrue(isinstance(item.owner, Sparse))
+
+
+class SparseCompiledTest(SparseTest):
+
+    options = {'compiled':True}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,247 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import threading
+import unittest
+from io import BytesIO
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from suds import WebFault
+from suds.plugin import MessagePlugin
+from suds.transport.http_transport import HttpTransport
+from suds.transport.pool import PooledHttpTransport, ReplyStream
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+wsdl = '''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:tns="urn:stream" targetNamespace="urn:stream">
+ <types>
+  <xs:schema targetNamespace="urn:stream" elementFormDefault="qualified">
+   <xs:element name="list">
+    <xs:complexType><xs:sequence>
+     <xs:element name="count" type="xs:int"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+   <xs:element name="listResponse">
+    <xs:complexType><xs:sequence>
+     <xs:element name="item" type="xs:string" minOccurs="0" maxOccurs="unbounded"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+  </xs:schema>
+ </types>
+ <message name="listIn"><part name="parameters" element="tns:list"/></message>
+ <message name="listOut"><part name="parameters" element="tns:listResponse"/></message>
+ <portType name="Stream">
+  <operation name="list">
+   <input message="tns:listIn"/><output message="tns:listOut"/>
+  </operation>
+ </portType>
+ <binding name="StreamBinding" type="tns:Stream">
+  <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="list">
+   <soap:operation soapAction="list"/>
+   <input><soap:body use="literal"/></input>
+   <output><soap:body use="literal"/></output>
+  </operation>
+ </binding>
+ <service name="StreamService">
+  <port name="Stream" binding="tns:StreamBinding">
+   <soap:address location="http://localhost:7080/stream"/>
+  </port>
+ </service>
+</definitions>
+'''
+
+reply = b'''<?xml version="1.0" encoding="UTF-8"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+<env:Body><listResponse xmlns="urn:stream">
+<item>a</item><item>b</item><item>c</item>
+</listResponse></env:Body></env:Envelope>'''
+
+fault = b'''<?xml version="1.0" encoding="UTF-8"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+<env:Body><env:Fault>
+<faultcode>env:Server</faultcode><faultstring>failed</faultstring>
+</env:Fault></env:Body></env:Envelope>'''
+
+
+class StreamTest(TestCase):
+
+    def items(self, faults, xml):
+        client = wsdl_client(wsdl, faults=faults)
+        return client.service.list.stream(3, __inject={'reply':xml})
+
+    def testItems(self):
+        items = self.items(True, reply)
+        self.assertEqual(list(items), ['a', 'b', 'c'])
+        status, items = self.items(False, reply)
+        self.assertEqual(status, 200)
+        self.assertEqual(list(items), ['a', 'b', 'c'])
+
+    def testFault(self):
+        self.assertRaises(WebFault, self.items, True, fault)
+
+    def testFaultReturned(self):
+        status, e = self.items(False, fault)
+        self.assertEqual(status, 500)
+        self.assertTrue(isinstance(e, WebFault))
+        self.assertEqual(e.fault.faultstring, 'failed')
+
+
+class Reply(BaseHTTPRequestHandler):
+    """
+    A keep-alive (HTTP/1.1) handler that sends the I{reply}.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml')
+        self.send_header('Content-Length', str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+class Received(MessagePlugin):
+
+    def received(self, context):
+        context.reply = context.reply.replace(b'<item>c', b'<item>C')
+
+
+class Response:
+    """
+    An http response (stub).
+    """
+
+    def __init__(self, body, length=None):
+        self.body = body
+        self.length = length
+
+    def peek(self, n):
+        return self.body[:n]
+
+
+class StreamedTest(TestCase):
+    """
+    Replies read from the transport as a stream.
+    """
+
+    timeout = 10
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Reply)
+        self.server.daemon_threads = True
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.url = 'http://127.0.0.1:%d/' % self.server.server_port
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def client(self, **kwargs):
+        transport = PooledHttpTransport(timeout=self.timeout)
+        client = wsdl_client(
+            wsdl, transport=transport, location=self.url, **kwargs)
+        return (client, transport.connections())
+
+    def testGetReply(self):
+        client = wsdl_client(wsdl)
+        method = client.service.list.method
+        binding = method.binding.output
+        expected = binding.get_reply(method, reply)
+        streamed = binding.get_reply(method, BytesIO(reply))
+        self.assertEqual(str(streamed[0]), str(expected[0]))
+        self.assertEqual(streamed[1], expected[1])
+        self.assertEqual(streamed[1], ['a', 'b', 'c'])
+
+    def testFilteredReply(self):
+        client = wsdl_client(wsdl)
+        method = client.service.list.method
+        binding = method.binding.output
+        binding.replyfilter = (lambda r: r.replace(b'<item>a', b'<item>A'))
+        try:
+            self.assertTrue(binding.filtered())
+            root, result = binding.get_reply(method, BytesIO(reply))
+        finally:
+            del binding.replyfilter
+        self.assertEqual(result, ['A', 'b', 'c'])
+        self.assertFalse(binding.filtered())
+
+    def testStreamable(self):
+        transport = HttpTransport()
+        self.assertTrue(transport.streamable(Response(b'<x/>')))
+        self.assertFalse(transport.streamable(Response(b'')))
+        self.assertFalse(transport.streamable(Response(b'<x/>', 0)))
+        self.assertFalse(transport.streamable(BytesIO(b'<x/>')))
+
+    def testDrained(self):
+        transport = PooledHttpTransport()
+        pool = transport.connections()
+        response, body = transport.request(
+            'POST', self.url, b'x', {}, stream=True)
+        self.assertTrue(isinstance(body, ReplyStream))
+        self.assertEqual(pool.stats()['active'], 1)
+        self.assertEqual(body.read(10), reply[:10])
+        self.assertEqual(body.read(), reply[10:])
+        stats = pool.stats()
+        self.assertEqual((stats['active'], stats['idle']), (0, 1))
+        self.assertEqual(body.read(), b'')
+        body.close()
+        self.assertEqual(pool.stats()['idle'], 1)
+        response, body = transport.request(
+            'POST', self.url, b'x', {}, stream=True)
+        self.assertEqual(pool.stats()['hits'], 1)
+        body.close()
+        stats = pool.stats()
+        self.assertEqual((stats['active'], stats['idle']), (0, 0))
+
+    def testInvoke(self):
+        client, pool = self.client()
+        for n in range(3):
+            self.assertEqual(client.service.list(3), ['a', 'b', 'c'])
+        stats = pool.stats()
+        self.assertEqual((stats['active'], stats['idle']), (0, 1))
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+        self.assertEqual(
+            str(client.last_received()),
+            str(client.service.list.method.binding.output.get_reply(
+                client.service.list.method, reply)[0]))
+        pool.clear()
+
+    def testNotStreamed(self):
+        client, pool = self.client(plugins=[Received()])
+        self.assertEqual(client.service.list(3), ['a', 'b', 'C'])
+        client.set_options(plugins=[], retxml=True)
+        self.assertEqual(client.service.list(3), reply)
+        self.assertEqual(pool.stats()['active'], 0)
+        pool.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
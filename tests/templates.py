@@ -0,0 +1,86 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+#
+# request template benchmark.
+# Builds (nosend) small messages with compiled templates and with the
+# templates recompiled on every call (the uncompiled path).
+#
+
+import sys
+sys.path.append('../')
+from timeit import timeit
+from tests import wsdl_client
+
+wsdl = '''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:tns="urn:bench" targetNamespace="urn:bench">
+ <types>
+  <xs:schema targetNamespace="urn:bench" elementFormDefault="qualified">
+   <xs:element name="echo">
+    <xs:complexType><xs:sequence>
+     <xs:element name="name" type="xs:string"/>
+     <xs:element name="count" type="xs:int"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+   <xs:element name="echoResponse">
+    <xs:complexType><xs:sequence>
+     <xs:element name="name" type="xs:string"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+  </xs:schema>
+ </types>
+ <message name="echoIn"><part name="parameters" element="tns:echo"/></message>
+ <message name="echoOut"><part name="parameters" element="tns:echoResponse"/></message>
+ <portType name="Echo">
+  <operation name="echo">
+   <input message="tns:echoIn"/><output message="tns:echoOut"/>
+  </operation>
+ </portType>
+ <binding name="EchoBinding" type="tns:Echo">
+  <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="echo">
+   <soap:operation soapAction="echo"/>
+   <input><soap:body use="literal"/></input>
+   <output><soap:body use="literal"/></output>
+  </operation>
+ </binding>
+ <service name="EchoService">
+  <port name="Echo" binding="tns:EchoBinding">
+   <soap:address location="http://localhost:7080/echo"/>
+  </port>
+ </service>
+</definitions>
+'''
+
+def benchmark(n=5000):
+    client = wsdl_client(wsdl, nosend=True)
+    method = client.service.echo
+    binding = method.method.binding.input
+    def compiled():
+        method('suds', 3)
+    def uncompiled():
+        binding.templates.clear()
+        method('suds', 3)
+    compiled()
+    for name, fn in (('uncompiled', uncompiled), ('compiled', compiled)):
+        t = timeit(fn, number=n)
+        print('%-10s %8.1f us/message' % (name, t*1e6/n))
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,288 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import time
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from suds.transport import TransportError
+from suds.transport.pool import PooledHttpTransport
+from suds.transport.aio import AsyncHttpTransport
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+
+class Echo(BaseHTTPRequestHandler):
+    """
+    A keep-alive (HTTP/1.1) handler that replies with the request body,
+    which may be sent chunked.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        if 'chunked' in self.headers.get('Transfer-Encoding', ''):
+            chunks = []
+            while True:
+                n = int(self.rfile.readline().split(b';')[0], 16)
+                chunk = self.rfile.read(n)
+                self.rfile.readline()
+                if not n:
+                    break
+                chunks.append(chunk)
+            body = b''.join(chunks)
+        else:
+            body = self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class PoolTest(TestCase):
+
+    timeout = 10
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Echo)
+        self.server.daemon_threads = True
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.url = 'http://127.0.0.1:%d/' % self.server.server_port
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def chunks(self):
+        yield b'chunked'
+        yield b' body'
+
+    def testChunkedAfterBytes(self):
+        transport = PooledHttpTransport(hostlimit=1)
+        replies = []
+        def calls():
+            for body in (b'bytes', self.chunks(), b'bytes'):
+                response, content = \
+                    transport.request('POST', self.url, body, {})
+                replies.append(content)
+        thread = threading.Thread(target=calls)
+        thread.daemon = True
+        thread.start()
+        thread.join(self.timeout)
+        self.assertFalse(thread.is_alive(), 'checkout blocked')
+        self.assertEqual(replies, [b'bytes', b'chunked body', b'bytes'])
+        stats = transport.pool.stats()
+        self.assertEqual(stats['active'], 0)
+        self.assertEqual(stats['idle'], 1)
+        transport.pool.clear()
+
+    def testConnections(self):
+        transport = PooledHttpTransport()
+        barrier = threading.Barrier(8)
+        pools = []
+        def connections():
+            barrier.wait()
+            pools.append(transport.connections())
+        threads = [threading.Thread(target=connections) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(self.timeout)
+        self.assertEqual(len(pools), 8)
+        for pool in pools:
+            self.assertTrue(pool is transport.pool)
+
+    def testReuse(self):
+        transport = PooledHttpTransport()
+        for n in range(5):
+            response, content = \
+                transport.request('POST', self.url, b'%d' % n, {})
+            self.assertEqual(content, b'%d' % n)
+        stats = transport.pool.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (4, 1))
+        self.assertEqual((stats['idle'], stats['active']), (1, 0))
+        transport.pool.clear()
+
+    def testCheckoutTimeout(self):
+        transport = PooledHttpTransport(hostlimit=1, timeout=0.2)
+        pool = transport.connections()
+        key, path = transport.endpoint(self.url)
+        conn, reused = pool.checkout(key, 0.2)
+        started = time.time()
+        self.assertRaises(
+            TransportError, transport.request, 'POST', self.url, b'x', {})
+        self.assertTrue(time.time() - started >= 0.2)
+        pool.checkin(key, conn, False)
+        response, content = transport.request('POST', self.url, b'x', {})
+        self.assertEqual(content, b'x')
+        self.assertEqual(pool.stats()['active'], 0)
+        pool.clear()
+
+    def testAsyncReuse(self):
+        transport = AsyncHttpTransport()
+        async def calls():
+            for n in range(5):
+                response, content = \
+                    await transport.arequest('POST', self.url, b'%d' % n, {})
+                self.assertEqual(content, b'%d' % n)
+            pool = transport.aconnections()
+            stats = pool.stats()
+            pool.clear()
+            return stats
+        stats = asyncio.run(asyncio.wait_for(calls(), self.timeout))
+        self.assertEqual((stats['hits'], stats['misses']), (4, 1))
+        self.assertEqual((stats['idle'], stats['active']), (1, 0))
+
+    def testAsyncCheckoutTimeout(self):
+        transport = AsyncHttpTransport(hostlimit=1, timeout=0.2)
+        async def calls():
+            pool = transport.aconnections()
+            key, path = transport.endpoint(self.url)
+            conn, reused = await pool.checkout(key, 0.2)
+            started = time.time()
+            try:
+                await transport.arequest('POST', self.url, b'x', {})
+                self.fail('checkout did not time out')
+            except TransportError:
+                self.assertTrue(time.time() - started >= 0.2)
+            await pool.checkin(key, conn, False)
+            response, content = \
+                await transport.arequest('POST', self.url, b'x', {})
+            stats = pool.stats()
+            pool.clear()
+            return (content, stats)
+        content, stats = asyncio.run(asyncio.wait_for(calls(), self.timeout))
+        self.assertEqual(content, b'x')
+        self.assertEqual(stats['active'], 0)
+
+    def testAsyncChunkedAfterBytes(self):
+        transport = AsyncHttpTransport(hostlimit=1)
+        async def calls():
+            replies = []
+            for body in (b'bytes', self.chunks(), b'bytes'):
+                response, content = \
+                    await transport.arequest('POST', self.url, body, {})
+                replies.append(content)
+            pool = transport.aconnections()
+            stats = pool.stats()
+            pool.clear()
+            return (replies, stats)
+        replies, stats = asyncio.run(
+            asyncio.wait_for(calls(), self.timeout))
+        self.assertEqual(replies, [b'bytes', b'chunked body', b'bytes'])
+        self.assertEqual(stats['active'], 0)
+        self.assertEqual(stats['idle'], 1)
+
+    def testAsyncLoops(self):
+        transport = AsyncHttpTransport()
+        async def call():
+            response, content = \
+                await transport.arequest('POST', self.url, b'body', {})
+            return (transport.aconnections(), content)
+        first, content = asyncio.run(asyncio.wait_for(call(), self.timeout))
+        self.assertEqual(content, b'body')
+        self.assertEqual(first.stats()['idle'], 1)
+        second, content = asyncio.run(asyncio.wait_for(call(), self.timeout))
+        self.assertEqual(content, b'body')
+        self.assertFalse(second is first)
+        self.assertEqual(first.stats()['idle'], 0)
+        self.assertEqual(list(transport.apools.values()), [second])
+        second.clear()
+
+
+wsdl = '''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:tns="urn:aio" targetNamespace="urn:aio">
+ <types>
+  <xs:schema targetNamespace="urn:aio" elementFormDefault="qualified">
+   <xs:element name="echo">
+    <xs:complexType><xs:sequence>
+     <xs:element name="s" type="xs:string"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+   <xs:element name="echoResponse">
+    <xs:complexType><xs:sequence>
+     <xs:element name="s" type="xs:string"/>
+     <xs:element name="n" type="xs:int"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+  </xs:schema>
+ </types>
+ <message name="echoIn"><part name="parameters" element="tns:echo"/></message>
+ <message name="echoOut"><part name="parameters" element="tns:echoResponse"/></message>
+ <portType name="Aio">
+  <operation name="echo">
+   <input message="tns:echoIn"/><output message="tns:echoOut"/>
+  </operation>
+ </portType>
+ <binding name="AioBinding" type="tns:Aio">
+  <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="echo">
+   <soap:operation soapAction="echo"/>
+   <input><soap:body use="literal"/></input>
+   <output><soap:body use="literal"/></output>
+  </operation>
+ </binding>
+ <service name="AioService">
+  <port name="Aio" binding="tns:AioBinding">
+   <soap:address location="http://localhost:7080/aio"/>
+  </port>
+ </service>
+</definitions>
+'''
+
+reply = b'''<?xml version="1.0" encoding="UTF-8"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+<env:Body><echoResponse xmlns="urn:aio"><s>a</s><n>1</n></echoResponse>
+</env:Body></env:Envelope>'''
+
+
+class AioTest(TestCase):
+
+    def testInjected(self):
+        client = wsdl_client(wsdl)
+        expected = client.service.echo('a', __inject={'reply':reply})
+        async def call():
+            return await client.service.echo.aio(
+                'a', __inject={'reply':reply})
+        result = asyncio.run(call())
+        self.assertEqual(str(result), str(expected))
+        self.assertEqual((result.s, result.n), ('a', 1))
+
+    def testGather(self):
+        client = wsdl_client(wsdl)
+        async def calls():
+            return await asyncio.gather(*[
+                client.service.echo.aio('a', __inject={'reply':reply})
+                for n in range(4)])
+        results = asyncio.run(calls())
+        self.assertEqual([r.n for r in results], [1, 1, 1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
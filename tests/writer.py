@@ -0,0 +1,152 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+# written by: Jeff Ortel ( jortel@redhat.com )
+
+import sys
+sys.path.append('../')
+import unittest
+from suds.sax.document import Document
+from suds.sax.element import Element
+from suds.sax.writer import Writer
+from unittest import TestCase
+from tests import *
+
+setup_logging()
+
+wsdl = '''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema"
+  xmlns:tns="urn:writer" targetNamespace="urn:writer">
+ <types>
+  <xs:schema targetNamespace="urn:writer" elementFormDefault="qualified">
+   <xs:element name="echo">
+    <xs:complexType><xs:sequence>
+     <xs:element name="s" type="xs:string"/>
+     <xs:element name="n" type="xs:string" nillable="true"/>
+     <xs:element name="o" type="xs:string" minOccurs="0"/>
+     <xs:element name="l" type="xs:string" maxOccurs="unbounded"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+   <xs:element name="echoResponse">
+    <xs:complexType><xs:sequence>
+     <xs:element name="s" type="xs:string"/>
+    </xs:sequence></xs:complexType>
+   </xs:element>
+  </xs:schema>
+ </types>
+ <message name="echoIn"><part name="parameters" element="tns:echo"/></message>
+ <message name="echoOut"><part name="parameters" element="tns:echoResponse"/></message>
+ <message name="encIn">
+  <part name="s" type="xs:string"/>
+  <part name="n" type="xs:string"/>
+ </message>
+ <message name="encOut"><part name="s" type="xs:string"/></message>
+ <portType name="Literal">
+  <operation name="echo">
+   <input message="tns:echoIn"/><output message="tns:echoOut"/>
+  </operation>
+ </portType>
+ <portType name="Encoded">
+  <operation name="enc">
+   <input message="tns:encIn"/><output message="tns:encOut"/>
+  </operation>
+ </portType>
+ <binding name="LiteralBinding" type="tns:Literal">
+  <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="echo">
+   <soap:operation soapAction="echo"/>
+   <input><soap:body use="literal"/></input>
+   <output><soap:body use="literal"/></output>
+  </operation>
+ </binding>
+ <binding name="EncodedBinding" type="tns:Encoded">
+  <soap:binding style="rpc" transport="http://schemas.xmlsoap.org/soap/http"/>
+  <operation name="enc">
+   <soap:operation soapAction="enc"/>
+   <input><soap:body use="encoded" namespace="urn:writer"
+     encodingStyle="http://schemas.xmlsoap.org/soap/encoding/"/></input>
+   <output><soap:body use="encoded" namespace="urn:writer"
+     encodingStyle="http://schemas.xmlsoap.org/soap/encoding/"/></output>
+  </operation>
+ </binding>
+ <service name="WriterService">
+  <port name="Literal" binding="tns:LiteralBinding">
+   <soap:address location="http://localhost:7080/literal"/>
+  </port>
+  <port name="Encoded" binding="tns:EncodedBinding">
+   <soap:address location="http://localhost:7080/encoded"/>
+  </port>
+ </service>
+</definitions>
+'''
+
+
+class WriterTest(TestCase):
+    """
+    The writer output must be identical to str() and plain().
+    """
+
+    def assertWritten(self, document):
+        self.assertEqual(
+            Writer().tobytes(document).decode('utf-8'), document.plain())
+        self.assertEqual(
+            Writer(pretty=True).tobytes(document).decode('utf-8'),
+            str(document))
+
+    def message(self, port, name, *args):
+        client = wsdl_client(wsdl)
+        method = client.service[port][name].method
+        return method.binding.input.get_message(method, args, {})
+
+    def testEmpty(self):
+        root = Element('root')
+        a = Element('a')
+        a.setText('')
+        b = Element('b')
+        c = Element('c')
+        c.setnil()
+        d = Element('d')
+        d.set('x', '')
+        e = Element('e')
+        e.setText('')
+        e.append(Element('f'))
+        root.append((a, b, c, d, e))
+        self.assertWritten(Document(root))
+        written = Writer().tobytes(root).decode('utf-8')
+        self.assertTrue('<a></a>' in written)
+        self.assertTrue('<b/>' in written)
+
+    def testLiteral(self):
+        for s, n, l in (
+                ('', None, ['', 'x', '']),
+                ('', '', ['']),
+                (None, None, []),
+                ('x', 'y', ['z'])):
+            document = self.message('Literal', 'echo', s, n, None, l)
+            self.assertWritten(document)
+        document = self.message('Literal', 'echo', '', None, '', [''])
+        written = Writer().tobytes(document).decode('utf-8')
+        self.assertTrue('<ns1:s></ns1:s>' in written, written)
+        self.assertTrue('xsi:nil="true"' in written, written)
+
+    def testEncoded(self):
+        for s, n in (('', None), ('', ''), (None, None), ('x', 'y')):
+            document = self.message('Encoded', 'enc', s, n)
+            self.assertWritten(document)
+
+
+if __name__ == '__main__':
+    unittest.main()